@@ -5,3 +5,15 @@ TENANT_DELETE_ERROR_MESSAGE = (
 )
 
 TENANT_CACHE_NAME = "_tenant_cache"
+
+# Default number of rows written per statement by the bulk membership helpers
+DEFAULT_BATCH_SIZE = 1000
+
+# Default number of tenants handled per transaction by multi-tenant operations
+DEFAULT_TENANT_CHUNK_SIZE = 100
+
+# Default number of tenant schemas combined per UNION ALL statement
+DEFAULT_UNION_CHUNK_SIZE = 500
+
+# Default maximum size in bytes of one UNION ALL statement
+DEFAULT_MAX_STATEMENT_SIZE = 1024**2
@@ -0,0 +1,14 @@
+from django.apps import AppConfig
+
+
+class PermissionsConfig(AppConfig):
+    """Configuration for tenant_users.permissions app."""
+
+    name = "tenant_users.permissions"
+    label = "permissions"
+
+    def ready(self) -> None:
+        from tenant_users.permissions import cache, storage  # noqa: PLC0415
+
+        cache.connect_signals()
+        storage.connect_signals()
@@ -1,7 +1,15 @@
+from asgiref.sync import sync_to_async
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import Permission
+from django_tenants.utils import get_public_schema_name, schema_context
 
-from tenant_users.permissions.models import UserTenantPermissions
+from tenant_users.permissions.functional import aget_current_schema_name, call_in_schema
+from tenant_users.permissions.qualified import (
+    SCHEMA_NAME_ATTR,
+    get_permission_names,
+    qualified_perms_enabled,
+)
+from tenant_users.permissions.storage import uses_shared_storage
 
 
 class UserBackend(ModelBackend):
@@ -13,13 +21,57 @@ class UserBackend(ModelBackend):
 
     Overrides:
         _get_group_permissions: Modified to refer to 'groups' attribute in
-        UserTenantPermissions instead of the default user model's groups.
+        the tenant permissions model instead of the default user model's groups.
+        _get_permissions: Resolves permissions stored in the public schema
+        against the public schema's groups and permissions, and reads them
+        with schema-qualified queries when
+        ``TENANT_USERS_QUALIFIED_PERMS_QUERIES`` is enabled.
+        _aget_permissions: Resolves permissions with ``_get_permissions`` in
+        the schema of the async context, instead of on the connection of
+        whichever thread runs the queries.
 
     Methods:
         _get_group_permissions: Retrieves group permissions associated with a given user.
     """
 
+    def _get_permissions(self, user_obj, obj, from_name):
+        if qualified_perms_enabled():
+            return self._get_qualified_permissions(user_obj, obj, from_name)
+        if uses_shared_storage():
+            with schema_context(get_public_schema_name()):
+                return super()._get_permissions(user_obj, obj, from_name)
+        return super()._get_permissions(user_obj, obj, from_name)
+
+    async def _aget_permissions(self, user_obj, obj, from_name):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        perm_cache_name = f"_{from_name}_perm_cache"
+        if hasattr(user_obj, perm_cache_name):
+            return getattr(user_obj, perm_cache_name)
+
+        schema_name = getattr(user_obj, SCHEMA_NAME_ATTR, None)
+        if schema_name is None:
+            schema_name = await aget_current_schema_name()
+        return await sync_to_async(call_in_schema)(
+            schema_name, self._get_permissions, user_obj, obj, from_name
+        )
+
+    def _get_qualified_permissions(self, user_obj, obj, from_name):
+        # Same as ModelBackend._get_permissions(), with qualified queries
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+
+        perm_cache_name = f"_{from_name}_perm_cache"
+        if not hasattr(user_obj, perm_cache_name):
+            if user_obj.is_superuser:
+                perms = Permission.objects.all()
+            else:
+                perms = getattr(self, f"_get_{from_name}_permissions")(user_obj)
+            setattr(user_obj, perm_cache_name, get_permission_names(perms, user_obj))
+        return getattr(user_obj, perm_cache_name)
+
     def _get_group_permissions(self, user_obj):
-        user_groups_field = UserTenantPermissions._meta.get_field("groups")
+        user_groups_field = type(user_obj)._meta.get_field("groups")
         user_groups_query = f"group__{user_groups_field.related_query_name()}"
         return Permission.objects.filter(**{user_groups_query: user_obj})
@@ -0,0 +1,352 @@
+"""Shared cache for tenant permissions.
+
+When ``TENANT_USERS_PERMS_CACHE`` names a cache alias, the
+``UserTenantPermissions`` row of a user, together with the permission sets
+resolved by the auth backend, is stored in that cache under the current
+schema and the user's primary key. Later requests, in any process, can then
+answer permission checks without querying the database.
+
+Entries are invalidated by the receivers in this module, which are connected
+when the ``tenant_users.permissions`` app is ready. Changes that bypass model
+signals, such as ``QuerySet.update()`` or raw SQL, are not seen and only
+expire through ``TENANT_USERS_PERMS_CACHE_TIMEOUT``.
+"""
+
+from __future__ import annotations
+
+import uuid
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+
+from tenant_users.permissions.storage import get_tenant_perms_model, uses_shared_storage
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from django.core.cache.backends.base import BaseCache
+
+    from tenant_users.permissions.models import UserTenantPermissions
+
+# Attributes the auth backend stores resolved permissions in
+PERM_CACHE_ATTRS = ("_perm_cache", "_user_perm_cache", "_group_perm_cache")
+
+DEFAULT_PERMS_CACHE_TIMEOUT = 300
+
+_KEY_PREFIX = "tenant_users:perms"
+
+# Cached in place of the permissions of users without any in a schema
+_MISSING = "missing"
+
+
+def get_perms_cache() -> BaseCache | None:
+    """Returns the cache configured by ``TENANT_USERS_PERMS_CACHE``, if any."""
+    alias = getattr(settings, "TENANT_USERS_PERMS_CACHE", None)
+    if alias is None:
+        return None
+    return caches[alias]
+
+
+def _generation_key(schema_name: str) -> str:
+    return f"{_KEY_PREFIX}:{schema_name}:generation"
+
+
+# Replaced when permissions shared by all schemas change
+_GLOBAL_GENERATION_KEY = f"{_KEY_PREFIX}:generation"
+
+
+def _perms_key(schema_name: str, generations: dict[str, Any], profile_id: Any) -> str:
+    generation = generations.get(_generation_key(schema_name), "0")
+    global_generation = generations.get(_GLOBAL_GENERATION_KEY, "0")
+    return f"{_KEY_PREFIX}:{schema_name}:{generation}.{global_generation}:{profile_id}"
+
+
+def _current_perms_key(cache: BaseCache, schema_name: str, profile_id: Any) -> str:
+    generations = cache.get_many([_generation_key(schema_name), _GLOBAL_GENERATION_KEY])
+    return _perms_key(schema_name, generations, profile_id)
+
+
+async def _acurrent_perms_key(
+    cache: BaseCache, schema_name: str, profile_id: Any
+) -> str:
+    generations = await cache.aget_many(
+        [_generation_key(schema_name), _GLOBAL_GENERATION_KEY]
+    )
+    return _perms_key(schema_name, generations, profile_id)
+
+
+def _get_timeout() -> float | None:
+    return getattr(
+        settings, "TENANT_USERS_PERMS_CACHE_TIMEOUT", DEFAULT_PERMS_CACHE_TIMEOUT
+    )
+
+
+def _perms_from_payload(payload: Any) -> UserTenantPermissions | None:
+    from tenant_users.permissions.models import UserTenantPermissions  # noqa: PLC0415
+
+    if payload is None:
+        return None
+    if payload == _MISSING:
+        raise UserTenantPermissions.DoesNotExist(
+            "UserTenantPermissions matching query does not exist."
+        )
+
+    field_names, values, resolved = payload
+    perms = get_tenant_perms_model().from_db(connection.alias, field_names, values)
+    for attr, value in resolved.items():
+        setattr(perms, attr, value)
+    return perms
+
+
+def _payload_from_perms(perms: UserTenantPermissions) -> tuple[Any, ...]:
+    field_names = tuple(field.attname for field in perms._meta.concrete_fields)
+    values = tuple(getattr(perms, name) for name in field_names)
+    resolved = {
+        attr: getattr(perms, attr) for attr in PERM_CACHE_ATTRS if hasattr(perms, attr)
+    }
+    return field_names, values, resolved
+
+
+def _use_profile(perms: UserTenantPermissions, profile: Any) -> None:
+    if not type(perms).profile.is_cached(perms):
+        perms.profile = profile
+
+
+def get_cached_tenant_perms(profile_id: Any) -> UserTenantPermissions | None:
+    """Rebuilds a user's permissions for the current schema from the cache.
+
+    Args:
+        profile_id: Primary key of the user profile.
+
+    Returns:
+        UserTenantPermissions: The cached permissions, with the resolved
+        permission sets restored, or None when there is no usable entry.
+
+    Raises:
+        UserTenantPermissions.DoesNotExist: If the user is cached as having no
+            permissions in the current schema.
+    """
+    cache = get_perms_cache()
+    if cache is None:
+        return None
+
+    schema_name = connection.schema_name  # type: ignore[attr-defined]
+    return _perms_from_payload(
+        cache.get(_current_perms_key(cache, schema_name, profile_id))
+    )
+
+
+async def aget_cached_tenant_perms(
+    schema_name: str, profile_id: Any
+) -> UserTenantPermissions | None:
+    """Async version of :func:`get_cached_tenant_perms` for the given schema."""
+    cache = get_perms_cache()
+    if cache is None:
+        return None
+
+    return _perms_from_payload(
+        await cache.aget(await _acurrent_perms_key(cache, schema_name, profile_id))
+    )
+
+
+def set_cached_tenant_perms(perms: UserTenantPermissions, profile: Any) -> None:
+    """Stores a user's permissions for the current schema in the cache.
+
+    The permission sets are resolved first, so cached entries answer
+    ``has_perm()`` and friends without any further queries.
+
+    Args:
+        perms: The permissions row of the user in the current schema.
+        profile: The user the permissions belong to. Used as ``perms.profile``
+            when it was not loaded with the row.
+    """
+    cache = get_perms_cache()
+    if cache is None:
+        return
+
+    _use_profile(perms, profile)
+    perms.get_all_permissions()
+    schema_name = connection.schema_name  # type: ignore[attr-defined]
+    cache.set(
+        _current_perms_key(cache, schema_name, perms.profile_id),
+        _payload_from_perms(perms),
+        _get_timeout(),
+    )
+
+
+async def aset_cached_tenant_perms(
+    schema_name: str, perms: UserTenantPermissions, profile: Any
+) -> None:
+    """Async version of :func:`set_cached_tenant_perms` for the given schema."""
+    cache = get_perms_cache()
+    if cache is None:
+        return
+
+    _use_profile(perms, profile)
+    if hasattr(perms, "aget_all_permissions"):
+        await perms.aget_all_permissions()
+    else:
+        # Django < 5.2 has no async permission API
+        await sync_to_async(perms.get_all_permissions)()
+    await cache.aset(
+        await _acurrent_perms_key(cache, schema_name, perms.profile_id),
+        _payload_from_perms(perms),
+        _get_timeout(),
+    )
+
+
+def set_cached_missing_tenant_perms(profile_id: Any) -> None:
+    """Caches that a user has no permissions in the current schema.
+
+    Args:
+        profile_id: Primary key of the user profile.
+    """
+    cache = get_perms_cache()
+    if cache is None:
+        return
+
+    schema_name = connection.schema_name  # type: ignore[attr-defined]
+    cache.set(
+        _current_perms_key(cache, schema_name, profile_id), _MISSING, _get_timeout()
+    )
+
+
+async def aset_cached_missing_tenant_perms(schema_name: str, profile_id: Any) -> None:
+    """Async version of :func:`set_cached_missing_tenant_perms` for the given schema."""
+    cache = get_perms_cache()
+    if cache is None:
+        return
+
+    await cache.aset(
+        await _acurrent_perms_key(cache, schema_name, profile_id),
+        _MISSING,
+        _get_timeout(),
+    )
+
+
+def _invalidate(func: Callable[[], Any]) -> None:
+    func()
+    # Other processes may cache the old rows again until the transaction
+    # commits, so invalidate once more when it does
+    if connection.in_atomic_block:
+        transaction.on_commit(func)
+
+
+def invalidate_tenant_perms(schema_name: str, profile_id: Any) -> None:
+    """Drops the cached permissions of one user in one schema."""
+    cache = get_perms_cache()
+    if cache is not None:
+        _invalidate(
+            lambda: cache.delete(_current_perms_key(cache, schema_name, profile_id))
+        )
+
+
+def invalidate_schema_perms(schema_name: str) -> None:
+    """Drops the cached permissions of every user in one schema.
+
+    Entries are not deleted one by one. Instead the schema's generation is
+    replaced, so that all existing keys stop being read and expire on their
+    own.
+    """
+    cache = get_perms_cache()
+    if cache is not None:
+        _invalidate(
+            lambda: cache.set(_generation_key(schema_name), uuid.uuid4().hex, None)
+        )
+
+
+def invalidate_all_perms() -> None:
+    """Drops the cached permissions of every user in every schema.
+
+    Like :func:`invalidate_schema_perms`, this replaces a generation, shared
+    by all schemas, instead of deleting entries.
+    """
+    cache = get_perms_cache()
+    if cache is not None:
+        _invalidate(lambda: cache.set(_GLOBAL_GENERATION_KEY, uuid.uuid4().hex, None))
+
+
+def _current_schema() -> str:
+    return connection.schema_name  # type: ignore[attr-defined]
+
+
+def _perms_schema(instance: Any) -> str:
+    # Permissions stored in the public schema know their tenant, which is
+    # usually the current one when it has not been loaded with them
+    if hasattr(instance, "tenant_id") and type(instance).tenant.is_cached(instance):
+        return instance.tenant.schema_name
+    return _current_schema()
+
+
+def _invalidate_groups() -> None:
+    if uses_shared_storage():
+        # Groups in the public schema are used by every tenant
+        invalidate_all_perms()
+    else:
+        invalidate_schema_perms(_current_schema())
+
+
+def _perms_saved_or_deleted(sender, instance, **kwargs) -> None:  # noqa: ARG001
+    invalidate_tenant_perms(_perms_schema(instance), instance.profile_id)
+
+
+def _perms_relations_changed(sender, instance, action, reverse, **kwargs) -> None:  # noqa: ARG001
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        # A group or permission changed its members, which may be anyone
+        _invalidate_groups()
+    else:
+        invalidate_tenant_perms(_perms_schema(instance), instance.profile_id)
+
+
+def _group_changed(sender, action=None, **kwargs) -> None:  # noqa: ARG001
+    if action is None or action.startswith("post_"):
+        _invalidate_groups()
+
+
+def _membership_changed(sender, user, tenant, **kwargs) -> None:  # noqa: ARG001
+    invalidate_tenant_perms(tenant.schema_name, user.pk)
+
+
+def connect_signals() -> None:
+    """Connects the receivers that keep the permissions cache up to date."""
+    from django.contrib.auth.models import Group  # noqa: PLC0415
+    from django.db.models.signals import (  # noqa: PLC0415
+        m2m_changed,
+        post_delete,
+        post_save,
+    )
+
+    from tenant_users.permissions.models import UserTenantPermissions  # noqa: PLC0415
+    from tenant_users.tenants.models import (  # noqa: PLC0415
+        SharedUserTenantPermissions,
+        tenant_user_added,
+        tenant_user_removed,
+    )
+
+    dispatch_uid = "tenant_users.permissions.cache"
+    for model in (UserTenantPermissions, SharedUserTenantPermissions):
+        post_save.connect(
+            _perms_saved_or_deleted, sender=model, dispatch_uid=dispatch_uid
+        )
+        post_delete.connect(
+            _perms_saved_or_deleted, sender=model, dispatch_uid=dispatch_uid
+        )
+        for field_name in ("groups", "user_permissions"):
+            m2m_changed.connect(
+                _perms_relations_changed,
+                sender=model._meta.get_field(field_name).remote_field.through,
+                dispatch_uid=dispatch_uid,
+            )
+    m2m_changed.connect(
+        _group_changed,
+        sender=Group.permissions.through,
+        dispatch_uid=dispatch_uid,
+    )
+    post_delete.connect(_group_changed, sender=Group, dispatch_uid=dispatch_uid)
+    tenant_user_added.connect(_membership_changed, dispatch_uid=dispatch_uid)
+    tenant_user_removed.connect(_membership_changed, dispatch_uid=dispatch_uid)
@@ -1,8 +1,26 @@
+from __future__ import annotations
+
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import connection
 from django.utils.functional import cached_property
+from django_tenants.utils import schema_context
 
 from tenant_users.constants import TENANT_CACHE_NAME
 
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+# Schema of the tenant the current async context works on. Set by
+# TenantAccessMiddleware for each request, async code running outside of a
+# request can set it too.
+current_schema_name: ContextVar[str | None] = ContextVar(
+    "tenant_users_current_schema_name", default=None
+)
+
 
 class tenant_cached_property(cached_property):  # type: ignore[type-arg]
     """A tenant-aware implementation of Django's cached_property decorator.
@@ -11,6 +29,9 @@ class tenant_cached_property(cached_property):  # type: ignore[type-arg]
     the property caching mechanism. It is particularly useful for properties that
     should be cached on a per-tenant basis.
 
+    A ``DoesNotExist`` raised by the property is cached as well, and a new copy
+    of it is raised on every later access until the tenant's cache is cleared.
+
     Methods:
         __get__: Retrieves the value of the cached property, specific to the current tenant.
                  If the instance is None, returns the property descriptor itself. Otherwise,
@@ -22,16 +43,98 @@ class tenant_cached_property(cached_property):  # type: ignore[type-arg]
         if instance is None:
             return self
 
-        if TENANT_CACHE_NAME not in instance.__dict__:
-            instance.__dict__[TENANT_CACHE_NAME] = {}
-
-        tenant_cache = instance.__dict__[TENANT_CACHE_NAME]
         current_schema = connection.schema_name  # type: ignore[attr-defined]
+        schema_cache = _get_schema_cache(instance, current_schema)
+        if self.name not in schema_cache:  # type: ignore[attr-defined]
+            try:
+                schema_cache[self.name] = self.func(instance)  # type: ignore[attr-defined]
+            except ObjectDoesNotExist as exc:
+                schema_cache[self.name] = _CachedDoesNotExist(exc)  # type: ignore[attr-defined]
+                raise
+
+        return _unwrap(schema_cache[self.name])  # type: ignore[attr-defined]
+
+
+async def aget_current_schema_name() -> str:
+    """Returns the schema of the current async context.
+
+    Uses ``current_schema_name`` when set, otherwise reads the schema of the
+    database connection in the thread that runs sync code for this context.
+    """
+    schema_name = current_schema_name.get()
+    if schema_name is None:
+        schema_name = await sync_to_async(_get_connection_schema_name)()
+    return schema_name
+
+
+def call_in_schema(schema_name: str, func: Callable[..., Any], *args: Any) -> Any:
+    """Calls ``func`` with the connection on the given schema.
+
+    Sync code run from async code with ``sync_to_async`` uses the connection
+    of a worker thread, which may be on any schema. This switches it to the
+    schema of the async context for the call, unless it is already there.
+
+    Args:
+        schema_name (str): The schema to run ``func`` in.
+        func (Callable): The function to call.
+        *args: Positional arguments for ``func``.
+    """
+    if _get_connection_schema_name() == schema_name:
+        return func(*args)
+    with schema_context(schema_name):
+        return func(*args)
+
+
+async def atenant_cached(
+    instance: Any, name: str, afunc: Callable[[str], Awaitable[Any]]
+) -> Any:
+    """Async counterpart of a ``tenant_cached_property`` lookup.
+
+    Reads and fills the same per-schema cache on the instance as
+    ``tenant_cached_property``, so sync and async accessors share values.
+
+    Args:
+        instance: The object holding the cache.
+        name: Name of the cached property.
+        afunc: Coroutine function computing the value, called with the
+            current schema name on a cache miss.
+
+    Returns:
+        The cached value for the current schema.
+    """
+    schema_name = await aget_current_schema_name()
+    schema_cache = _get_schema_cache(instance, schema_name)
+    if name not in schema_cache:
+        try:
+            schema_cache[name] = await afunc(schema_name)
+        except ObjectDoesNotExist as exc:
+            schema_cache[name] = _CachedDoesNotExist(exc)
+            raise
+
+    return _unwrap(schema_cache[name])
+
+
+def _get_connection_schema_name() -> str:
+    return connection.schema_name  # type: ignore[attr-defined]
+
+
+def _get_schema_cache(instance: Any, schema_name: str) -> dict[str, Any]:
+    tenant_cache = instance.__dict__.setdefault(TENANT_CACHE_NAME, {})
+    return tenant_cache.setdefault(schema_name, {})
+
+
+def _unwrap(value: Any) -> Any:
+    if isinstance(value, _CachedDoesNotExist):
+        # Raise a fresh exception, re-raising the cached one would keep
+        # growing its traceback
+        raise type(value.exc)(*value.exc.args)
+    return value
+
+
+class _CachedDoesNotExist:
+    """Marks a cached ``DoesNotExist`` in the tenant cache."""
 
-        if current_schema not in tenant_cache:
-            tenant_cache[current_schema] = {}
-            tenant_cache[current_schema][self.name] = self.func(instance)  # type: ignore[attr-defined]
-        elif self.name not in tenant_cache[current_schema]:  # type: ignore[attr-defined]
-            tenant_cache[current_schema][self.name] = self.func(instance)  # type: ignore[attr-defined]
+    __slots__ = ("exc",)
 
-        return tenant_cache[current_schema][self.name]  # type: ignore[attr-defined]
+    def __init__(self, exc: ObjectDoesNotExist) -> None:
+        self.exc = exc
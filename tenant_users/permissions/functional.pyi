@@ -1,8 +1,12 @@
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
 from functools import cached_property
-from typing import TypeVar, overload
+from typing import Any, TypeVar, overload
 
 _T = TypeVar("_T")
 
+current_schema_name: ContextVar[str | None]
+
 class tenant_cached_property(cached_property[_T]):
     @overload
     def __get__(
@@ -10,3 +14,8 @@ class tenant_cached_property(cached_property[_T]):
     ) -> tenant_cached_property[_T]: ...
     @overload
     def __get__(self, instance: object, owner: type | None = None) -> _T: ...
+
+async def aget_current_schema_name() -> str: ...
+async def atenant_cached(
+    instance: Any, name: str, afunc: Callable[[str], Awaitable[_T]]
+) -> _T: ...
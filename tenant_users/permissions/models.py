@@ -2,13 +2,76 @@ from __future__ import annotations
 
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth.models import PermissionsMixin
-from django.db import models
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection, models
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext_lazy as _
-
-from tenant_users.permissions.functional import tenant_cached_property
+from django_tenants.utils import get_public_schema_name
+
+from tenant_users.permissions.cache import (
+    aget_cached_tenant_perms,
+    aset_cached_missing_tenant_perms,
+    aset_cached_tenant_perms,
+    get_cached_tenant_perms,
+    set_cached_missing_tenant_perms,
+    set_cached_tenant_perms,
+)
+from tenant_users.permissions.functional import (
+    aget_current_schema_name,
+    atenant_cached,
+    call_in_schema,
+    tenant_cached_property,
+)
+from tenant_users.permissions.qualified import get_tenant_perms, qualified_perms_enabled
+from tenant_users.permissions.storage import (
+    get_tenant_perms_queryset,
+    scope_tenant_perms,
+)
+from tenant_users.permissions.utils import public_membership_is_implicit
+
+
+def _get_tenant_perms_queryset(schema_name: str | None = None):
+    queryset_fn = getattr(settings, "TENANT_USERS_PERMS_QUERYSET", None)
+
+    if queryset_fn:
+        # Import and call the custom queryset function
+        get_queryset = import_string(queryset_fn)
+        return scope_tenant_perms(get_queryset(), schema_name)
+
+    # Use the default queryset
+    return get_tenant_perms_queryset(schema_name)
+
+
+def _load_tenant_perms(profile: Any, schema_name: str | None = None):
+    if schema_name is None:
+        schema_name = connection.schema_name  # type: ignore[attr-defined]
+    queryset = _get_tenant_perms_queryset(schema_name)
+    if not qualified_perms_enabled():
+        return queryset.get(profile_id=profile.pk)
+
+    perms = get_tenant_perms(queryset, profile.pk, schema_name)
+    # Lazily loading the profile again would go through the search path
+    perms.profile = profile
+    return perms
+
+
+def _load_tenant_perms_in_schema(profile: Any, schema_name: str):
+    # Async callers take the schema from their context, while the connection
+    # of the thread running this may be on any other schema
+    if qualified_perms_enabled():
+        return _load_tenant_perms(profile, schema_name)
+    return call_in_schema(schema_name, _load_tenant_perms, profile, schema_name)
+
+
+def _missing_tenant_perms(error: ObjectDoesNotExist) -> ObjectDoesNotExist:
+    # Permissions stored in the public schema raise their own DoesNotExist,
+    # callers only ever have to catch UserTenantPermissions.DoesNotExist
+    if isinstance(error, UserTenantPermissions.DoesNotExist):
+        return error
+    return UserTenantPermissions.DoesNotExist(*error.args)
 
 
 class PermissionsMixinFacade:
@@ -31,26 +94,77 @@ class PermissionsMixinFacade:
     # This will throw a DoesNotExist exception if there is no tenant
     # permissions matching the current schema, which means that this
     # user has no authorization, so we catch this exception and return
-    # the appropriate False or empty set
+    # the appropriate False or empty set. The exception is cached too,
+    # so checks for non-members only query once per schema
     @tenant_cached_property
     def tenant_perms(self) -> UserTenantPermissions:
-        queryset_fn = getattr(settings, "TENANT_USERS_PERMS_QUERYSET", None)
+        perms = get_cached_tenant_perms(self.pk)
+        if perms is not None:
+            # Reuse this instance rather than loading the profile again
+            perms.profile = self
+            return perms
 
-        if queryset_fn:
-            # Import and call the custom queryset function
-            get_queryset = import_string(queryset_fn)
-            queryset = get_queryset()
-        else:
-            # Use the default queryset
-            queryset = UserTenantPermissions.objects
+        try:
+            perms = _load_tenant_perms(self)
+        except ObjectDoesNotExist as e:
+            set_cached_missing_tenant_perms(self.pk)
+            raise _missing_tenant_perms(e) from None
+
+        set_cached_tenant_perms(perms, self)
+        return perms
+
+    async def aget_tenant_perms(self) -> UserTenantPermissions:
+        """Async version of ``tenant_perms``, sharing its per-schema cache.
+
+        The schema is taken from the async context, see
+        :func:`~tenant_users.permissions.functional.aget_current_schema_name`.
+
+        Raises:
+            UserTenantPermissions.DoesNotExist: If the user has no permissions
+                in the current schema.
+        """
+        return await atenant_cached(self, "tenant_perms", self._aload_tenant_perms)
+
+    async def _aload_tenant_perms(self, schema_name: str) -> UserTenantPermissions:
+        perms = await aget_cached_tenant_perms(schema_name, self.pk)
+        if perms is None:
+            try:
+                perms = await sync_to_async(_load_tenant_perms_in_schema)(
+                    self, schema_name
+                )
+            except ObjectDoesNotExist as e:
+                await aset_cached_missing_tenant_perms(schema_name, self.pk)
+                raise _missing_tenant_perms(e) from None
+            await aset_cached_tenant_perms(schema_name, perms, self)
+
+        # The profile can't be lazily loaded from async code
+        if not type(perms).profile.is_cached(perms):
+            perms.profile = self
+        return perms
+
+    async def _acall_tenant_perms(self, name: str, *args: Any, default: Any) -> Any:
+        try:
+            perms = await self.aget_tenant_perms()
+        except UserTenantPermissions.DoesNotExist:
+            return default
 
-        return queryset.get(profile_id=self.pk)
+        amethod = getattr(perms, f"a{name}", None)
+        if amethod is None:
+            # Django < 5.2 has no async permission API
+            return await sync_to_async(call_in_schema)(
+                await aget_current_schema_name(), getattr(perms, name), *args
+            )
+        return await amethod(*args)
 
     def has_tenant_permissions(self) -> bool:
         try:
             _ = self.tenant_perms
         except UserTenantPermissions.DoesNotExist:
-            return False
+            # Implicit public members have default permissions without a row
+            return (
+                public_membership_is_implicit()
+                and connection.schema_name == get_public_schema_name()  # type: ignore[attr-defined]
+            )
 
         return True
 
@@ -98,6 +212,22 @@ class PermissionsMixinFacade:
         except UserTenantPermissions.DoesNotExist:
             return False
 
+    async def aget_all_permissions(self, obj=None) -> set[str]:
+        return await self._acall_tenant_perms("get_all_permissions", obj, default=set())
+
+    async def ahas_perm(self, perm: str, obj=None) -> bool:
+        return await self._acall_tenant_perms("has_perm", perm, obj, default=False)
+
+    async def ahas_perms(self, perm_list: list[str], obj=None) -> bool:
+        return await self._acall_tenant_perms(
+            "has_perms", perm_list, obj, default=False
+        )
+
+    async def ahas_module_perms(self, app_label: str) -> bool:
+        return await self._acall_tenant_perms(
+            "has_module_perms", app_label, default=False
+        )
+
 
 class AbstractBaseUserFacade:
     """A facade class bridging authorization and authentication models in a multi-tenant setup.
@@ -124,36 +254,13 @@ class AbstractBaseUserFacade:
         return self.profile.is_authenticated
 
 
-class UserTenantPermissions(PermissionsMixin, AbstractBaseUserFacade):
-    """Authorization model for managing per-tenant permissions in Django-tenant-users.
-
-    This class is responsible for handling the authorization aspects (permissions) for each tenant.
-    It complements the UserProfile model, which stores global user profile information and authentication
-    details in the public tenant schema. By separating authorization on a per-tenant basis, this model
-    supports a flexible and scalable approach to permissions management in a multi-tenant environment.
-
-    Inherits:
-        PermissionsMixin: Provides Django's built-in permissions framework.
-        AbstractBaseUserFacade: Bridges authorization with authentication models.
+class AbstractUserTenantPermissions(PermissionsMixin, AbstractBaseUserFacade):
+    """Fields and behaviour shared by the models storing tenant permissions.
 
-    See Also:
-        UserProfile: For the model handling global user profile and authentication aspects.
+    Concrete models add the ``profile`` they belong to and, when not stored
+    in each tenant's schema, the tenant they apply to.
     """
 
-    id = models.AutoField(
-        auto_created=True,
-        primary_key=True,
-        serialize=False,
-        verbose_name="ID",
-    )
-
-    # The profile stores all of the common information between
-    # tenants for a user
-    profile = models.OneToOneField(
-        settings.AUTH_USER_MODEL,
-        on_delete=models.CASCADE,
-    )
-
     is_staff = models.BooleanField(
         _("staff status"),
         default=False,
@@ -179,6 +286,40 @@ class UserTenantPermissions(PermissionsMixin, AbstractBaseUserFacade):
         ),
     )
 
+    class Meta:
+        abstract = True
+
     def __str__(self) -> str:
         """Return string representation."""
         return str(self.profile)
+
+
+class UserTenantPermissions(AbstractUserTenantPermissions):
+    """Authorization model for managing per-tenant permissions in Django-tenant-users.
+
+    This class is responsible for handling the authorization aspects (permissions) for each tenant.
+    It complements the UserProfile model, which stores global user profile information and authentication
+    details in the public tenant schema. By separating authorization on a per-tenant basis, this model
+    supports a flexible and scalable approach to permissions management in a multi-tenant environment.
+
+    Inherits:
+        PermissionsMixin: Provides Django's built-in permissions framework.
+        AbstractBaseUserFacade: Bridges authorization with authentication models.
+
+    See Also:
+        UserProfile: For the model handling global user profile and authentication aspects.
+    """
+
+    id = models.AutoField(
+        auto_created=True,
+        primary_key=True,
+        serialize=False,
+        verbose_name="ID",
+    )
+
+    # The profile stores all of the common information between
+    # tenants for a user
+    profile = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
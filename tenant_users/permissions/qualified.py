@@ -0,0 +1,134 @@
+"""Permission queries that name their schema instead of using the search path.
+
+django-tenants sends ``SET search_path`` before the statements of every new
+cursor, and each ``tenant_context`` switch changes the path it sends. With
+``TENANT_USERS_QUALIFIED_PERMS_QUERIES = True``, the queries resolving a
+user's tenant permissions, group and user permissions reference their tables
+as ``"schema"."table"``, built from the tenant's schema name with
+:func:`~tenant_users.tenants.union.compile_for_schema`, and run on cursors
+that skip the ``SET``. Resolving permissions then takes one statement per
+query, and :func:`get_tenant_perms` reads the permissions of any known tenant
+without switching to it.
+
+Neither Django nor django-tenants offers a cursor without the ``SET``, so
+:func:`unscoped_cursor` builds one from private connection methods. It is
+checked against the supported Django and django-tenants versions by the test
+suite.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.db import connections
+from django_tenants.utils import get_public_schema_name
+
+from tenant_users.permissions.storage import uses_shared_storage
+from tenant_users.tenants.union import compile_for_schema
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from django.db.backends.base.base import BaseDatabaseWrapper
+    from django.db.backends.utils import CursorWrapper
+    from django.db.models import Model, QuerySet
+
+# Set on permissions loaded here, so their group and user permissions are
+# read in the same schema
+SCHEMA_NAME_ATTR = "_tenant_schema_name"
+
+
+def qualified_perms_enabled() -> bool:
+    """Checks whether permissions are read with schema-qualified queries."""
+    return getattr(settings, "TENANT_USERS_QUALIFIED_PERMS_QUERIES", False)
+
+
+@contextmanager
+def unscoped_cursor(connection: BaseDatabaseWrapper) -> Iterator[CursorWrapper]:
+    """Opens a cursor that does not set the search path.
+
+    django-tenants sends ``SET search_path`` from its override of the
+    connection's ``_cursor()``. The cursor is instead created one level below,
+    like Django's own ``_cursor()`` does, with ``create_cursor()`` and the
+    private ``_prepare_cursor()``, so it is still wrapped for error handling
+    and query logging. Statements run on it must qualify every table.
+
+    Args:
+        connection: A django-tenants database connection.
+    """
+    connection.ensure_connection()
+    with connection.wrap_database_errors:
+        cursor = connection._prepare_cursor(connection.create_cursor())  # noqa: SLF001
+    with cursor:
+        yield cursor
+
+
+def _fetch(queryset: QuerySet[Any], schema_name: str) -> list[tuple[Any, ...]]:
+    """Run the queryset in the schema, without setting the search path."""
+    compiled = compile_for_schema(queryset, schema_name)
+    if compiled is None:
+        return []
+
+    with unscoped_cursor(connections[queryset.db]) as cursor:
+        cursor.execute(*compiled)
+        return cursor.fetchall()
+
+
+def get_tenant_perms(
+    queryset: QuerySet[Any], profile_id: Any, schema_name: str
+) -> Model:
+    """Loads a user's tenant permissions from a tenant's schema.
+
+    Args:
+        queryset (QuerySet): Tenant permissions of the tenant, such as
+            :func:`~tenant_users.permissions.storage.get_tenant_perms_queryset`.
+        profile_id: Primary key of the user profile.
+        schema_name (str): Schema name of the tenant.
+
+    Returns:
+        The tenant permissions, remembering ``schema_name`` for later
+        permission checks.
+
+    Raises:
+        DoesNotExist: If the user has no permissions in the tenant.
+    """
+    model = queryset.model
+    field_names = [field.attname for field in model._meta.concrete_fields]
+    rows = _fetch(
+        queryset.filter(profile_id=profile_id).values_list(*field_names)[:2],
+        schema_name,
+    )
+    if not rows:
+        msg = f"{model._meta.object_name} matching query does not exist."
+        raise model.DoesNotExist(msg)
+    if len(rows) > 1:
+        msg = f"get() returned more than one {model._meta.object_name}."
+        raise model.MultipleObjectsReturned(msg)
+
+    perms = model.from_db(queryset.db, field_names, rows[0])
+    setattr(perms, SCHEMA_NAME_ATTR, schema_name)
+    return perms
+
+
+def get_permission_names(permissions: QuerySet[Any], perms: Model) -> set[str]:
+    """Returns the ``app_label.codename`` names of permissions.
+
+    Args:
+        permissions (QuerySet): Queryset of ``Permission``.
+        perms: The tenant permissions they were selected for. Their schema is
+            the one they were loaded from, or the current one.
+    """
+    if uses_shared_storage():
+        # Groups and permissions of the public schema are used by every tenant
+        schema_name = get_public_schema_name()
+    else:
+        schema_name = getattr(perms, SCHEMA_NAME_ATTR, None)
+        if schema_name is None:
+            schema_name = connections[permissions.db].schema_name
+    rows = _fetch(
+        permissions.values_list("content_type__app_label", "codename").order_by(),
+        schema_name,
+    )
+    return {f"{app_label}.{codename}" for app_label, codename in rows}
@@ -0,0 +1,138 @@
+"""Where tenant permissions are stored.
+
+By default, each tenant's permissions are
+:class:`~tenant_users.permissions.models.UserTenantPermissions` rows in the
+tenant's own schema, found through the connection's search path. With
+``TENANT_USERS_PERMISSIONS_STORAGE = "shared"``, they are
+:class:`~tenant_users.tenants.models.SharedUserTenantPermissions` rows in one
+public table keyed by tenant and profile, so permissions across all tenants
+are read with a single query and tenant schemas hold no permission tables.
+
+The helpers in this module hide the difference from the rest of the
+package: they return the model in use and querysets scoped to one tenant.
+
+Shared permissions reference the groups of the public schema, which every
+tenant uses. Groups of a tenant schema cannot be stored, so adding groups to
+shared permissions while the current schema has its own groups table raises
+``ValueError``.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django_tenants.utils import (
+    app_labels,
+    get_public_schema_name,
+    get_tenant_types,
+    has_multi_type_tenants,
+)
+
+if TYPE_CHECKING:
+    from django.db.models import Model, QuerySet
+
+SCHEMA_STORAGE = "schema"
+
+SHARED_STORAGE = "shared"
+
+
+def uses_shared_storage() -> bool:
+    """Checks whether tenant permissions are stored in the public schema."""
+    storage = getattr(settings, "TENANT_USERS_PERMISSIONS_STORAGE", SCHEMA_STORAGE)
+    if storage not in (SCHEMA_STORAGE, SHARED_STORAGE):
+        msg = f"Unknown TENANT_USERS_PERMISSIONS_STORAGE: {storage!r}"
+        raise ValueError(msg)
+    return storage == SHARED_STORAGE
+
+
+def get_tenant_perms_model() -> type[Model]:
+    """Returns the model tenant permissions are stored in."""
+    if uses_shared_storage():
+        return apps.get_model("tenant_users_tenants", "SharedUserTenantPermissions")
+    return apps.get_model("permissions", "UserTenantPermissions")
+
+
+def scope_tenant_perms(
+    queryset: QuerySet[Any], schema_name: str | None = None
+) -> QuerySet[Any]:
+    """Restricts a queryset of tenant permissions to one tenant.
+
+    Permissions stored in tenant schemas are already restricted by the search
+    path, so the queryset is returned as is.
+
+    Args:
+        queryset (QuerySet): Queryset of the model returned by
+            :func:`get_tenant_perms_model`.
+        schema_name (str, optional): Schema name of the tenant. Defaults to
+            the current schema.
+    """
+    if not uses_shared_storage():
+        return queryset
+    if schema_name is None:
+        schema_name = connection.schema_name  # type: ignore[attr-defined]
+    return queryset.filter(tenant__schema_name=schema_name)
+
+
+def get_tenant_perms_queryset(schema_name: str | None = None) -> QuerySet[Any]:
+    """Returns all tenant permissions of one tenant.
+
+    Args:
+        schema_name (str, optional): Schema name of the tenant. Defaults to
+            the current schema.
+    """
+    return scope_tenant_perms(get_tenant_perms_model().objects.all(), schema_name)
+
+
+def build_tenant_perms(tenant: Any, **fields: Any) -> Model:
+    """Returns unsaved tenant permissions of a user in ``tenant``.
+
+    Args:
+        tenant: The tenant the permissions apply to.
+        **fields: Field values, such as ``profile`` and ``is_staff``.
+    """
+    if uses_shared_storage():
+        fields["tenant"] = tenant
+    return get_tenant_perms_model()(**fields)
+
+
+def _tenant_has_groups() -> bool:
+    """Check whether the current schema has its own groups table."""
+    if connection.schema_name == get_public_schema_name():  # type: ignore[attr-defined]
+        return False
+    if has_multi_type_tenants():
+        tenant_apps = [
+            app
+            for tenant_type, config in get_tenant_types().items()
+            if tenant_type != get_public_schema_name()
+            for app in config["APPS"]
+        ]
+    else:
+        tenant_apps = settings.TENANT_APPS
+    return "auth" in app_labels(tenant_apps)
+
+
+def _shared_groups_changed(sender, action, pk_set, **kwargs) -> None:  # noqa: ARG001
+    if action == "pre_add" and pk_set and _tenant_has_groups():
+        msg = (
+            "Groups of shared tenant permissions are the public schema's, "
+            "add them from the public schema"
+        )
+        raise ValueError(msg)
+
+
+def connect_signals() -> None:
+    """Connects the receiver refusing tenant groups in shared permissions."""
+    from django.db.models.signals import m2m_changed  # noqa: PLC0415
+
+    from tenant_users.tenants.models import (  # noqa: PLC0415
+        SharedUserTenantPermissions,
+    )
+
+    m2m_changed.connect(
+        _shared_groups_changed,
+        sender=SharedUserTenantPermissions.groups.through,
+        dispatch_uid="tenant_users.permissions.storage",
+    )
@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from django.conf import settings
+
+from tenant_users.permissions.storage import get_tenant_perms_model
+
 if TYPE_CHECKING:
     from django.db.models import QuerySet
 
@@ -32,8 +36,24 @@ def get_optimized_tenant_perms_queryset() -> QuerySet[UserTenantPermissions]:
         the user profile or groups along with permissions. If you have different
         requirements, you can create your own custom optimizer function.
     """
-    from tenant_users.permissions.models import UserTenantPermissions  # noqa: PLC0415
-
-    return UserTenantPermissions.objects.select_related("profile").prefetch_related(
-        "groups"
+    return (
+        get_tenant_perms_model()
+        .objects.select_related("profile")
+        .prefetch_related("groups")
     )
+
+
+def public_membership_is_implicit() -> bool:
+    """Checks whether every user is implicitly a member of the public tenant.
+
+    With ``TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP`` enabled, creating a user
+    no longer adds them to the public tenant. Users without a
+    ``UserTenantPermissions`` row in the public schema are members with
+    default permissions: no staff or superuser status and no groups. A row is
+    only created when a user gets other permissions, through
+    ``public_tenant.add_user()``.
+
+    Returns:
+        bool: True if public tenant membership is implicit.
+    """
+    return getattr(settings, "TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP", False)
@@ -7,3 +7,9 @@ class TenantsConfig(AppConfig):
     default_auto_field = "django.db.models.AutoField"
     name = "tenant_users.tenants"
     label = "tenant_users_tenants"
+
+    def ready(self) -> None:
+        from tenant_users.tenants import cache, roles  # noqa: PLC0415
+
+        cache.connect_signals()
+        roles.connect_signals()
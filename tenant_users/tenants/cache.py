@@ -0,0 +1,255 @@
+"""Cache of the tenants each user is a member of.
+
+``TenantAccessMiddleware`` checks the membership of the requesting user on
+every request. When ``TENANT_USERS_MEMBERSHIP_CACHE`` is set, the ids of all
+tenants of a user are loaded with one query and kept, so that later checks do
+not query the database. The setting accepts either ``"local"``, for a least
+recently used cache in each process, or the alias of one of the ``CACHES``.
+
+Entries are dropped when a user is added to or removed from a tenant, or
+deleted, through the receivers connected in ``TenantsConfig.ready()``. A local
+cache only sees the changes made by its own process, so entries also expire
+after ``TENANT_USERS_MEMBERSHIP_CACHE_TIMEOUT`` seconds, which bounds how long
+other processes may serve stale memberships.
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection, transaction
+from django_tenants.utils import get_public_schema_name
+
+from tenant_users.permissions.utils import public_membership_is_implicit
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+
+LOCAL_MEMBERSHIP_CACHE = "local"
+
+DEFAULT_MEMBERSHIP_CACHE_TIMEOUT = 60
+
+DEFAULT_MEMBERSHIP_CACHE_SIZE = 10000
+
+
+class LocalMembershipCache:
+    """A thread-safe, per-process LRU cache of user memberships.
+
+    Args:
+        max_size (int): Number of users kept before the least recently used
+            ones are evicted.
+        timeout (float, optional): Seconds an entry is kept. None keeps entries
+            until they are evicted or invalidated.
+    """
+
+    def __init__(self, max_size: int, timeout: float | None) -> None:
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries: OrderedDict[Any, tuple[float, frozenset[Any]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_pk: Any) -> frozenset[Any] | None:
+        with self._lock:
+            entry = self._entries.get(user_pk)
+            if entry is None:
+                return None
+            expires, tenant_ids = entry
+            if expires < time.monotonic():
+                del self._entries[user_pk]
+                return None
+            self._entries.move_to_end(user_pk)
+            return tenant_ids
+
+    def set(self, user_pk: Any, tenant_ids: frozenset[Any]) -> None:
+        expires = (
+            float("inf") if self.timeout is None else time.monotonic() + self.timeout
+        )
+        with self._lock:
+            self._entries[user_pk] = (expires, tenant_ids)
+            self._entries.move_to_end(user_pk)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, user_pk: Any) -> None:
+        with self._lock:
+            self._entries.pop(user_pk, None)
+
+    async def aget(self, user_pk: Any) -> frozenset[Any] | None:
+        return self.get(user_pk)
+
+    async def aset(self, user_pk: Any, tenant_ids: frozenset[Any]) -> None:
+        self.set(user_pk, tenant_ids)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoMembershipCache:
+    """Stores user memberships in a Django cache shared between processes.
+
+    Args:
+        cache (BaseCache): The cache to store memberships in.
+        timeout (float, optional): Seconds an entry is kept. None keeps entries
+            until they are invalidated.
+    """
+
+    key_prefix = "tenant_users:tenants"
+
+    def __init__(self, cache: BaseCache, timeout: float | None) -> None:
+        self.cache = cache
+        self.timeout = timeout
+
+    def _key(self, user_pk: Any) -> str:
+        return f"{self.key_prefix}:{user_pk}"
+
+    def get(self, user_pk: Any) -> frozenset[Any] | None:
+        return self.cache.get(self._key(user_pk))
+
+    def set(self, user_pk: Any, tenant_ids: frozenset[Any]) -> None:
+        self.cache.set(self._key(user_pk), tenant_ids, self.timeout)
+
+    def delete(self, user_pk: Any) -> None:
+        self.cache.delete(self._key(user_pk))
+
+    async def aget(self, user_pk: Any) -> frozenset[Any] | None:
+        return await self.cache.aget(self._key(user_pk))
+
+    async def aset(self, user_pk: Any, tenant_ids: frozenset[Any]) -> None:
+        await self.cache.aset(self._key(user_pk), tenant_ids, self.timeout)
+
+
+@functools.cache
+def _local_membership_cache(
+    max_size: int, timeout: float | None
+) -> LocalMembershipCache:
+    return LocalMembershipCache(max_size, timeout)
+
+
+def get_membership_cache() -> LocalMembershipCache | DjangoMembershipCache | None:
+    """Returns the cache configured by ``TENANT_USERS_MEMBERSHIP_CACHE``, if any."""
+    backend = getattr(settings, "TENANT_USERS_MEMBERSHIP_CACHE", None)
+    if backend is None:
+        return None
+
+    timeout = getattr(
+        settings,
+        "TENANT_USERS_MEMBERSHIP_CACHE_TIMEOUT",
+        DEFAULT_MEMBERSHIP_CACHE_TIMEOUT,
+    )
+    if backend == LOCAL_MEMBERSHIP_CACHE:
+        max_size = getattr(
+            settings,
+            "TENANT_USERS_MEMBERSHIP_CACHE_SIZE",
+            DEFAULT_MEMBERSHIP_CACHE_SIZE,
+        )
+        return _local_membership_cache(max_size, timeout)
+    return DjangoMembershipCache(caches[backend], timeout)
+
+
+def get_user_tenant_ids(user_obj) -> frozenset[Any]:
+    """Returns the primary keys of all tenants a user is a member of.
+
+    The ids are read from the membership cache when one is configured, and
+    stored in it after being loaded.
+
+    Args:
+        user_obj: The user to look up.
+
+    Returns:
+        frozenset: Primary keys of the user's tenants.
+    """
+    cache = get_membership_cache()
+    tenant_ids = None if cache is None else cache.get(user_obj.pk)
+    if tenant_ids is None:
+        tenant_ids = frozenset(user_obj.tenants.values_list("pk", flat=True))
+        if cache is not None:
+            cache.set(user_obj.pk, tenant_ids)
+    return tenant_ids
+
+
+async def aget_user_tenant_ids(user_obj) -> frozenset[Any]:
+    """Async version of :func:`get_user_tenant_ids`."""
+    cache = get_membership_cache()
+    tenant_ids = None if cache is None else await cache.aget(user_obj.pk)
+    if tenant_ids is None:
+        tenant_ids = frozenset(
+            [pk async for pk in user_obj.tenants.values_list("pk", flat=True)]
+        )
+        if cache is not None:
+            await cache.aset(user_obj.pk, tenant_ids)
+    return tenant_ids
+
+
+def _is_implicit_member(tenant) -> bool:
+    return (
+        tenant.schema_name == get_public_schema_name()
+        and public_membership_is_implicit()
+    )
+
+
+def user_has_tenant_access(user_obj, tenant) -> bool:
+    """Checks whether a user is a member of a tenant.
+
+    Without a membership cache this is a single ``exists()`` query. With one,
+    the check is answered from the user's cached tenant ids. Every user is a
+    member of the public tenant when ``TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP``
+    is enabled, so no query is needed for it.
+
+    Args:
+        user_obj: The user to check.
+        tenant: The tenant the user wants to access.
+
+    Returns:
+        bool: True if the user is a member of the tenant.
+    """
+    if _is_implicit_member(tenant):
+        return True
+    if get_membership_cache() is None:
+        return user_obj.tenants.filter(pk=tenant.pk).exists()
+    return tenant.pk in get_user_tenant_ids(user_obj)
+
+
+async def auser_has_tenant_access(user_obj, tenant) -> bool:
+    """Async version of :func:`user_has_tenant_access`."""
+    if _is_implicit_member(tenant):
+        return True
+    if get_membership_cache() is None:
+        return await user_obj.tenants.filter(pk=tenant.pk).aexists()
+    return tenant.pk in await aget_user_tenant_ids(user_obj)
+
+
+def invalidate_user_tenants(user_pk: Any) -> None:
+    """Drops the cached memberships of a user."""
+    cache = get_membership_cache()
+    if cache is None:
+        return
+
+    cache.delete(user_pk)
+    # Other processes may cache the old memberships again until the
+    # transaction commits, so invalidate once more when it does
+    if connection.in_atomic_block:
+        transaction.on_commit(functools.partial(cache.delete, user_pk))
+
+
+def _membership_changed(sender, user, **kwargs) -> None:  # noqa: ARG001
+    invalidate_user_tenants(user.pk)
+
+
+def connect_signals() -> None:
+    """Connects the receivers that keep the membership cache up to date."""
+    from tenant_users.tenants.models import (  # noqa: PLC0415
+        tenant_user_added,
+        tenant_user_deleted,
+        tenant_user_removed,
+    )
+
+    dispatch_uid = "tenant_users.tenants.cache"
+    for signal in (tenant_user_added, tenant_user_removed, tenant_user_deleted):
+        signal.connect(_membership_changed, dispatch_uid=dispatch_uid)
@@ -0,0 +1,190 @@
+"""Schemas created on first use, for tenants provisioned with ``lazy_schema``.
+
+``provision_tenant(..., lazy_schema=True)`` only writes the tenant and domain
+rows and links the owner. The schema is created and migrated, and the owner's
+tenant permissions added, by :func:`materialize_schema`: on the first request
+to the tenant through ``LazySchemaMiddleware``, or ahead of time by the
+``materialize_schemas`` management command. Tenant methods such as
+``add_user()`` materialize it too, so they never write to the public schema,
+which the search path of a missing schema falls through to. Code entering a
+pending tenant with ``tenant_context`` must call :func:`materialize_schema`
+first.
+
+Concurrent first requests to the same tenant are serialized with a Postgres
+advisory lock, so the schema is materialized once and the other requests
+wait for it. Each process remembers the schemas it has seen materialized, so
+once a tenant is ready, requests to it run no extra queries.
+
+``migrate_schemas`` fails on tenants without a schema. To skip pending
+tenants, whose schemas are migrated when they are materialized, set::
+
+    GET_EXECUTOR_FUNCTION = "tenant_users.tenants.lazy.get_migration_executor"
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import zlib
+from typing import Any
+
+from django.db import connection
+from django_tenants.migration_executors import get_executor
+from django_tenants.utils import get_public_schema_name, schema_context, schema_exists
+
+from tenant_users.tenants.models import TenantProvisioning
+from tenant_users.tenants.tasks import resume_provisioning
+
+# First key of the advisory locks, the second one is the schema name's hash
+_LOCK_NAMESPACE = zlib.crc32(b"tenant_users.lazy_schema") & 0x7FFFFFFF
+
+_materialized: set[str] = set()
+_materialized_lock = threading.Lock()
+
+
+def _pending_provisionings():
+    return TenantProvisioning.objects.filter(lazy_schema=True).exclude(
+        stage=TenantProvisioning.Stage.DONE
+    )
+
+
+def _mark_materialized(schema_name: str) -> None:
+    with _materialized_lock:
+        _materialized.add(schema_name)
+
+
+def forget_materialized_schemas() -> None:
+    """Forgets which schemas this process has seen materialized.
+
+    Needed when materialized schemas can disappear again, such as in tests
+    rolling back their transaction.
+    """
+    with _materialized_lock:
+        _materialized.clear()
+
+
+def is_known_materialized(schema_name: str) -> bool:
+    """Checks whether this process has seen a tenant's schema materialized.
+
+    Runs no queries, so it is safe to call from async code. False means the
+    schema may still be pending, see :func:`is_schema_pending`.
+
+    Args:
+        schema_name (str): Schema name of the tenant.
+    """
+    return schema_name in _materialized
+
+
+def is_schema_pending(schema_name: str) -> bool:
+    """Checks whether a tenant's schema still has to be materialized.
+
+    Args:
+        schema_name (str): Schema name of the tenant.
+
+    Returns:
+        bool: True if the tenant was provisioned lazily and its schema has not
+        been created yet.
+    """
+    if is_known_materialized(schema_name):
+        return False
+
+    with schema_context(get_public_schema_name()):
+        pending = _pending_provisionings().filter(schema_name=schema_name).exists()
+    if not pending:
+        _mark_materialized(schema_name)
+    return pending
+
+
+def materialize_schema(schema_name: str) -> bool:
+    """Creates and migrates the schema of a lazily provisioned tenant.
+
+    Waits for any other process materializing the same schema, then runs the
+    remaining provisioning stages if they are still pending.
+
+    Args:
+        schema_name (str): Schema name of the tenant.
+
+    Returns:
+        bool: True if this call materialized the schema, False if it was
+        already materialized.
+
+    Raises:
+        Exception: Anything raised by a provisioning stage.
+    """
+    with schema_context(get_public_schema_name()):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT pg_advisory_lock(%s, hashtext(%s))",
+                [_LOCK_NAMESPACE, schema_name],
+            )
+        try:
+            provisioning = (
+                _pending_provisionings().filter(schema_name=schema_name).first()
+            )
+            if provisioning is not None:
+                resume_provisioning(provisioning)
+        finally:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_unlock(%s, hashtext(%s))",
+                    [_LOCK_NAMESPACE, schema_name],
+                )
+
+    _mark_materialized(schema_name)
+    return provisioning is not None
+
+
+def pending_schema_names(limit: int | None = None) -> list[str]:
+    """Returns the schemas of lazily provisioned tenants, oldest first.
+
+    Args:
+        limit (int, optional): Maximum number of schema names to return.
+    """
+    with schema_context(get_public_schema_name()):
+        names = _pending_provisionings().order_by("started_at")
+        return list(names.values_list("schema_name", flat=True)[:limit])
+
+
+def _skip_pending(tenants: list[Any]) -> list[Any]:
+    """Drop the tenants, or (schema, type) pairs, whose schema is pending."""
+    public_schema = get_public_schema_name()
+    schema_names = [
+        tenant if isinstance(tenant, str) else tenant[0] for tenant in tenants
+    ]
+    if not set(schema_names) - {public_schema}:
+        return tenants
+
+    # A pending tenant being materialized has its schema, and is migrated
+    pending = {
+        schema_name
+        for schema_name in pending_schema_names()
+        if not schema_exists(schema_name)
+    }
+    return [
+        tenant
+        for tenant, schema_name in zip(tenants, schema_names)
+        if schema_name not in pending
+    ]
+
+
+@functools.cache
+def get_migration_executor(codename: str | None = None) -> type:
+    """Returns a ``migrate_schemas`` executor skipping pending tenants.
+
+    Wraps the django-tenants executor selected by ``--executor`` so tenants
+    whose schema has not been materialized yet are left out instead of
+    failing. Use it with ``GET_EXECUTOR_FUNCTION``.
+
+    Args:
+        codename (str, optional): Codename of the django-tenants executor.
+    """
+    executor_class = get_executor(codename)
+
+    class LazySchemaExecutor(executor_class):
+        def run_migrations(self, tenants=None):
+            super().run_migrations(_skip_pending(tenants or []))
+
+        def run_multi_type_migrations(self, tenants):
+            super().run_multi_type_migrations(_skip_pending(tenants or []))
+
+    return LazySchemaExecutor
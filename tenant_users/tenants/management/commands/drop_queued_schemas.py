@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+
+from tenant_users.tenants.schema_drops import drop_queued_schemas
+
+
+class Command(BaseCommand):
+    help = (
+        "Drops the schemas of deleted tenants queued by TENANT_USERS_DEFER_SCHEMA_DROP"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of schemas to drop.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of schemas dropped at the same time.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds each worker waits after dropping a schema.",
+        )
+        parser.add_argument(
+            "--lock-timeout",
+            type=float,
+            default=None,
+            help="Seconds to wait for locks before skipping a schema.",
+        )
+
+    def handle(self, limit, workers, pause, lock_timeout, **kwargs):  # noqa: ARG002
+        def progress(processed: int, total: int) -> None:
+            self.stdout.write(f"Processed {processed}/{total} queued schemas")
+
+        dropped, errors = drop_queued_schemas(
+            limit=limit,
+            max_workers=workers,
+            pause=pause,
+            lock_timeout=lock_timeout,
+            progress=progress,
+        )
+        for schema_name, error in errors.items():
+            self.stdout.write(
+                self.style.ERROR(f"Error dropping {schema_name}: {error}")
+            )
+        self.stdout.write(self.style.SUCCESS(f"Dropped {len(dropped)} schemas"))
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tenant_users.tenants.models import SchemaError
+from tenant_users.tenants.pool import fill_schema_pool, schema_pool_stats
+
+
+class Command(BaseCommand):
+    help = "Creates and migrates schemas for the pool used by provision_tenant"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size",
+            type=int,
+            default=None,
+            help="Number of schemas to keep ready. Defaults to TENANT_USERS_SCHEMA_POOL_SIZE.",
+        )
+        parser.add_argument(
+            "--tenant-type",
+            type=str,
+            default=None,
+            help="Tenant type to migrate the schemas for, with HAS_MULTI_TYPE_TENANTS.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=None,
+            help="Keep running and refill the pool every INTERVAL seconds.",
+        )
+
+    def handle(self, size, tenant_type, interval, **kwargs):
+        while True:
+            try:
+                created = fill_schema_pool(
+                    size,
+                    tenant_type=tenant_type,
+                    verbosity=max(kwargs["verbosity"] - 1, 0),
+                )
+            except SchemaError as e:
+                self.stdout.write(self.style.ERROR(f"Error filling schema pool: {e}"))
+                return
+
+            stats = schema_pool_stats(tenant_type)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Created {created} schemas, {stats.depth} ready in the pool"
+                )
+            )
+            if interval is None:
+                return
+            time.sleep(interval)
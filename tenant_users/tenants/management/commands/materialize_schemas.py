@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tenant_users.tenants.lazy import materialize_schema, pending_schema_names
+
+
+class Command(BaseCommand):
+    help = (
+        "Creates the schemas of lazily provisioned tenants ahead of their first request"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of schemas to materialize.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds to wait between two schemas.",
+        )
+
+    def handle(self, limit, pause, **kwargs):  # noqa: ARG002
+        schema_names = pending_schema_names(limit)
+        for index, schema_name in enumerate(schema_names, start=1):
+            try:
+                materialize_schema(schema_name)
+            except Exception as e:  # noqa: BLE001
+                self.stdout.write(
+                    self.style.ERROR(f"Error materializing {schema_name}: {e}")
+                )
+            else:
+                self.stdout.write(
+                    f"Materialized {schema_name} ({index}/{len(schema_names)})"
+                )
+            if pause and index < len(schema_names):
+                time.sleep(pause)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {len(schema_names)} pending schemas")
+        )
@@ -0,0 +1,29 @@
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+
+from tenant_users.constants import DEFAULT_BATCH_SIZE
+from tenant_users.tenants.utils import prune_public_memberships
+
+
+class Command(BaseCommand):
+    help = "Removes public tenant memberships made redundant by TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Number of memberships removed per transaction.",
+        )
+
+    def handle(self, batch_size, **kwargs):  # noqa: ARG002
+        def progress(removed: int) -> None:
+            self.stdout.write(f"Removed {removed} memberships")
+
+        try:
+            removed = prune_public_memberships(batch_size=batch_size, progress=progress)
+        except ImproperlyConfigured as e:
+            raise CommandError(str(e)) from e
+        self.stdout.write(
+            self.style.SUCCESS(f"Pruned {removed} public tenant memberships")
+        )
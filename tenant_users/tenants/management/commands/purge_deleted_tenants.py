@@ -0,0 +1,134 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from tenant_users.tenants.tombstones import (
+    purge_tombstoned_tenants,
+    size_tombstoned_tenants,
+    track_untracked_tombstones,
+    untracked_deleted_tenants,
+)
+
+
+class Command(BaseCommand):
+    help = "Removes the schemas and rows of tenants deleted with delete_tenant()"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=30,
+            help="Only purge tenants deleted more than DAYS days ago.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many tenants and how much data would be purged.",
+        )
+        parser.add_argument(
+            "--archive",
+            action="store_true",
+            help="Keep the tombstones of purged tenants as an archive.",
+        )
+        parser.add_argument(
+            "--track-untracked",
+            action="store_true",
+            help=(
+                "First list tenants deleted before tombstones existed and, once "
+                "confirmed, record their tombstones."
+            ),
+        )
+        parser.add_argument(
+            "--noinput",
+            "--no-input",
+            action="store_false",
+            dest="interactive",
+            help="Record untracked deleted tenants without asking for confirmation.",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of tenants to purge.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Number of tenants removed before their schemas are dropped.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of schemas dropped at the same time.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=0,
+            help="Seconds each worker waits after dropping a schema.",
+        )
+        parser.add_argument(
+            "--lock-timeout",
+            type=float,
+            default=None,
+            help="Seconds to wait for locks before skipping a schema.",
+        )
+
+    def handle(self, **options):
+        if options["track_untracked"]:
+            self.track_untracked(
+                dry_run=options["dry_run"], interactive=options["interactive"]
+            )
+
+        older_than = timedelta(days=options["days"])
+        if options["dry_run"]:
+            sizing = size_tombstoned_tenants(older_than, limit=options["limit"])
+            self.stdout.write(
+                f"Would purge {sizing.tenants} tenants with {sizing.schemas} "
+                f"schemas, freeing {sizing.size / 1024**2:.1f} MB"
+            )
+            return
+
+        def progress(processed: int, total: int) -> None:
+            self.stdout.write(f"Processed {processed}/{total} deleted tenants")
+
+        purged, errors = purge_tombstoned_tenants(
+            older_than,
+            archive=options["archive"],
+            limit=options["limit"],
+            batch_size=options["batch_size"],
+            max_workers=options["workers"],
+            pause=options["pause"],
+            lock_timeout=options["lock_timeout"],
+            progress=progress,
+        )
+        for schema_name, error in errors.items():
+            self.stdout.write(self.style.ERROR(f"Error purging {schema_name}: {error}"))
+        self.stdout.write(self.style.SUCCESS(f"Purged {len(purged)} tenants"))
+
+    def track_untracked(self, *, dry_run: bool, interactive: bool) -> None:
+        candidates = untracked_deleted_tenants()
+        for schema_name, slug in candidates:
+            self.stdout.write(f"Untracked deleted tenant {slug} ({schema_name})")
+        if dry_run:
+            self.stdout.write(
+                f"Would record {len(candidates)} untracked deleted tenants"
+            )
+            return
+        if not candidates:
+            return
+        if interactive:
+            answer = input(
+                f"Record {len(candidates)} tenants as deleted, to be purged? "
+                "Type 'yes' to continue, or 'no' to skip: "
+            )
+            if answer != "yes":
+                self.stdout.write("Untracked deleted tenants were not recorded")
+                return
+
+        tracked = track_untracked_tombstones(
+            schema_name for schema_name, _ in candidates
+        )
+        self.stdout.write(f"Recorded {tracked} untracked deleted tenants")
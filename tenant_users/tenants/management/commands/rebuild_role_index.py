@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django_tenants.utils import get_tenant_model
+
+from tenant_users.tenants.roles import rebuild_role_index, verify_role_index
+
+
+class Command(BaseCommand):
+    help = "Rebuilds, or verifies, the role index of the tenants from their permissions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report the differences, and fail if there are any.",
+        )
+        parser.add_argument(
+            "--schema",
+            action="append",
+            dest="schema_names",
+            default=None,
+            help="Schema name of a tenant to process. Can be given several times.",
+        )
+
+    def handle(self, verify, schema_names, **kwargs):  # noqa: ARG002
+        tenants = get_tenant_model().objects.order_by("pk")
+        if schema_names:
+            tenants = tenants.filter(schema_name__in=schema_names)
+
+        check = verify_role_index if verify else rebuild_role_index
+        differing = 0
+        total = 0
+        for tenant in tenants.iterator():
+            total += 1
+            diff = check(tenant)
+            if any(diff):
+                differing += 1
+                self.stdout.write(
+                    f"{tenant.schema_name}: {diff.missing} missing, "
+                    f"{diff.stale} stale, {diff.extra} extra"
+                )
+
+        if verify and differing:
+            msg = f"The role index differs from the permissions of {differing} of {total} tenants"
+            raise CommandError(msg)
+        action = "Verified" if verify else "Rebuilt"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{action} the role index of {total} tenants, {differing} differed"
+            )
+        )
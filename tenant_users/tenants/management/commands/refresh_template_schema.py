@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from tenant_users.tenants.models import SchemaError
+from tenant_users.tenants.template import refresh_template_schema
+
+
+class Command(BaseCommand):
+    help = "Creates or migrates the template schema cloned by provision_tenant"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tenant-type",
+            type=str,
+            default=None,
+            help="Tenant type of the template, with HAS_MULTI_TYPE_TENANTS.",
+        )
+
+    def handle(self, tenant_type, **kwargs):
+        try:
+            template = refresh_template_schema(
+                tenant_type, verbosity=max(kwargs["verbosity"] - 1, 0)
+            )
+        except SchemaError as e:
+            self.stdout.write(
+                self.style.ERROR(f"Error refreshing template schema: {e}")
+            )
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Template schema {template} is up to date")
+        )
@@ -0,0 +1,66 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tenant_users.tenants.models import TenantProvisioning
+from tenant_users.tenants.tasks import resume_provisioning
+
+
+class Command(BaseCommand):
+    help = "Lists and resumes tenant provisionings that did not complete"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            dest="list_only",
+            help="Only list the incomplete provisionings.",
+        )
+        parser.add_argument(
+            "--schema-name",
+            type=str,
+            default=None,
+            help="Only resume the provisioning of this schema.",
+        )
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=300,
+            help="Skip provisionings updated in the last OLDER_THAN seconds, which may still be running.",
+        )
+
+    def handle(self, list_only, schema_name, older_than, **kwargs):  # noqa: ARG002
+        provisionings = (
+            TenantProvisioning.objects.exclude(stage=TenantProvisioning.Stage.DONE)
+            # Lazy schemas wait for their first request, unless that failed
+            .exclude(lazy_schema=True, error="")
+            .order_by("started_at")
+        )
+        if schema_name:
+            provisionings = provisionings.filter(schema_name=schema_name)
+        else:
+            cutoff = timezone.now() - timedelta(seconds=older_than)
+            provisionings = provisionings.filter(modified_at__lte=cutoff)
+
+        for provisioning in provisionings:
+            description = (
+                f"{provisioning.schema_name} ({provisioning.domain}): "
+                f"{provisioning.stage}, {provisioning.attempts} attempts"
+            )
+            if list_only:
+                self.stdout.write(
+                    f"{description}, last error: {provisioning.error or '-'}"
+                )
+                continue
+
+            try:
+                resume_provisioning(provisioning)
+            except Exception as e:  # noqa: BLE001
+                self.stdout.write(
+                    self.style.ERROR(f"Error resuming {description}: {e}")
+                )
+            else:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Provisioned {provisioning.schema_name}")
+                )
@@ -1,28 +1,57 @@
-from typing import Callable
+from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.conf import settings
 from django.http import Http404, HttpRequest, HttpResponse
 from django.utils.translation import gettext_lazy as _
 
+from tenant_users.permissions.functional import current_schema_name
+from tenant_users.tenants.cache import auser_has_tenant_access, user_has_tenant_access
+from tenant_users.tenants.lazy import (
+    is_known_materialized,
+    is_schema_pending,
+    materialize_schema,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
 
 class TenantAccessMiddleware:
     """Middleware to ensure the user has access to the requested tenant.
 
     If the user is authenticated but does not have access to the requested
     tenant, a 404 error is raised. Unauthenticated users are allowed to proceed.
+    Memberships are read from the cache configured by
+    ``TENANT_USERS_MEMBERSHIP_CACHE``, when set.
+
+    The middleware supports both sync and async request handling. Under ASGI
+    the access check runs natively on the event loop, using the async ORM.
+    The tenant's schema is also made available to async code, such as the
+    async permission checks, through ``current_schema_name``.
 
     Attributes:
         get_response (Callable): The next middleware or view to be called.
         error_message (str): Customizable error message for unauthorized access.
     """
 
-    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]],
+    ):
         """Initialize the middleware.
 
         Args:
             get_response (Callable): The next middleware or view to be called.
         """
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
         self.error_message = getattr(
             settings,
             "TENANT_USERS_ACCESS_ERROR_MESSAGE",
@@ -41,10 +70,28 @@ class TenantAccessMiddleware:
         Raises:
             Http404: If the user does not have access to the requested tenant.
         """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # type: ignore[return-value]
+
         if not self.has_tenant_access(request):
             raise Http404(self.error_message)
 
-        return self.get_response(request)
+        token = current_schema_name.set(request.tenant.schema_name)  # type: ignore[attr-defined]
+        try:
+            return self.get_response(request)  # type: ignore[return-value]
+        finally:
+            current_schema_name.reset(token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of :meth:`__call__`."""
+        if not await self.ahas_tenant_access(request):
+            raise Http404(self.error_message)
+
+        token = current_schema_name.set(request.tenant.schema_name)  # type: ignore[attr-defined]
+        try:
+            return await self.get_response(request)  # type: ignore[misc]
+        finally:
+            current_schema_name.reset(token)
 
     def has_tenant_access(self, request: HttpRequest) -> bool:
         """Check if the user has access to the requested tenant.
@@ -58,4 +105,87 @@ class TenantAccessMiddleware:
         if not request.user.is_authenticated:
             return True
 
-        return request.user.tenants.filter(pk=request.tenant.pk).exists()  # type: ignore[attr-defined]
+        return user_has_tenant_access(request.user, request.tenant)  # type: ignore[attr-defined]
+
+    async def ahas_tenant_access(self, request: HttpRequest) -> bool:
+        """Async version of :meth:`has_tenant_access`.
+
+        Args:
+            request (HttpRequest): The current request object.
+
+        Returns:
+            bool: True if the user has access or is unauthenticated, False otherwise.
+        """
+        if hasattr(request, "auser"):
+            user = await request.auser()
+        else:
+            # Before Django 5.0 there is only the lazy request.user, so load
+            # it outside the event loop
+            await sync_to_async(getattr)(request.user, "is_authenticated")
+            user = request.user
+
+        if not user.is_authenticated:
+            return True
+
+        return await auser_has_tenant_access(user, request.tenant)  # type: ignore[attr-defined]
+
+
+class LazySchemaMiddleware:
+    """Middleware creating the schema of lazily provisioned tenants on first use.
+
+    Tenants provisioned with ``lazy_schema=True`` have no schema until their
+    first request, which materializes it before the view runs. Concurrent
+    first requests wait for the one materializing the schema. Place it after
+    ``TenantMainMiddleware``.
+
+    Attributes:
+        get_response (Callable): The next middleware or view to be called.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(
+        self,
+        get_response: Callable[[HttpRequest], HttpResponse | Awaitable[HttpResponse]],
+    ):
+        """Initialize the middleware.
+
+        Args:
+            get_response (Callable): The next middleware or view to be called.
+        """
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        """Materialize the tenant's schema if needed and process the request.
+
+        Args:
+            request (HttpRequest): The current request object.
+
+        Returns:
+            HttpResponse: The response object from the next middleware or view.
+        """
+        if iscoroutinefunction(self):
+            return self.__acall__(request)  # type: ignore[return-value]
+
+        self.ensure_schema(request)
+        return self.get_response(request)  # type: ignore[return-value]
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        """Async version of :meth:`__call__`."""
+        # Only tenants not yet seen materialized need a thread for the queries
+        if not is_known_materialized(request.tenant.schema_name):  # type: ignore[attr-defined]
+            await sync_to_async(self.ensure_schema)(request)
+        return await self.get_response(request)  # type: ignore[misc]
+
+    def ensure_schema(self, request: HttpRequest) -> None:
+        """Materialize the schema of the requested tenant if it is still pending.
+
+        Args:
+            request (HttpRequest): The current request object.
+        """
+        schema_name = request.tenant.schema_name  # type: ignore[attr-defined]
+        if is_schema_pending(schema_name):
+            materialize_schema(schema_name)
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant_users_tenants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PooledSchema",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("schema_name", models.CharField(max_length=63, unique=True)),
+                (
+                    "tenant_type",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Tenant type the schema was migrated for, if any.",
+                        max_length=100,
+                    ),
+                ),
+                (
+                    "fingerprint",
+                    models.CharField(
+                        help_text="Fingerprint of the migrations applied to the schema.",
+                        max_length=64,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant_users_tenants", "0002_pooledschema"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TenantProvisioning",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=255)),
+                ("slug", models.CharField(max_length=255)),
+                ("domain", models.CharField(max_length=253)),
+                ("schema_name", models.CharField(max_length=63, unique=True)),
+                (
+                    "tenant_type",
+                    models.CharField(blank=True, default="", max_length=100),
+                ),
+                ("is_staff", models.BooleanField(default=False)),
+                ("is_superuser", models.BooleanField(default=True)),
+                ("tenant_extra_data", models.JSONField(blank=True, default=dict)),
+                ("domain_extra_data", models.JSONField(blank=True, default=dict)),
+                (
+                    "stage",
+                    models.CharField(
+                        choices=[
+                            ("reserve_domain", "Reserve domain"),
+                            ("create_schema", "Create schema"),
+                            ("migrate", "Migrate"),
+                            ("link_owner", "Link owner"),
+                            ("finalize", "Finalize"),
+                            ("done", "Done"),
+                        ],
+                        default="reserve_domain",
+                        help_text="Next stage to run.",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "stage_timings",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        help_text="Seconds each completed stage took.",
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "error",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="Error raised by the last failed stage.",
+                    ),
+                ),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                (
+                    "owner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant_users_tenants", "0003_tenantprovisioning"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tenantprovisioning",
+            name="lazy_schema",
+            field=models.BooleanField(
+                default=False,
+                help_text="The schema is created on the first request to the tenant.",
+            ),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenant_users_tenants", "0004_tenantprovisioning_lazy_schema"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedSchemaDrop",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "schema_name",
+                    models.CharField(
+                        help_text="Name the schema was renamed to when it was queued.",
+                        max_length=63,
+                        unique=True,
+                    ),
+                ),
+                ("original_schema_name", models.CharField(max_length=63)),
+                ("queued_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
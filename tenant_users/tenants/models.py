@@ -1,26 +1,45 @@
 from __future__ import annotations
 
+import multiprocessing
 import time
-from typing import TYPE_CHECKING, Any, Callable, ClassVar
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, NamedTuple
 
+import django
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
-from django.db import connection, models, transaction
+from django.contrib.auth.hashers import get_hasher, make_password
+from django.contrib.auth.models import (
+    AbstractBaseUser,
+    BaseUserManager,
+    Group,
+    Permission,
+)
+from django.db import close_old_connections, connection, models, transaction
 from django.dispatch import Signal
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from django_tenants.models import TenantMixin
-from django_tenants.utils import (
-    get_public_schema_name,
-    get_tenant_model,
-    tenant_context,
-)
+from django_tenants.utils import get_public_schema_name, get_tenant_model
 
-from tenant_users.constants import TENANT_CACHE_NAME, TENANT_DELETE_ERROR_MESSAGE
+from tenant_users.constants import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_TENANT_CHUNK_SIZE,
+    TENANT_CACHE_NAME,
+    TENANT_DELETE_ERROR_MESSAGE,
+)
 from tenant_users.permissions.models import (
+    AbstractUserTenantPermissions,
     PermissionsMixinFacade,
-    UserTenantPermissions,
 )
+from tenant_users.permissions.storage import (
+    build_tenant_perms,
+    get_tenant_perms_model,
+    get_tenant_perms_queryset,
+)
+from tenant_users.permissions.utils import public_membership_is_implicit
+from tenant_users.tenants.switching import pinned_tenant
 
 # An existing user removed from a tenant
 tenant_user_removed = Signal()
@@ -34,7 +53,14 @@ tenant_user_created = Signal()
 # An existing user is deleted
 tenant_user_deleted = Signal()
 
+# A pooled schema is claimed by a new tenant
+schema_pool_claimed = Signal()
+
+# A stage of a resumable tenant provisioning is completed
+tenant_provisioning_stage_completed = Signal()
+
 if TYPE_CHECKING:
+    from collections.abc import Iterable
     from typing import TypeVar
 
     # TypeVar for user profile models - only for type checkers
@@ -72,6 +98,8 @@ def schema_required(func: Callable[..., Any]) -> Callable[..., Any]:
       before calling these methods, risking data corruption or missing records
     - Uses django-tenants' tenant_context to properly manage both
       connection.schema_name and connection.tenant state
+    - Skips the switch when the connection is already on the tenant's schema,
+      see :func:`~tenant_users.tenants.switching.pinned_tenant`
 
     Args:
         func: The tenant method to decorate. Should be a method on a tenant instance.
@@ -81,12 +109,57 @@ def schema_required(func: Callable[..., Any]) -> Callable[..., Any]:
     """
 
     def inner(self, *args, **kwargs):
-        with tenant_context(self):
+        with pinned_tenant(self):
             return func(self, *args, **kwargs)
 
     return inner
 
 
+async def _arun_sync(
+    func: Callable[..., Any], *args: Any, thread_sensitive: bool, **kwargs: Any
+) -> Any:
+    """Run a sync tenant method through a single ``sync_to_async`` boundary.
+
+    The schema switch, the transaction and every query of ``func`` happen on
+    one connection. With ``thread_sensitive=False`` that is the connection of
+    an executor thread, which is closed afterwards according to
+    ``CONN_MAX_AGE`` since no request cycle does it for that thread.
+    """
+
+    def run() -> Any:
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if not thread_sensitive:
+                close_old_connections()
+
+    return await sync_to_async(run, thread_sensitive=thread_sensitive)()
+
+
+def _clear_tenant_cache(user_obj, schema_name: str) -> None:
+    """Drop the tenant specific cached attributes of a user for one schema."""
+    if TENANT_CACHE_NAME in user_obj.__dict__:
+        user_obj.__dict__[TENANT_CACHE_NAME].pop(schema_name, None)
+
+
+def _get_tenants_through(user_model) -> tuple[Any, str, str]:
+    """Return the user/tenant M2M through model and its two field names.
+
+    Args:
+        user_model: The user model owning the ``tenants`` relation.
+
+    Returns:
+        tuple: A tuple containing the through model, the name of its field
+        pointing to the user and the name of its field pointing to the tenant.
+    """
+    tenants_field = user_model._meta.get_field("tenants")
+    return (
+        tenants_field.remote_field.through,
+        tenants_field.m2m_field_name(),
+        tenants_field.m2m_reverse_field_name(),
+    )
+
+
 class TenantBase(TenantMixin):
     """Contains global data and settings for the tenant model."""
 
@@ -109,16 +182,27 @@ class TenantBase(TenantMixin):
     def delete(self, *args, force_drop: bool = False, **kwargs) -> None:
         """Override deleting of Tenant object.
 
+        With ``TENANT_USERS_DEFER_SCHEMA_DROP``, the schema is not dropped here
+        but renamed and queued for :func:`~tenant_users.tenants.schema_drops.drop_queued_schemas`.
+
         Args:
             force_drop (bool): If True, forces the deletion of the object. Defaults to False.
             *args: Variable length argument list.
             **kwargs: Arbitrary keyword arguments.
         """
-        if force_drop:
-            super().delete(force_drop, *args, **kwargs)
-        else:
+        if not force_drop:
             raise DeleteError(TENANT_DELETE_ERROR_MESSAGE)
 
+        if getattr(settings, "TENANT_USERS_DEFER_SCHEMA_DROP", False):
+            from tenant_users.tenants.schema_drops import queue_schema_drop  # noqa: PLC0415
+
+            with transaction.atomic():
+                queue_schema_drop(self)
+                # The schema was renamed, so only the row is deleted here
+                super().delete(force_drop, *args, **kwargs)
+        else:
+            super().delete(force_drop, *args, **kwargs)
+
     @schema_required
     @transaction.atomic
     def add_user(
@@ -139,13 +223,16 @@ class TenantBase(TenantMixin):
 
         # User not linked to this tenant, so we need to create
         # tenant permissions
-        UserTenantPermissions.objects.create(
+        build_tenant_perms(
+            self,
             profile=user_obj,
             is_staff=is_staff,
             is_superuser=is_superuser,
-        )
+        ).save()
         # Link user to tenant
         user_obj.tenants.add(self)
+        # Drop a cached "no permissions" result for this tenant
+        _clear_tenant_cache(user_obj, self.schema_name)
 
         tenant_user_added.send(
             sender=self.__class__,
@@ -153,6 +240,96 @@ class TenantBase(TenantMixin):
             tenant=self,
         )
 
+    @schema_required
+    @transaction.atomic
+    def add_users(
+        self,
+        users,
+        *,
+        is_superuser: bool = False,
+        is_staff: bool = False,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> tuple[list[Any], list[Any]]:
+        """Add many users to tenant using a fixed number of queries.
+
+        Bulk counterpart of :meth:`add_user`. The tenant schema is entered once,
+        existing members are found with a single query and the tenant
+        permissions and membership rows are inserted in batches. Users that
+        already belong to the tenant are skipped instead of raising
+        ``ExistsError``.
+
+        Args:
+            users: An iterable of user objects to be added to the tenant.
+            is_superuser (bool): If True, assigns superuser privileges to the users. Defaults to False.
+            is_staff (bool): If True, assigns staff status to the users. Defaults to False.
+            batch_size (int): Maximum number of rows written per INSERT statement.
+
+        Returns:
+            tuple: A tuple containing:
+                - list: The users that were added to the tenant.
+                - list: The users that were skipped because they are already linked.
+        """
+        added: list[Any] = []
+        skipped: list[Any] = []
+
+        users = list(users)
+        if not users:
+            return added, skipped
+
+        through, user_field, tenant_field = _get_tenants_through(type(users[0]))
+        # Single query to find which of the given users are already linked here
+        existing = set(
+            through.objects.filter(
+                **{
+                    tenant_field: self.pk,
+                    f"{user_field}__in": {user_obj.pk for user_obj in users},
+                }
+            ).values_list(f"{user_field}_id", flat=True)
+        )
+
+        for user_obj in users:
+            if user_obj.pk in existing:
+                skipped.append(user_obj)
+            else:
+                # Also guards against the same user being passed twice
+                existing.add(user_obj.pk)
+                added.append(user_obj)
+
+        perms_list = get_tenant_perms_model().objects.bulk_create(
+            [
+                build_tenant_perms(
+                    self,
+                    profile=user_obj,
+                    is_staff=is_staff,
+                    is_superuser=is_superuser,
+                )
+                for user_obj in added
+            ],
+            batch_size=batch_size,
+        )
+        from tenant_users.tenants import roles  # noqa: PLC0415
+
+        if roles.role_index_enabled():
+            # bulk_create() skips the receivers maintaining the role index
+            roles.index_tenant_perms(perms_list, tenant_id=self.pk, new=True)
+        through.objects.bulk_create(
+            [
+                through(**{user_field: user_obj, tenant_field: self})
+                for user_obj in added
+            ],
+            batch_size=batch_size,
+        )
+
+        for user_obj in added:
+            _clear_tenant_cache(user_obj, self.schema_name)
+            tenant_user_added.send(
+                sender=self.__class__,
+                user=user_obj,
+                tenant=self,
+            )
+
+        return added, skipped
+
     @schema_required
     @transaction.atomic
     def remove_user(self, user_obj) -> None:
@@ -167,19 +344,17 @@ class TenantBase(TenantMixin):
                 f"Cannot remove owner from tenant: {self.owner}",
             )
 
-        user_tenant_perms = UserTenantPermissions.objects.get(profile=user_obj)
+        tenant_perms = get_tenant_perms_queryset(self.schema_name)
+        user_tenant_perms = tenant_perms.get(profile=user_obj)
         # Remove all current groups from user..
         groups = user_tenant_perms.groups
         groups.clear()
 
         # Unlink from tenant
-        UserTenantPermissions.objects.filter(pk=user_tenant_perms.pk).delete()
+        tenant_perms.filter(pk=user_tenant_perms.pk).delete()
         user_obj.tenants.remove(self)
         # Remove tenant specific cached attributes
-        if TENANT_CACHE_NAME in user_obj.__dict__:
-            cache = user_obj.__dict__[TENANT_CACHE_NAME]
-            if self.schema_name in cache:
-                del cache[self.schema_name]
+        _clear_tenant_cache(user_obj, self.schema_name)
 
         tenant_user_removed.send(
             sender=self.__class__,
@@ -187,48 +362,152 @@ class TenantBase(TenantMixin):
             tenant=self,
         )
 
+    @schema_required
     @transaction.atomic
-    def delete_tenant(self) -> None:
+    def remove_users(self, users) -> list[Any]:
+        """Remove many users from tenant using set-based deletes.
+
+        Bulk counterpart of :meth:`remove_user`. Membership is resolved with a
+        single query and the group links, tenant permissions and tenant links
+        of all users are deleted with one statement per table. The tenant
+        owner and users that are not members of the tenant are skipped.
+
+        Args:
+            users: An iterable of user objects or a queryset of users.
+
+        Returns:
+            list: The users that were removed from the tenant.
+        """
+        if isinstance(users, models.QuerySet):
+            user_model = users.model
+            passed_users = {}
+            user_pks: Any = users.values("pk")
+        else:
+            users = list(users)
+            if not users:
+                return []
+            user_model = type(users[0])
+            passed_users = {user_obj.pk: user_obj for user_obj in users}
+            user_pks = list(passed_users)
+
+        # Dont allow removing an owner from a tenant. This must be done
+        # Through delete tenant or transfer_ownership
+        members = user_model.objects.filter(
+            pk__in=user_pks,
+            tenants=self,
+        ).exclude(pk=self.owner_id)
+        # Prefer the instances we were given so their caches get cleared
+        removed = [passed_users.get(member.pk, member) for member in members]
+        if not removed:
+            return removed
+
+        removed_pks = [user_obj.pk for user_obj in removed]
+
+        # Cascades to the groups and user permissions links of each row
+        get_tenant_perms_queryset(self.schema_name).filter(
+            profile_id__in=removed_pks
+        ).delete()
+
+        # Unlink from tenant
+        through, user_field, tenant_field = _get_tenants_through(user_model)
+        through.objects.filter(
+            **{tenant_field: self.pk, f"{user_field}__in": removed_pks}
+        ).delete()
+
+        for user_obj in removed:
+            # Remove tenant specific cached attributes
+            _clear_tenant_cache(user_obj, self.schema_name)
+            tenant_user_removed.send(
+                sender=self.__class__,
+                user=user_obj,
+                tenant=self,
+            )
+
+        return removed
+
+    def delete_tenant(
+        self,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> None:
         """Mark tenant for deletion.
 
         We don't actually delete the tenant out of the database, but we
         associate them with a the public schema user and change their url
         to reflect their delete datetime and previous owner
         The caller should verify that the user deleting the tenant owns
-        the tenant.
+        the tenant. The deletion is recorded in a :class:`TenantTombstone`,
+        from which ``purge_deleted_tenants`` removes the tenant for good
+        once it is old enough.
+
+        Members other than the owner are removed in chunks through
+        :meth:`remove_users`, each chunk in its own transaction, so memory use
+        is bounded and no single transaction spans the whole membership. If
+        the call is interrupted, calling it again carries on with the members
+        that are left. Deleting a tenant that is already deleted keeps its
+        tombstone and its renamed url as they are.
+
+        Args:
+            batch_size (int): Number of members removed per chunk.
+            progress (Callable, optional): Called after each chunk with the
+                number of members removed so far and the total to remove.
         """
         # Prevent public tenant schema from being deleted
         if self.schema_name == get_public_schema_name():
             raise ValueError("Cannot delete public tenant schema")
 
-        for user_obj in self.user_set.all():
-            # Don't delete owner at this point
-            if user_obj.pk == self.owner.pk:
-                continue
-            self.remove_user(user_obj)
-
-        # Seconds since epoch, time() returns a float, so we convert to
-        # an int first to truncate the decimal portion
-        time_string = str(int(time.time()))
-        new_url = f"{time_string}-{self.owner.pk!s}-{self.domain_url}"  # type: ignore[has-type]
-        self.domain_url = new_url
-        # The schema generated each time (even with same url slug) will
-        # be unique so we do not have to worry about a conflict with that
-
-        # Set the owner to the system user (public schema owner)
-        public_tenant = get_tenant_model().objects.get(
-            schema_name=get_public_schema_name(),
-        )
-
-        old_owner = self.owner
+        # Every member removal below runs in this tenant, switch to it once
+        with pinned_tenant(self):
+            self._delete_tenant(batch_size, progress)
 
-        # Transfer ownership to system
-        self.transfer_ownership(public_tenant.owner)
+    def _delete_tenant(
+        self, batch_size: int, progress: Callable[[int, int], None] | None
+    ) -> None:
+        # Don't delete owner at this point
+        members = self.user_set.exclude(pk=self.owner_id).order_by("pk")
+        total = members.count()
+        removed = 0
+        # Keyset pagination keeps each chunk query cheap on large tenants
+        while chunk := list(members[:batch_size]):
+            removed += len(self.remove_users(chunk))
+            members = members.filter(pk__gt=chunk[-1].pk)
+            if progress is not None:
+                progress(removed, total)
+
+        with transaction.atomic():
+            # Set the owner to the system user (public schema owner)
+            public_tenant = get_tenant_model().objects.get(
+                schema_name=get_public_schema_name(),
+            )
 
-        # Remove old owner as a user if the owner still exists after
-        # the transfer
-        if self.user_set.filter(pk=user_obj.pk).exists():
-            self.remove_user(old_owner)
+            old_owner = None
+            # A tenant deleted before is already owned by the system user,
+            # only its tombstone is left to record
+            if self.owner_id != public_tenant.owner_id:
+                # Seconds since epoch, time() returns a float, so we convert to
+                # an int first to truncate the decimal portion
+                time_string = str(int(time.time()))
+                new_url = f"{time_string}-{self.owner.pk!s}-{self.domain_url}"  # type: ignore[has-type]
+                self.domain_url = new_url
+                # The schema generated each time (even with same url slug) will
+                # be unique so we do not have to worry about a conflict with that
+
+                old_owner = self.owner
+
+                # Transfer ownership to system
+                self.transfer_ownership(public_tenant.owner)
+
+                # Remove old owner as a user if the owner still exists after
+                # the transfer
+                if self.user_set.filter(pk=old_owner.pk).exists():
+                    self.remove_user(old_owner)
+
+            # A repeated call keeps the tombstone of the original deletion
+            TenantTombstone.objects.get_or_create(
+                schema_name=self.schema_name,
+                defaults={"slug": self.slug, "previous_owner": old_owner},
+            )
 
     @schema_required
     @transaction.atomic
@@ -250,7 +529,9 @@ class TenantBase(TenantMixin):
         try:
             # Set new user as superuser in this tenant if user already exists
             user = self.user_set.get(pk=new_owner.pk)
-            user_tenant = user.usertenantpermissions
+            user_tenant = get_tenant_perms_queryset(self.schema_name).get(
+                profile_id=user.pk
+            )
             user_tenant.is_superuser = True
             user_tenant.save(update_fields=["is_superuser"])
         except get_user_model().DoesNotExist:
@@ -259,10 +540,122 @@ class TenantBase(TenantMixin):
 
         self.save(update_fields=["owner"])
 
+    async def aadd_user(
+        self,
+        user_obj,
+        *,
+        is_superuser: bool = False,
+        is_staff: bool = False,
+        thread_sensitive: bool = False,
+    ) -> None:
+        """Async version of :meth:`add_user`.
+
+        The schema switch and transaction run on one connection in a worker
+        thread, so the event loop stays free and calls for different tenants
+        can run concurrently.
+
+        Args:
+            user_obj: The user object to be added to the tenant.
+            is_superuser (bool): If True, assigns superuser privileges to the user. Defaults to False.
+            is_staff (bool): If True, assigns staff status to the user. Defaults to False.
+            thread_sensitive (bool): If True, run in the thread shared by all
+                thread sensitive sync code, on its connection, instead of an
+                executor thread with its own. Defaults to False.
+        """
+        await _arun_sync(
+            self.add_user,
+            user_obj,
+            is_superuser=is_superuser,
+            is_staff=is_staff,
+            thread_sensitive=thread_sensitive,
+        )
+
+    async def aremove_user(self, user_obj, *, thread_sensitive: bool = False) -> None:
+        """Async version of :meth:`remove_user`.
+
+        Args:
+            user_obj: The user object to be removed from the tenant.
+            thread_sensitive (bool): See :meth:`aadd_user`. Defaults to False.
+        """
+        await _arun_sync(self.remove_user, user_obj, thread_sensitive=thread_sensitive)
+
+    async def atransfer_ownership(
+        self, new_owner, *, thread_sensitive: bool = False
+    ) -> None:
+        """Async version of :meth:`transfer_ownership`.
+
+        Args:
+            new_owner: The user object to become the new owner of the tenant.
+            thread_sensitive (bool): See :meth:`aadd_user`. Defaults to False.
+        """
+        await _arun_sync(
+            self.transfer_ownership, new_owner, thread_sensitive=thread_sensitive
+        )
+
     class Meta:
         abstract = True
 
 
+class UserCreateResult(NamedTuple):
+    """Outcome of a single row passed to UserProfileManager.bulk_create_users()."""
+
+    email: str | None
+    user: Any = None
+    reactivated: bool = False
+    error: Exception | None = None
+
+
+def _hash_passwords(
+    passwords: list[str | None], max_workers: int | None = None
+) -> list[str]:
+    """Hash raw passwords, optionally spreading the work across a process pool.
+
+    Salts are generated here and the configured default hasher is pickled to
+    the workers, so the hashes match what ``make_password()`` would produce.
+    Missing passwords become unusable passwords, as with ``set_password()``.
+    Workers are started with the ``spawn`` method, so they inherit no database
+    connection or thread of the calling process.
+
+    Args:
+        passwords (list): Raw passwords, None for an unusable password.
+        max_workers (int, optional): Number of worker processes. None or 1
+            hashes in the current process.
+
+    Returns:
+        list: The encoded passwords, in the same order.
+    """
+    hashed: list[str | None] = [
+        make_password(None) if password is None else None for password in passwords
+    ]
+    to_hash = [
+        (idx, password)
+        for idx, password in enumerate(passwords)
+        if password is not None
+    ]
+    if not to_hash:
+        return hashed  # type: ignore[return-value]
+
+    hasher = get_hasher()
+    indexes, raw_passwords = zip(*to_hash)
+    salts = [hasher.salt() for _ in raw_passwords]
+
+    if max_workers is None or max_workers == 1 or len(raw_passwords) == 1:
+        encoded = list(map(hasher.encode, raw_passwords, salts))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as executor:
+            encoded = list(
+                executor.map(hasher.encode, raw_passwords, salts, chunksize=64)
+            )
+
+    for idx, password in zip(indexes, encoded):
+        hashed[idx] = password
+    return hashed  # type: ignore[return-value]
+
+
 class UserProfileManager(BaseUserManager):
     @transaction.atomic
     def _create_user(
@@ -312,19 +705,15 @@ class UserProfileManager(BaseUserManager):
             setattr(profile, attr, value)
         profile.save()
 
-        # Get public tenant tenant and link the user (no perms)
-        public_tenant = get_tenant_model().objects.get(
-            schema_name=get_public_schema_name(),
-        )
-        public_tenant.add_user(profile)
-
-        # Public tenant permissions object was created when we assigned a
-        # role to the user above, if we are a staff/superuser we set it here
-        if is_staff or is_superuser:
-            user_tenant = profile.usertenantpermissions
-            user_tenant.is_staff = is_staff
-            user_tenant.is_superuser = is_superuser
-            user_tenant.save()
+        # Get public tenant tenant and link the user. Implicit public members
+        # only get a row when they need more than the default permissions
+        if is_staff or is_superuser or not public_membership_is_implicit():
+            public_tenant = get_tenant_model().objects.get(
+                schema_name=get_public_schema_name(),
+            )
+            public_tenant.add_user(
+                profile, is_staff=is_staff, is_superuser=is_superuser
+            )
 
         tenant_user_created.send(sender=self.__class__, user=profile)
 
@@ -363,32 +752,220 @@ class UserProfileManager(BaseUserManager):
             **extra_fields,
         )
 
-    @transaction.atomic
-    def delete_user(self, user_obj) -> None:
+    @staticmethod
+    def _add_to_public_tenant(
+        roles: dict[tuple[bool, bool], list[Any]], batch_size: int
+    ) -> None:
+        """Link profiles, grouped by (is_staff, is_superuser), to the public tenant."""
+        if public_membership_is_implicit():
+            # Implicit public members only need a row for non-default roles
+            roles.pop((False, False), None)
+        if not roles:
+            return
+
+        public_tenant = get_tenant_model().objects.get(
+            schema_name=get_public_schema_name(),
+        )
+        for (is_staff, is_superuser), role_profiles in roles.items():
+            public_tenant.add_users(
+                role_profiles,
+                is_staff=is_staff,
+                is_superuser=is_superuser,
+                batch_size=batch_size,
+            )
+
+    def _parse_bulk_rows(
+        self, rows: Iterable[dict[str, Any]]
+    ) -> tuple[list[UserCreateResult | None], dict[str, tuple[int, dict[str, Any]]]]:
+        """Validate bulk rows, keyed by normalized email.
+
+        Returns:
+            tuple: A tuple containing:
+                - list: Results so far, None for rows still to be created.
+                - dict: Normalized email mapped to the row's result index and
+                  remaining fields.
+        """
+        results: list[UserCreateResult | None] = []
+        pending: dict[str, tuple[int, dict[str, Any]]] = {}
+        for row in rows:
+            extra_fields = dict(row)
+            email = extra_fields.pop("email", None)
+            if not email:
+                error: Exception = ValueError("Users must have an email address.")
+                results.append(UserCreateResult(email, error=error))
+                continue
+
+            email = self.normalize_email(email)
+            if email in pending:
+                error = ExistsError("User already exists!")
+                results.append(UserCreateResult(email, error=error))
+                continue
+
+            pending[email] = (len(results), extra_fields)
+            results.append(None)
+
+        return results, pending
+
+    def bulk_create_users(
+        self,
+        rows: Iterable[dict[str, Any]],
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_workers: int | None = None,
+    ) -> list[UserCreateResult]:
+        """Create many users at once, linking them to the public tenant.
+
+        Bulk counterpart of :meth:`create_user`. Passwords are hashed first,
+        across a process pool if ``max_workers`` is given, then in one
+        transaction inactive profiles are reactivated with one bulk update,
+        new profiles are bulk inserted and all of them are linked to the public
+        tenant with :meth:`TenantBase.add_users`, except users with default
+        permissions when public membership is implicit. Rows that cannot be created
+        are reported in the results instead of raising.
+
+        Like ``bulk_create()``, this bypasses the user model's ``save()``.
+
+        Args:
+            rows: Dictionaries holding an ``email`` and optionally ``password``,
+                ``is_staff``, ``is_superuser``, ``is_verified`` and extra fields.
+            batch_size (int): Maximum number of rows written per statement.
+            max_workers (int, optional): Number of processes used to hash
+                passwords. Defaults to hashing in the current process.
+
+        Returns:
+            list: One :class:`UserCreateResult` per row, in the input order.
+        """
+        if connection.schema_name != get_public_schema_name():  # type: ignore[attr-defined]
+            raise SchemaError(
+                "Schema must be public for UserProfileManager user creation",
+            )
+
+        results, pending = self._parse_bulk_rows(rows)
+        # Hashing is slow, so it is done before the transaction is opened
+        raw_passwords = [
+            extra_fields.pop("password", None)
+            for _idx, extra_fields in pending.values()
+        ]
+        passwords = dict(zip(pending, _hash_passwords(raw_passwords, max_workers)))
+        with transaction.atomic():
+            self._bulk_save_users(results, pending, passwords, batch_size)
+        return results  # type: ignore[return-value]
+
+    def _bulk_save_users(
+        self,
+        results: list[UserCreateResult | None],
+        pending: dict[str, tuple[int, dict[str, Any]]],
+        passwords: dict[str, str],
+        batch_size: int,
+    ) -> None:
+        """Write the profiles of bulk_create_users() and fill in their results."""
+        UserModel = get_user_model()
+        existing = UserModel.objects.in_bulk(list(pending), field_name="email")
+
+        # (result index, profile, role flags, reactivated)
+        profiles: list[tuple[int, Any, tuple[bool, bool], bool]] = []
+        update_fields = {"email", "is_active", "is_verified", "password"}
+        for email, (idx, extra_fields) in pending.items():
+            profile = existing.get(email)
+            if profile and profile.is_active:
+                error = ExistsError("User already exists!")
+                results[idx] = UserCreateResult(email, error=error)
+                continue
+
+            role = (
+                extra_fields.pop("is_staff", False),
+                extra_fields.pop("is_superuser", False),
+            )
+            # See _create_user() on reusing the profile of a deleted user
+            if profile:
+                update_fields.update(extra_fields)
+            profile = profile or UserModel()
+            profile.email = email
+            profile.is_active = True
+            profile.is_verified = extra_fields.pop("is_verified", False)
+            profile.password = passwords[email]
+            for attr, value in extra_fields.items():
+                setattr(profile, attr, value)
+            profiles.append((idx, profile, role, profile.pk is not None))
+
+        UserModel.objects.bulk_update(
+            [profile for _idx, profile, _role, reactivated in profiles if reactivated],
+            sorted(update_fields),
+            batch_size=batch_size,
+        )
+        UserModel.objects.bulk_create(
+            [
+                profile
+                for _idx, profile, _role, reactivated in profiles
+                if not reactivated
+            ],
+            batch_size=batch_size,
+        )
+
+        roles: dict[tuple[bool, bool], list[Any]] = {}
+        for _idx, profile, role, _reactivated in profiles:
+            roles.setdefault(role, []).append(profile)
+        self._add_to_public_tenant(roles, batch_size)
+
+        for idx, profile, _role, reactivated in profiles:
+            results[idx] = UserCreateResult(
+                profile.email, user=profile, reactivated=reactivated
+            )
+            tenant_user_created.send(sender=self.__class__, user=profile)
+
+    def delete_user(
+        self, user_obj, *, chunk_size: int = DEFAULT_TENANT_CHUNK_SIZE
+    ) -> None:
+        """Deactivate a user and remove them from every tenant.
+
+        Tenants owned by the user are deleted through
+        :meth:`TenantBase.delete_tenant` and the user is removed from all other
+        tenants. The user's tenants are loaded and split on ``owner_id`` a
+        chunk at a time, so each tenant schema is visited once.
+
+        Each chunk of tenants is committed on its own and progress is recorded
+        in a :class:`UserDeletionCheckpoint`. If the deletion is interrupted,
+        calling this method again resumes with the tenants that are left.
+
+        Args:
+            user_obj: The user to delete.
+            chunk_size (int): Number of tenants processed per transaction.
+        """
         # Check to make sure we don't try to delete the public tenant owner
         # that would be bad....
         public_tenant = get_tenant_model().objects.get(
             schema_name=get_public_schema_name(),
         )
-        if user_obj.pk == public_tenant.owner.pk:
+        if user_obj.pk == public_tenant.owner_id:
             raise DeleteError("Cannot delete the public tenant owner!")
 
+        checkpoint, _ = UserDeletionCheckpoint.objects.get_or_create(profile=user_obj)
+
         # This includes the linked public tenant 'tenant'. It will delete the
         # Tenant permissions and unlink when user is deleted
-        for tenant in user_obj.tenants.all():
-            # If user owns the tenant, we call delete on the tenant
-            # which will delete the user from the tenant as well
-            if tenant.owner.pk == user_obj.pk:
-                # Delete tenant will handle any other linked users to
-                # that tenant
-                tenant.delete_tenant()
-            else:
-                # Unlink user from all roles in any tenant it doesn't own
-                tenant.remove_user(user_obj)
-
-        # Set is_active, don't actually delete the object
-        user_obj.is_active = False
-        user_obj.save(update_fields=["is_active"])
+        tenants = user_obj.tenants.order_by("pk")
+        while chunk := list(tenants[:chunk_size]):
+            with transaction.atomic():
+                for tenant in chunk:
+                    # If user owns the tenant, we call delete on the tenant
+                    # which will delete the user from the tenant as well
+                    if tenant.owner_id == user_obj.pk:
+                        # Delete tenant will handle any other linked users to
+                        # that tenant
+                        tenant.delete_tenant()
+                    else:
+                        # Unlink user from all roles in any tenant it doesn't own
+                        tenant.remove_user(user_obj)
+
+                checkpoint.tenants_processed += len(chunk)
+                checkpoint.save(update_fields=["tenants_processed", "modified_at"])
+            tenants = tenants.filter(pk__gt=chunk[-1].pk)
+
+        with transaction.atomic():
+            # Set is_active, don't actually delete the object
+            user_obj.is_active = False
+            user_obj.save(update_fields=["is_active"])
+            checkpoint.delete()
 
         tenant_user_deleted.send(sender=self.__class__, user=user_obj)
 
@@ -458,3 +1035,265 @@ class UserProfile(AbstractBaseUser, PermissionsMixinFacade):
     def get_full_name(self) -> str:
         """Return string representation."""
         return str(self)
+
+
+class UserDeletionCheckpoint(models.Model):
+    """Progress of a :meth:`UserProfileManager.delete_user` call.
+
+    A row is created when the deletion of a user starts and removed once the
+    user has been deactivated. A remaining row therefore marks a deletion that
+    was interrupted and can be resumed by calling ``delete_user()`` again.
+    """
+
+    profile = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    tenants_processed = models.PositiveIntegerField(
+        _("tenants processed"),
+        default=0,
+        help_text=_("Number of tenants the user has been removed from so far."),
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.profile_id}: {self.tenants_processed} tenants processed"
+
+
+class PooledSchema(models.Model):
+    """An empty, fully migrated schema waiting to be claimed by a new tenant.
+
+    Rows are created by :func:`tenant_users.tenants.pool.fill_schema_pool` and
+    deleted when ``provision_tenant()`` renames the schema for a new tenant.
+    """
+
+    schema_name = models.CharField(max_length=63, unique=True)
+    tenant_type = models.CharField(
+        max_length=100,
+        blank=True,
+        default="",
+        help_text=_("Tenant type the schema was migrated for, if any."),
+    )
+    fingerprint = models.CharField(
+        max_length=64,
+        help_text=_("Fingerprint of the migrations applied to the schema."),
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return self.schema_name
+
+
+class TenantProvisioning(models.Model):
+    """Progress of a tenant created by :func:`~tenant_users.tenants.tasks.start_provisioning`.
+
+    Provisioning runs as a sequence of stages, each committed together with
+    the row's ``stage``, which names the next stage to run. A row that is not
+    done marks a provisioning that failed or was interrupted; resuming it
+    continues from that stage instead of starting over.
+    """
+
+    class Stage(models.TextChoices):
+        RESERVE_DOMAIN = "reserve_domain", _("Reserve domain")
+        CREATE_SCHEMA = "create_schema", _("Create schema")
+        MIGRATE = "migrate", _("Migrate")
+        LINK_OWNER = "link_owner", _("Link owner")
+        FINALIZE = "finalize", _("Finalize")
+        DONE = "done", _("Done")
+
+    name = models.CharField(max_length=255)
+    slug = models.CharField(max_length=255)
+    domain = models.CharField(max_length=253)
+    schema_name = models.CharField(max_length=63, unique=True)
+    tenant_type = models.CharField(max_length=100, blank=True, default="")
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    is_staff = models.BooleanField(default=False)
+    is_superuser = models.BooleanField(default=True)
+    tenant_extra_data = models.JSONField(default=dict, blank=True)
+    domain_extra_data = models.JSONField(default=dict, blank=True)
+    lazy_schema = models.BooleanField(
+        default=False,
+        help_text=_("The schema is created on the first request to the tenant."),
+    )
+    stage = models.CharField(
+        max_length=20,
+        choices=Stage.choices,
+        default=Stage.RESERVE_DOMAIN,
+        help_text=_("Next stage to run."),
+    )
+    stage_timings = models.JSONField(
+        default=dict,
+        blank=True,
+        help_text=_("Seconds each completed stage took."),
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(
+        blank=True,
+        default="",
+        help_text=_("Error raised by the last failed stage."),
+    )
+    started_at = models.DateTimeField(auto_now_add=True)
+    modified_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.schema_name}: {self.stage}"
+
+    @property
+    def is_done(self) -> bool:
+        return self.stage == self.Stage.DONE
+
+
+class QueuedSchemaDrop(models.Model):
+    """The schema of a deleted tenant, waiting to be dropped.
+
+    Rows are created when a tenant is deleted with
+    ``TENANT_USERS_DEFER_SCHEMA_DROP`` and removed once
+    :func:`tenant_users.tenants.schema_drops.drop_queued_schemas` has dropped
+    the schema.
+    """
+
+    schema_name = models.CharField(
+        max_length=63,
+        unique=True,
+        help_text=_("Name the schema was renamed to when it was queued."),
+    )
+    original_schema_name = models.CharField(max_length=63)
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.schema_name} ({self.original_schema_name})"
+
+
+class TenantTombstone(models.Model):
+    """A tenant deleted with :meth:`TenantBase.delete_tenant`.
+
+    ``delete_tenant()`` keeps the tenant row and its schema, so it can still
+    be inspected or restored, and records when it was deleted here.
+    :func:`tenant_users.tenants.tombstones.purge_tombstoned_tenants` later
+    drops the schema and the tenant row. The tombstone is then removed too,
+    or kept with ``purged_at`` set as a compact archive of the tenant.
+    """
+
+    schema_name = models.CharField(max_length=63, unique=True)
+    slug = models.CharField(max_length=255, blank=True, default="")
+    previous_owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="+",
+    )
+    domains = models.JSONField(
+        default=list,
+        blank=True,
+        help_text=_("Domains of the tenant, recorded when it is purged."),
+    )
+    deleted_at = models.DateTimeField(default=timezone.now, db_index=True)
+    purged_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text=_("When the schema and tenant row were removed."),
+    )
+
+    def __str__(self) -> str:
+        return f"{self.schema_name} (deleted {self.deleted_at:%Y-%m-%d})"
+
+
+class SharedUserTenantPermissions(AbstractUserTenantPermissions):
+    """Tenant permissions stored in the public schema, keyed by tenant.
+
+    Used instead of :class:`~tenant_users.permissions.models.UserTenantPermissions`
+    when ``TENANT_USERS_PERMISSIONS_STORAGE`` is ``"shared"``. All tenants'
+    permissions live in this one table, so questions spanning tenants are
+    answered by a single query, and tenant schemas need no permission
+    tables. Groups and permissions are the ones of the public schema, shared
+    by all tenants, and groups must be added from the public schema.
+    """
+
+    tenant = models.ForeignKey(
+        settings.TENANT_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        # Covered by the unique constraint, which starts with the tenant
+        db_index=False,
+    )
+    profile = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="shared_tenant_perms",
+    )
+    groups = models.ManyToManyField(
+        Group,
+        verbose_name=_("groups"),
+        blank=True,
+        help_text=_("The groups this user belongs to in the tenant."),
+        related_name="shared_tenant_perms",
+        related_query_name="shared_tenant_perms",
+    )
+    user_permissions = models.ManyToManyField(
+        Permission,
+        verbose_name=_("user permissions"),
+        blank=True,
+        help_text=_("Specific permissions for this user in the tenant."),
+        related_name="shared_tenant_perms",
+        related_query_name="shared_tenant_perms",
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["tenant", "profile"],
+                name="tenant_users_shared_perms_tenant_profile",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.profile} ({self.tenant_id})"
+
+
+class TenantRoleIndex(models.Model):
+    """A user's role in a tenant, mirrored in the public schema.
+
+    Maintained when ``TENANT_USERS_ROLE_INDEX`` is enabled, with one row per
+    tenant permissions row, so questions such as which tenants a user
+    administers are answered by one indexed query instead of reading the
+    permissions in every tenant. See :mod:`tenant_users.tenants.roles`.
+    """
+
+    tenant = models.ForeignKey(
+        settings.TENANT_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    profile = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="+",
+        # Covered by the unique constraint, which starts with the profile
+        db_index=False,
+    )
+    is_staff = models.BooleanField(default=False)
+    is_superuser = models.BooleanField(default=False)
+    groups_hash = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text=_("Hash of the user's groups in the tenant, empty for none."),
+    )
+
+    class Meta:
+        constraints = (
+            models.UniqueConstraint(
+                fields=["profile", "tenant"],
+                name="tenant_users_role_index_profile_tenant",
+            ),
+        )
+
+    def __str__(self) -> str:
+        return f"{self.profile_id} ({self.tenant_id})"
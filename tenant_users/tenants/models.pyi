@@ -1,12 +1,16 @@
+from collections.abc import Iterable
 from datetime import datetime
-from typing import Any, Callable, ClassVar, TypeVar
+from typing import Any, Callable, ClassVar, NamedTuple, TypeVar
 
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager
 from django.db import models
 from django.dispatch import Signal
 from django_tenants.models import TenantMixin
 
-from tenant_users.permissions.models import PermissionsMixinFacade
+from tenant_users.permissions.models import (
+    AbstractUserTenantPermissions,
+    PermissionsMixinFacade,
+)
 
 # TypeVars
 _UserProfileT = TypeVar("_UserProfileT", bound=AbstractBaseUser)
@@ -16,6 +20,8 @@ tenant_user_removed: Signal
 tenant_user_added: Signal
 tenant_user_created: Signal
 tenant_user_deleted: Signal
+schema_pool_claimed: Signal
+tenant_provisioning_stage_completed: Signal
 
 class InactiveError(Exception): ...
 class ExistsError(Exception): ...
@@ -41,9 +47,43 @@ class TenantBase(TenantMixin):
         is_superuser: bool = False,
         is_staff: bool = False,
     ) -> None: ...
+    def add_users(
+        self,
+        users: Iterable[Any],
+        *,
+        is_superuser: bool = False,
+        is_staff: bool = False,
+        batch_size: int = ...,
+    ) -> tuple[list[Any], list[Any]]: ...
     def remove_user(self, user_obj: Any) -> None: ...
-    def delete_tenant(self) -> None: ...
+    def remove_users(self, users: Iterable[Any]) -> list[Any]: ...
+    def delete_tenant(
+        self,
+        *,
+        batch_size: int = ...,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> None: ...
     def transfer_ownership(self, new_owner: Any) -> None: ...
+    async def aadd_user(
+        self,
+        user_obj: Any,
+        *,
+        is_superuser: bool = False,
+        is_staff: bool = False,
+        thread_sensitive: bool = False,
+    ) -> None: ...
+    async def aremove_user(
+        self, user_obj: Any, *, thread_sensitive: bool = False
+    ) -> None: ...
+    async def atransfer_ownership(
+        self, new_owner: Any, *, thread_sensitive: bool = False
+    ) -> None: ...
+
+class UserCreateResult(NamedTuple):
+    email: str | None
+    user: Any = ...
+    reactivated: bool = ...
+    error: Exception | None = ...
 
 class UserProfileManager(BaseUserManager[_UserProfileT]):
     def _create_user(
@@ -70,7 +110,16 @@ class UserProfileManager(BaseUserManager[_UserProfileT]):
         email: str,
         **extra_fields: Any,
     ) -> _UserProfileT: ...
-    def delete_user(self, user_obj: _UserProfileT) -> None: ...
+    def bulk_create_users(
+        self,
+        rows: Iterable[dict[str, Any]],
+        *,
+        batch_size: int = ...,
+        max_workers: int | None = None,
+    ) -> list[UserCreateResult]: ...
+    def delete_user(
+        self, user_obj: _UserProfileT, *, chunk_size: int = ...
+    ) -> None: ...
 
 class UserProfile(AbstractBaseUser, PermissionsMixinFacade):
     USERNAME_FIELD: str
@@ -91,3 +140,76 @@ class UserProfile(AbstractBaseUser, PermissionsMixinFacade):
     ) -> tuple[int, dict[str, int]]: ...
     def get_short_name(self) -> str: ...
     def get_full_name(self) -> str: ...
+
+class UserDeletionCheckpoint(models.Model):
+    profile: models.OneToOneField[Any, Any]
+    profile_id: Any
+    tenants_processed: models.PositiveIntegerField[int, int]
+    started_at: models.DateTimeField[datetime, datetime]
+    modified_at: models.DateTimeField[datetime, datetime]
+
+class PooledSchema(models.Model):
+    schema_name: models.CharField[str, str]
+    tenant_type: models.CharField[str, str]
+    fingerprint: models.CharField[str, str]
+    created_at: models.DateTimeField[datetime, datetime]
+
+class TenantProvisioning(models.Model):
+    class Stage(models.TextChoices):
+        RESERVE_DOMAIN = ...
+        CREATE_SCHEMA = ...
+        MIGRATE = ...
+        LINK_OWNER = ...
+        FINALIZE = ...
+        DONE = ...
+
+    name: models.CharField[str, str]
+    slug: models.CharField[str, str]
+    domain: models.CharField[str, str]
+    schema_name: models.CharField[str, str]
+    tenant_type: models.CharField[str, str]
+    owner: models.ForeignKey[Any, Any]
+    owner_id: Any
+    is_staff: models.BooleanField[bool, bool]
+    is_superuser: models.BooleanField[bool, bool]
+    tenant_extra_data: models.JSONField[Any, Any]
+    domain_extra_data: models.JSONField[Any, Any]
+    lazy_schema: models.BooleanField[bool, bool]
+    stage: models.CharField[str, str]
+    stage_timings: models.JSONField[Any, Any]
+    attempts: models.PositiveIntegerField[int, int]
+    error: models.TextField[str, str]
+    started_at: models.DateTimeField[datetime, datetime]
+    modified_at: models.DateTimeField[datetime, datetime]
+
+    @property
+    def is_done(self) -> bool: ...
+
+class QueuedSchemaDrop(models.Model):
+    schema_name: models.CharField[str, str]
+    original_schema_name: models.CharField[str, str]
+    queued_at: models.DateTimeField[datetime, datetime]
+
+class TenantTombstone(models.Model):
+    schema_name: models.CharField[str, str]
+    slug: models.CharField[str, str]
+    previous_owner: models.ForeignKey[Any, Any]
+    previous_owner_id: Any
+    domains: models.JSONField[Any, Any]
+    deleted_at: models.DateTimeField[datetime, datetime]
+    purged_at: models.DateTimeField[datetime | None, datetime | None]
+
+class SharedUserTenantPermissions(AbstractUserTenantPermissions):
+    tenant: models.ForeignKey[Any, Any]
+    tenant_id: Any
+    profile: models.ForeignKey[Any, Any]
+    profile_id: Any
+
+class TenantRoleIndex(models.Model):
+    tenant: models.ForeignKey[Any, Any]
+    tenant_id: Any
+    profile: models.ForeignKey[Any, Any]
+    profile_id: Any
+    is_staff: models.BooleanField[bool, bool]
+    is_superuser: models.BooleanField[bool, bool]
+    groups_hash: models.CharField[str, str]
@@ -0,0 +1,300 @@
+"""Pool of empty, fully migrated schemas for ``provision_tenant()``.
+
+Creating a tenant normally runs every tenant migration for its new schema,
+which makes signup latency grow with the migration history. When
+``TENANT_USERS_SCHEMA_POOL_SIZE`` is set, schemas are migrated ahead of time by
+:func:`fill_schema_pool` (or the ``fill_schema_pool`` management command) and
+``provision_tenant()`` claims one by renaming it to the new tenant's schema
+name, which takes milliseconds.
+
+Refill the pool with the ``fill_schema_pool`` management command, for example
+running as a worker with ``--interval``, or from a task queue. After each
+claim, the callable named in ``TENANT_USERS_SCHEMA_POOL_REFILL``, if any, is
+called with the claimed schema's tenant type, for example to enqueue such a
+task. :data:`BACKGROUND_SCHEMA_POOL_REFILL` opts in to refilling from a
+background thread of the process that claimed the schema.
+
+Every pooled schema records a fingerprint of the migrations it was migrated
+with. Schemas migrated before a deploy that added migrations no longer match
+the code and are never claimed; :func:`fill_schema_pool` drops them.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.utils.module_loading import import_string
+from django_tenants.postgresql_backend.base import is_valid_schema_name
+from django_tenants.utils import has_multi_type_tenants
+
+from tenant_users.tenants.models import PooledSchema, SchemaError, schema_pool_claimed
+from tenant_users.tenants.utils import migrate_schema
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+BACKGROUND_SCHEMA_POOL_REFILL = (
+    "tenant_users.tenants.pool.refill_schema_pool_in_background"
+)
+
+POOLED_SCHEMA_PREFIX = "pool_"
+
+# Key of the advisory lock serializing pool fills across processes
+_FILL_LOCK_ID = zlib.crc32(b"tenant_users.schema_pool")
+
+
+class SchemaPoolStats(NamedTuple):
+    """State of the schema pool, as returned by :func:`schema_pool_stats`.
+
+    The claim counters and latencies only cover the current process.
+    """
+
+    depth: int
+    stale: int
+    claims: int
+    misses: int
+    last_claim_seconds: float | None
+    avg_claim_seconds: float | None
+
+
+class _ClaimCounters:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.claims = 0
+        self.misses = 0
+        self.last_seconds: float | None = None
+        self.total_seconds = 0.0
+
+
+_counters = _ClaimCounters()
+
+_refill_lock = threading.Lock()
+
+
+def get_schema_pool_size() -> int:
+    """Returns the number of schemas to keep ready, 0 if the pool is disabled."""
+    return getattr(settings, "TENANT_USERS_SCHEMA_POOL_SIZE", 0)
+
+
+@functools.cache
+def migration_fingerprint() -> str:
+    """Returns a fingerprint of the migrations known to this codebase.
+
+    It changes whenever a migration is added to any app, so schemas migrated
+    by an older deploy can be told apart.
+    """
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    leaves = sorted(f"{app}.{name}" for app, name in loader.graph.leaf_nodes())
+    return hashlib.sha256("\n".join(leaves).encode()).hexdigest()
+
+
+@contextmanager
+def _fill_lock() -> Iterator[bool]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [_FILL_LOCK_ID])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [_FILL_LOCK_ID])
+
+
+def drop_stale_pooled_schemas() -> int:
+    """Drops pooled schemas migrated with other migrations than the current ones.
+
+    Returns:
+        int: The number of schemas dropped.
+    """
+    dropped = 0
+    with transaction.atomic():
+        stale = (
+            PooledSchema.objects.select_for_update(skip_locked=True)
+            .exclude(fingerprint=migration_fingerprint())
+            .order_by("pk")
+        )
+        for pooled in stale:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"DROP SCHEMA IF EXISTS {connection.ops.quote_name(pooled.schema_name)} CASCADE"
+                )
+            pooled.delete()
+            dropped += 1
+    return dropped
+
+
+def fill_schema_pool(
+    size: int | None = None, *, tenant_type: str | None = None, verbosity: int = 0
+) -> int:
+    """Creates and migrates schemas until the pool holds ``size`` of them.
+
+    Stale schemas are dropped first. Only one fill runs at a time across all
+    processes; concurrent calls return immediately.
+
+    Args:
+        size (int, optional): Number of schemas to keep ready. Defaults to
+            ``TENANT_USERS_SCHEMA_POOL_SIZE``.
+        tenant_type (str, optional): Tenant type to migrate the schemas for.
+            Required with ``HAS_MULTI_TYPE_TENANTS``.
+        verbosity (int): Verbosity passed to the migrate command.
+
+    Returns:
+        int: The number of schemas created.
+
+    Raises:
+        SchemaError: If no tenant type is given with multi type tenants.
+    """
+    if size is None:
+        size = get_schema_pool_size()
+    tenant_type = tenant_type or ""
+    if has_multi_type_tenants() and not tenant_type:
+        raise SchemaError("A tenant type is required to fill the schema pool.")
+
+    created = 0
+    with _fill_lock() as acquired:
+        if not acquired:
+            return created
+
+        drop_stale_pooled_schemas()
+        missing = size - PooledSchema.objects.filter(tenant_type=tenant_type).count()
+        for _ in range(missing):
+            schema_name = f"{POOLED_SCHEMA_PREFIX}{uuid.uuid4().hex}"
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        f"CREATE SCHEMA {connection.ops.quote_name(schema_name)}"
+                    )
+                migrate_schema(
+                    schema_name, tenant_type=tenant_type, verbosity=verbosity
+                )
+                PooledSchema.objects.create(
+                    schema_name=schema_name,
+                    tenant_type=tenant_type,
+                    fingerprint=migration_fingerprint(),
+                )
+            created += 1
+    return created
+
+
+def claim_pooled_schema(schema_name: str, *, tenant_type: str | None = None) -> bool:
+    """Renames a pooled schema to ``schema_name``, if one is available.
+
+    Runs in the caller's transaction, so the claim is undone if provisioning
+    the tenant fails. Once the transaction commits, the pool is refilled with
+    the ``TENANT_USERS_SCHEMA_POOL_REFILL`` callable.
+
+    Args:
+        schema_name (str): Name the claimed schema is renamed to.
+        tenant_type (str, optional): Tenant type the schema must be migrated for.
+
+    Returns:
+        bool: True if a schema was claimed, False if the pool was empty.
+
+    Raises:
+        SchemaError: If ``schema_name`` is not a valid schema name.
+    """
+    if not is_valid_schema_name(schema_name):
+        raise SchemaError(f"Invalid schema name: {schema_name}")
+
+    tenant_type = tenant_type or ""
+    start = time.perf_counter()
+    with transaction.atomic():
+        pooled = (
+            PooledSchema.objects.select_for_update(skip_locked=True)
+            .filter(tenant_type=tenant_type, fingerprint=migration_fingerprint())
+            .order_by("pk")
+            .first()
+        )
+        if pooled is None:
+            with _counters.lock:
+                _counters.misses += 1
+            return False
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER SCHEMA {connection.ops.quote_name(pooled.schema_name)} "
+                f"RENAME TO {connection.ops.quote_name(schema_name)}"
+            )
+        pooled.delete()
+
+    latency = time.perf_counter() - start
+    with _counters.lock:
+        _counters.claims += 1
+        _counters.last_seconds = latency
+        _counters.total_seconds += latency
+
+    schema_pool_claimed.send(
+        sender=PooledSchema,
+        schema_name=schema_name,
+        pooled_schema_name=pooled.schema_name,
+        latency=latency,
+    )
+    transaction.on_commit(functools.partial(_request_refill, tenant_type))
+    return True
+
+
+def _request_refill(tenant_type: str) -> None:
+    refill_path = getattr(settings, "TENANT_USERS_SCHEMA_POOL_REFILL", None)
+    if refill_path:
+        import_string(refill_path)(tenant_type=tenant_type)
+
+
+def refill_schema_pool_in_background(tenant_type: str = "") -> None:
+    """Refills the schema pool from a daemon thread of the current process.
+
+    Opt in by setting ``TENANT_USERS_SCHEMA_POOL_REFILL`` to
+    :data:`BACKGROUND_SCHEMA_POOL_REFILL`. Migrating schemas then competes
+    with the web process for CPU and connections, and is lost if the process
+    exits, so prefer the ``fill_schema_pool`` command or a task queue. At most
+    one refill thread runs per process.
+
+    Args:
+        tenant_type (str): Tenant type of the claimed schema.
+    """
+    if not _refill_lock.acquire(blocking=False):
+        return
+
+    def run() -> None:
+        try:
+            fill_schema_pool(tenant_type=tenant_type)
+        finally:
+            connections.close_all()
+            _refill_lock.release()
+
+    threading.Thread(target=run, name="tenant-users-schema-pool", daemon=True).start()
+
+
+def schema_pool_stats(tenant_type: str | None = None) -> SchemaPoolStats:
+    """Returns the depth of the schema pool and claim metrics.
+
+    Args:
+        tenant_type (str, optional): Tenant type to count pooled schemas for.
+
+    Returns:
+        SchemaPoolStats: The pool depth, the number of stale schemas, and the
+        claims, misses and claim latencies of the current process.
+    """
+    pooled = PooledSchema.objects.filter(tenant_type=tenant_type or "")
+    depth = pooled.filter(fingerprint=migration_fingerprint()).count()
+    stale = pooled.count() - depth
+    with _counters.lock:
+        avg = _counters.total_seconds / _counters.claims if _counters.claims else None
+        return SchemaPoolStats(
+            depth=depth,
+            stale=stale,
+            claims=_counters.claims,
+            misses=_counters.misses,
+            last_claim_seconds=_counters.last_seconds,
+            avg_claim_seconds=avg,
+        )
@@ -0,0 +1,351 @@
+"""Index of users' roles in every tenant, kept in the public schema.
+
+Whether a user is staff or superuser in a tenant is stored in the tenant's
+permissions, usually in the tenant's own schema, so finding the tenants a user
+administers means reading the permissions of every tenant. With
+``TENANT_USERS_ROLE_INDEX = True``, each tenant permissions row is mirrored by
+a :class:`~tenant_users.tenants.models.TenantRoleIndex` row in the public
+schema holding the user's flags and a hash of their groups, and
+:func:`get_staff_tenants` answers such questions with a single indexed query.
+
+The index is kept up to date by the receivers in this module, which follow
+tenant permissions being saved or deleted and their groups changing, and by
+``add_users()``, which bypasses ``save()``. Changes the receivers do not see,
+such as ``QuerySet.update()``, raw SQL or permissions written before the index
+was enabled, are repaired by :func:`rebuild_role_index`, usually through the
+``rebuild_role_index`` management command.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django_tenants.utils import (
+    get_public_schema_name,
+    get_tenant_model,
+    schema_context,
+    schema_exists,
+)
+
+from tenant_users.permissions.storage import (
+    get_tenant_perms_model,
+    get_tenant_perms_queryset,
+    uses_shared_storage,
+)
+from tenant_users.tenants.models import TenantRoleIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from django.db.models import Model, QuerySet
+
+# (is_staff, is_superuser, groups_hash) of one user in one tenant
+Role = tuple[bool, bool, str]
+
+
+class RoleIndexDiff(NamedTuple):
+    """How the role index of a tenant differs from its permissions."""
+
+    missing: int
+    stale: int
+    extra: int
+
+
+def role_index_enabled() -> bool:
+    """Checks whether the role index is maintained."""
+    return getattr(settings, "TENANT_USERS_ROLE_INDEX", False)
+
+
+def groups_hash(group_ids: Iterable[Any]) -> str:
+    """Returns the hash identifying a set of groups.
+
+    Args:
+        group_ids (Iterable): Primary keys of the groups.
+
+    Returns:
+        str: The SHA-256 hex digest of the sorted keys, or an empty string for
+        no groups.
+    """
+    keys = sorted(str(pk) for pk in group_ids)
+    if not keys:
+        return ""
+    return hashlib.sha256(",".join(keys).encode()).hexdigest()
+
+
+def get_staff_tenants(user: Any) -> QuerySet[Any]:
+    """Returns the tenants a user is staff or superuser in.
+
+    Reads the role index, so it is only complete when the index is enabled
+    and has been built.
+
+    Args:
+        user: The user profile.
+    """
+    tenant_ids = TenantRoleIndex.objects.filter(
+        Q(is_staff=True) | Q(is_superuser=True), profile=user
+    ).values("tenant_id")
+    return get_tenant_model().objects.filter(pk__in=tenant_ids)
+
+
+def _current_tenant_id() -> Any:
+    schema_name = connection.schema_name  # type: ignore[attr-defined]
+    tenant = getattr(connection, "tenant", None)
+    # Contexts entered by schema name only carry a stand-in without a key
+    tenant_id = getattr(tenant, "pk", None)
+    if tenant_id is not None and tenant.schema_name == schema_name:
+        return tenant_id
+    return (
+        get_tenant_model()
+        .objects.filter(schema_name=schema_name)
+        .values_list("pk", flat=True)
+        .first()
+    )
+
+
+def _groups_field(model: type[Model]) -> tuple[Any, str, str]:
+    """Return the groups through model and its permissions and group fields."""
+    field = model._meta.get_field("groups")
+    return (
+        field.remote_field.through,  # type: ignore[union-attr]
+        field.m2m_field_name(),  # type: ignore[union-attr]
+        field.m2m_reverse_field_name(),  # type: ignore[union-attr]
+    )
+
+
+def index_tenant_perms(
+    perms_list: Iterable[Any], *, tenant_id: Any = None, new: bool = False
+) -> None:
+    """Writes the role index rows of tenant permissions.
+
+    Args:
+        perms_list (Iterable): Saved tenant permissions, all of the same
+            tenant unless they are stored in the public schema.
+        tenant_id (optional): Primary key of their tenant. Defaults to the
+            permissions' own tenant, or the current one.
+        new (bool): The permissions were just created and have no groups, so
+            they are not read.
+    """
+    perms_list = list(perms_list)
+    if not perms_list:
+        return
+
+    group_ids: dict[Any, list[Any]] = {perms.pk: [] for perms in perms_list}
+    if not new:
+        through, perms_field, group_field = _groups_field(type(perms_list[0]))
+        memberships = through.objects.filter(
+            **{f"{perms_field}__in": list(group_ids)}
+        ).values_list(f"{perms_field}_id", f"{group_field}_id")
+        for perms_id, group_id in memberships:
+            group_ids[perms_id].append(group_id)
+
+    if tenant_id is None and not uses_shared_storage():
+        tenant_id = _current_tenant_id()
+    TenantRoleIndex.objects.bulk_create(
+        [
+            TenantRoleIndex(
+                tenant_id=getattr(perms, "tenant_id", tenant_id),
+                profile_id=perms.profile_id,
+                is_staff=perms.is_staff,
+                is_superuser=perms.is_superuser,
+                groups_hash=groups_hash(group_ids[perms.pk]),
+            )
+            for perms in perms_list
+        ],
+        update_conflicts=True,
+        unique_fields=["profile", "tenant"],
+        update_fields=["is_staff", "is_superuser", "groups_hash"],
+    )
+
+
+def _tenant_roles(tenant: Any) -> dict[Any, Role]:
+    """Read the roles of a tenant's members from its permissions."""
+    if uses_shared_storage():
+        schema_name = get_public_schema_name()
+    elif schema_exists(tenant.schema_name):
+        schema_name = tenant.schema_name
+    else:
+        # Lazily provisioned tenants have no schema, nor permissions, yet
+        return {}
+
+    with schema_context(schema_name):
+        rows = get_tenant_perms_queryset(tenant.schema_name).values_list(
+            "profile_id", "is_staff", "is_superuser", "groups"
+        )
+        members: dict[Any, tuple[bool, bool, list[Any]]] = {}
+        for profile_id, is_staff, is_superuser, group_id in rows:
+            member = members.setdefault(profile_id, (is_staff, is_superuser, []))
+            if group_id is not None:
+                member[2].append(group_id)
+    return {
+        profile_id: (is_staff, is_superuser, groups_hash(group_ids))
+        for profile_id, (is_staff, is_superuser, group_ids) in members.items()
+    }
+
+
+def _compare(tenant: Any) -> tuple[dict[Any, Role], list[Any], RoleIndexDiff]:
+    """Return the rows to write, the profiles to drop and the differences."""
+    expected = _tenant_roles(tenant)
+    with schema_context(get_public_schema_name()):
+        indexed = {
+            profile_id: (is_staff, is_superuser, hash_)
+            for profile_id, is_staff, is_superuser, hash_ in TenantRoleIndex.objects.filter(
+                tenant_id=tenant.pk
+            ).values_list("profile_id", "is_staff", "is_superuser", "groups_hash")
+        }
+
+    to_write = {
+        profile_id: role
+        for profile_id, role in expected.items()
+        if indexed.get(profile_id) != role
+    }
+    extra = [profile_id for profile_id in indexed if profile_id not in expected]
+    missing = sum(profile_id not in indexed for profile_id in to_write)
+    return (
+        to_write,
+        extra,
+        RoleIndexDiff(missing, len(to_write) - missing, len(extra)),
+    )
+
+
+def verify_role_index(tenant: Any) -> RoleIndexDiff:
+    """Compares the role index of a tenant with its permissions.
+
+    Args:
+        tenant: The tenant to verify.
+
+    Returns:
+        RoleIndexDiff: The number of permissions without an index row, of
+        index rows with outdated roles and of index rows without permissions.
+    """
+    return _compare(tenant)[2]
+
+
+def rebuild_role_index(tenant: Any) -> RoleIndexDiff:
+    """Brings the role index of a tenant in line with its permissions.
+
+    Only the differing rows are written, in one transaction.
+
+    Args:
+        tenant: The tenant to rebuild.
+
+    Returns:
+        RoleIndexDiff: The differences that were repaired.
+    """
+    to_write, extra, diff = _compare(tenant)
+    with schema_context(get_public_schema_name()), transaction.atomic():
+        TenantRoleIndex.objects.filter(
+            tenant_id=tenant.pk, profile_id__in=extra
+        ).delete()
+        TenantRoleIndex.objects.bulk_create(
+            [
+                TenantRoleIndex(
+                    tenant_id=tenant.pk,
+                    profile_id=profile_id,
+                    is_staff=is_staff,
+                    is_superuser=is_superuser,
+                    groups_hash=hash_,
+                )
+                for profile_id, (is_staff, is_superuser, hash_) in to_write.items()
+            ],
+            update_conflicts=True,
+            unique_fields=["profile", "tenant"],
+            update_fields=["is_staff", "is_superuser", "groups_hash"],
+        )
+    return diff
+
+
+def _perms_saved(sender, instance, created, update_fields=None, **kwargs) -> None:  # noqa: ARG001
+    if not role_index_enabled():
+        return
+    if update_fields is not None and not {"is_staff", "is_superuser"} & set(
+        update_fields
+    ):
+        return
+    index_tenant_perms([instance], new=created)
+
+
+def _perms_deleted(sender, instance, **kwargs) -> None:  # noqa: ARG001
+    if not role_index_enabled():
+        return
+    if hasattr(instance, "tenant_id"):
+        tenant_filter = {"tenant_id": instance.tenant_id}
+    else:
+        tenant_filter = {"tenant__schema_name": connection.schema_name}  # type: ignore[attr-defined]
+    TenantRoleIndex.objects.filter(
+        profile_id=instance.profile_id, **tenant_filter
+    ).delete()
+
+
+def _reindex(perms_ids: Iterable[Any]) -> None:
+    index_tenant_perms(get_tenant_perms_model().objects.filter(pk__in=list(perms_ids)))
+
+
+def _groups_changed(sender, instance, action, reverse, pk_set, **kwargs) -> None:  # noqa: ARG001
+    if not role_index_enabled():
+        return
+    if not reverse:
+        if action.startswith("post_"):
+            index_tenant_perms([instance])
+        return
+
+    # A group changed its members
+    if action == "pre_clear":
+        _, perms_field, group_field = _groups_field(get_tenant_perms_model())
+        instance._role_index_members = list(  # noqa: SLF001
+            sender.objects.filter(**{group_field: instance.pk}).values_list(
+                f"{perms_field}_id", flat=True
+            )
+        )
+    elif action == "post_clear":
+        _reindex(instance.__dict__.pop("_role_index_members", ()))
+    elif action.startswith("post_"):
+        _reindex(pk_set)
+
+
+def _group_deleting(sender, instance, **kwargs) -> None:  # noqa: ARG001
+    if role_index_enabled():
+        # The group's memberships are deleted without m2m_changed signals
+        through, perms_field, group_field = _groups_field(get_tenant_perms_model())
+        instance._role_index_members = list(  # noqa: SLF001
+            through.objects.filter(**{group_field: instance.pk}).values_list(
+                f"{perms_field}_id", flat=True
+            )
+        )
+
+
+def _group_deleted(sender, instance, **kwargs) -> None:  # noqa: ARG001
+    members = instance.__dict__.pop("_role_index_members", None)
+    if members:
+        _reindex(members)
+
+
+def connect_signals() -> None:
+    """Connects the receivers that keep the role index up to date."""
+    from django.contrib.auth.models import Group  # noqa: PLC0415
+    from django.db.models.signals import (  # noqa: PLC0415
+        m2m_changed,
+        post_delete,
+        post_save,
+        pre_delete,
+    )
+
+    from tenant_users.permissions.models import UserTenantPermissions  # noqa: PLC0415
+    from tenant_users.tenants.models import (  # noqa: PLC0415
+        SharedUserTenantPermissions,
+    )
+
+    dispatch_uid = "tenant_users.tenants.roles"
+    for model in (UserTenantPermissions, SharedUserTenantPermissions):
+        post_save.connect(_perms_saved, sender=model, dispatch_uid=dispatch_uid)
+        post_delete.connect(_perms_deleted, sender=model, dispatch_uid=dispatch_uid)
+        m2m_changed.connect(
+            _groups_changed,
+            sender=model._meta.get_field("groups").remote_field.through,
+            dispatch_uid=dispatch_uid,
+        )
+    pre_delete.connect(_group_deleting, sender=Group, dispatch_uid=dispatch_uid)
+    post_delete.connect(_group_deleted, sender=Group, dispatch_uid=dispatch_uid)
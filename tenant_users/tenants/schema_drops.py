@@ -0,0 +1,163 @@
+"""Deferred dropping of the schemas of deleted tenants.
+
+``DROP SCHEMA ... CASCADE`` takes locks on every object in the schema and can
+run for a long time on big schemas. With ``TENANT_USERS_DEFER_SCHEMA_DROP``,
+deleting a tenant with ``force_drop=True`` only renames its schema, which is
+quick, and queues it in :class:`~tenant_users.tenants.models.QueuedSchemaDrop`.
+The queued schemas are dropped later by :func:`drop_queued_schemas`, usually
+through the ``drop_queued_schemas`` management command run off-peak.
+
+Renaming the schema frees its name right away, so a new tenant can never end
+up with the data of a deleted one.
+"""
+
+from __future__ import annotations
+
+import functools
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+from django.db import connection, connections, transaction
+from django_tenants.utils import get_public_schema_name, schema_context, schema_exists
+
+from tenant_users.tenants.models import QueuedSchemaDrop
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+
+QUEUED_SCHEMA_PREFIX = "dropped_"
+
+
+def queue_schema_drop(tenant: Any) -> QueuedSchemaDrop | None:
+    """Renames a tenant's schema out of the way and queues it to be dropped.
+
+    Calls the tenant's ``pre_drop()`` hook first, as dropping it would.
+
+    Args:
+        tenant: The tenant being deleted.
+
+    Returns:
+        QueuedSchemaDrop: The queued schema, or None if the tenant has no schema.
+    """
+    if not schema_exists(tenant.schema_name):
+        return None
+
+    tenant.pre_drop()
+    queued_name = f"{QUEUED_SCHEMA_PREFIX}{uuid.uuid4().hex}"
+    with schema_context(get_public_schema_name()), transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"ALTER SCHEMA {connection.ops.quote_name(tenant.schema_name)} "
+                f"RENAME TO {connection.ops.quote_name(queued_name)}"
+            )
+        return QueuedSchemaDrop.objects.create(
+            schema_name=queued_name, original_schema_name=tenant.schema_name
+        )
+
+
+def _drop_queued_schema(pk: Any, lock_timeout: float | None) -> str | None:
+    """Drop one queued schema, unless another worker already took it."""
+    with schema_context(get_public_schema_name()), transaction.atomic():
+        queued = (
+            QueuedSchemaDrop.objects.select_for_update(skip_locked=True)
+            .filter(pk=pk)
+            .first()
+        )
+        if queued is None:
+            return None
+
+        with connection.cursor() as cursor:
+            if lock_timeout is not None:
+                # Give up instead of queueing other sessions behind our locks
+                cursor.execute(
+                    "SELECT set_config('lock_timeout', %s, true)",
+                    [f"{int(lock_timeout * 1000)}ms"],
+                )
+            cursor.execute(
+                f"DROP SCHEMA IF EXISTS {connection.ops.quote_name(queued.schema_name)} CASCADE"
+            )
+        queued.delete()
+    return queued.schema_name
+
+
+def _drop_in_worker(pk: Any, lock_timeout: float | None, pause: float) -> str | None:
+    try:
+        return _drop_queued_schema(pk, lock_timeout)
+    finally:
+        connections.close_all()
+        time.sleep(pause)
+
+
+def drop_queued_schemas(  # noqa: PLR0913
+    *,
+    schema_names: Iterable[str] | None = None,
+    limit: int | None = None,
+    max_workers: int = 1,
+    pause: float = 0,
+    lock_timeout: float | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[list[str], dict[str, Exception]]:
+    """Drops the queued schemas of deleted tenants, oldest first.
+
+    Each schema is dropped in its own transaction. Several workers may run at
+    the same time, in this call or in other processes; a schema is only ever
+    dropped by one of them.
+
+    Args:
+        schema_names (Iterable, optional): Only drop these queued schemas.
+        limit (int, optional): Maximum number of schemas to drop.
+        max_workers (int): Number of schemas dropped at the same time. A value
+            of 1 drops them one after the other on the current connection.
+        pause (float): Seconds each worker waits after a drop, to spread the
+            load.
+        lock_timeout (float, optional): Seconds to wait for a lock before
+            giving up on a schema, which stays queued.
+        progress (Callable, optional): Called with the number of processed and
+            total schemas after each drop.
+
+    Returns:
+        tuple: A tuple containing:
+            - list: The names of the dropped schemas.
+            - dict: The exception raised for each schema that could not be
+              dropped, keyed by queued schema name.
+    """
+    with schema_context(get_public_schema_name()):
+        queued_drops = QueuedSchemaDrop.objects.order_by("queued_at", "pk")
+        if schema_names is not None:
+            queued_drops = queued_drops.filter(schema_name__in=list(schema_names))
+        queued = list(queued_drops.values_list("pk", "schema_name")[:limit])
+
+    dropped: list[str] = []
+    errors: dict[str, Exception] = {}
+    processed = 0
+
+    def record(schema_name: str, drop: Callable[[], str | None]) -> None:
+        nonlocal processed
+        try:
+            if drop() is not None:
+                dropped.append(schema_name)
+        except Exception as error:  # noqa: BLE001
+            errors[schema_name] = error
+        processed += 1
+        if progress is not None:
+            progress(processed, len(queued))
+
+    if max_workers == 1:
+        for index, (pk, schema_name) in enumerate(queued):
+            record(
+                schema_name,
+                functools.partial(_drop_queued_schema, pk, lock_timeout),
+            )
+            if pause and index < len(queued) - 1:
+                time.sleep(pause)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (schema_name, executor.submit(_drop_in_worker, pk, lock_timeout, pause))
+                for pk, schema_name in queued
+            ]
+            for schema_name, future in futures:
+                record(schema_name, future.result)
+    return dropped, errors
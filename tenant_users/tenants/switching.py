@@ -0,0 +1,112 @@
+"""Schema switches made by tenant methods, and how to avoid them.
+
+Methods decorated with ``schema_required`` run within their tenant's schema.
+Switching to it and back makes django-tenants set the search path again on
+the next queries, so a method called while the connection is already on its
+tenant, such as ``public_tenant.add_user()`` from the public schema or
+``remove_user()`` from ``transfer_ownership()``, runs where it is instead.
+
+:func:`pinned_tenant` lets callers do the same for a block of calls, so a
+loop over many tenant methods switches schemas once::
+
+    with pinned_tenant(tenant):
+        for user in users:
+            tenant.add_user(user)
+
+:func:`get_schema_switch_stats` counts the switches made and avoided in this
+process.
+
+A tenant provisioned with ``lazy_schema=True`` has no schema until it is
+materialized, and its search path would fall through to the public schema.
+Entering such a tenant materializes its schema first.
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from django.db import connection
+from django_tenants.utils import get_public_schema_name, schema_exists, tenant_context
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+
+class SchemaSwitchStats(NamedTuple):
+    """Number of schema switches made and avoided by tenant methods."""
+
+    switched: int
+    avoided: int
+
+
+_counts = {"switched": 0, "avoided": 0}
+_counts_lock = threading.Lock()
+
+
+def _count(name: str) -> None:
+    with _counts_lock:
+        _counts[name] += 1
+
+
+def get_schema_switch_stats() -> SchemaSwitchStats:
+    """Returns the schema switches made and avoided in this process."""
+    with _counts_lock:
+        return SchemaSwitchStats(_counts["switched"], _counts["avoided"])
+
+
+def reset_schema_switch_stats() -> None:
+    """Sets the schema switch counters back to zero."""
+    with _counts_lock:
+        _counts.update(switched=0, avoided=0)
+
+
+def is_current_tenant(tenant: Any) -> bool:
+    """Checks whether the connection already uses the tenant's search path.
+
+    Args:
+        tenant: The tenant to check.
+    """
+    return connection.schema_name == tenant.schema_name and getattr(  # type: ignore[attr-defined]
+        connection, "include_public_schema", True
+    )
+
+
+def _ensure_schema(tenant: Any) -> None:
+    """Materialize the schema of a lazily provisioned tenant before entering it."""
+    from tenant_users.tenants.lazy import (  # noqa: PLC0415
+        is_schema_pending,
+        materialize_schema,
+    )
+
+    schema_name = tenant.schema_name
+    # A pending tenant whose schema exists is being materialized right now
+    if (
+        schema_name != get_public_schema_name()
+        and is_schema_pending(schema_name)
+        and not schema_exists(schema_name)
+    ):
+        materialize_schema(schema_name)
+
+
+@contextmanager
+def pinned_tenant(tenant: Any) -> Iterator[None]:
+    """Keeps the connection on a tenant's schema for a block of calls.
+
+    Switches to the tenant's schema, unless the connection is already on it,
+    and restores the previous one at the end. Tenant methods called inside
+    the block for this tenant run without switching again.
+
+    Args:
+        tenant: The tenant whose schema to use.
+    """
+    if is_current_tenant(tenant):
+        _count("avoided")
+        yield
+        return
+
+    _ensure_schema(tenant)
+    _count("switched")
+    with tenant_context(tenant):
+        yield
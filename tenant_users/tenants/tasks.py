@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import functools
+import threading
 import time
-from typing import Any
+from typing import TYPE_CHECKING, Any, NamedTuple
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.models import F
+from django_tenants.models import TenantMixin
+from django_tenants.signals import post_schema_sync
 from django_tenants.utils import (
     get_multi_type_database_field_name,
     get_public_schema_name,
@@ -14,16 +20,82 @@ from django_tenants.utils import (
     get_tenant_types,
     has_multi_type_tenants,
     schema_context,
+    schema_exists,
+    tenant_context,
 )
 
-from tenant_users.constants import INACTIVE_USER_ERROR_MESSAGE
-from tenant_users.tenants.models import ExistsError, InactiveError, SchemaError
+from tenant_users.constants import DEFAULT_BATCH_SIZE, INACTIVE_USER_ERROR_MESSAGE
+from tenant_users.permissions.storage import build_tenant_perms
+from tenant_users.tenants.cache import invalidate_user_tenants
+from tenant_users.tenants.models import (
+    ExistsError,
+    InactiveError,
+    SchemaError,
+    TenantProvisioning,
+    tenant_provisioning_stage_completed,
+    tenant_user_added,
+)
+from tenant_users.tenants.pool import claim_pooled_schema, get_schema_pool_size
+from tenant_users.tenants.template import clone_template_schema
+from tenant_users.tenants.utils import run_in_tenants
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
 
 UserModel = get_user_model()
 TenantModel = get_tenant_model()
 DomainModel = get_tenant_domain_model()
 
 
+class TenantProvisionResult(NamedTuple):
+    """Outcome of a single row passed to provision_tenants()."""
+
+    slug: str | None
+    tenant: Any = None
+    domain: Any = None
+    error: Exception | None = None
+
+
+def _prepare_schema(schema_name: str, tenant_type: str | None) -> None:
+    """Provide an already migrated schema for a tenant about to be created.
+
+    Takes over a schema from the pool when one is ready, or clones the template
+    schema, so that creating the tenant finds its schema and skips the
+    migrations. Does nothing when neither is configured.
+    """
+    claimed = get_schema_pool_size() > 0 and claim_pooled_schema(
+        schema_name, tenant_type=tenant_type
+    )
+    if not claimed:
+        clone_template_schema(schema_name, tenant_type=tenant_type)
+
+
+def _get_tenant_domain(tenant_slug: str) -> str:
+    if hasattr(settings, "TENANT_SUBFOLDER_PREFIX"):
+        return tenant_slug
+    return f"{tenant_slug}.{settings.TENANT_USERS_DOMAIN}"
+
+
+def _get_schema_name(tenant_slug: str) -> str:
+    time_string = str(int(time.time()))
+    # Must be valid postgres schema characters see:
+    # https://www.postgresql.org/docs/9.2/static/sql-syntax-lexical.html#SQL-SYNTAX-IDENTIFIERS
+    # We generate unique schema names each time so we can keep tenants around
+    # without taking up url/schema namespace.
+    return f"{tenant_slug}_{time_string}"
+
+
+def _check_tenant_type(tenant_type: str | None) -> None:
+    valid_tenant_types = get_tenant_types()
+
+    if tenant_type not in valid_tenant_types:
+        valid_type_str = ", ".join(valid_tenant_types)
+        error_message = (
+            f"{tenant_type} is not a valid tenant type. Choices are {valid_type_str}."
+        )
+        raise SchemaError(error_message)
+
+
 @transaction.atomic
 def provision_tenant(  # noqa: PLR0913
     tenant_name: str,
@@ -36,6 +108,7 @@ def provision_tenant(  # noqa: PLR0913
     schema_name: str | None = None,
     tenant_extra_data: dict[str, Any] | None = None,
     domain_extra_data: dict[str, Any] | None = None,
+    lazy_schema: bool = False,
 ):
     """Creates a new tenant and its domain with specified attributes and default roles.
 
@@ -49,6 +122,8 @@ def provision_tenant(  # noqa: PLR0913
         schema_name (str, optional): The schema name for the tenant. Defaults to a combination of the slug and a timestamp.
         tenant_extra_data (dict, optional): Additional data for the tenant model.
         domain_extra_data (dict, optional): Additional data for the domain model.
+        lazy_schema (bool, optional): If True, defer creating and migrating the
+            schema until the tenant is first used, see :func:`start_provisioning`.
 
     Returns:
         tuple: A tuple containing:
@@ -60,6 +135,24 @@ def provision_tenant(  # noqa: PLR0913
         ExistsError: If the tenant URL already exists.
         SchemaError: If the tenant type is not valid.
     """
+    if lazy_schema:
+        provisioning = start_provisioning(
+            tenant_name,
+            tenant_slug,
+            owner,
+            is_staff=is_staff,
+            is_superuser=is_superuser,
+            tenant_type=tenant_type,
+            schema_name=schema_name,
+            tenant_extra_data=tenant_extra_data,
+            domain_extra_data=domain_extra_data,
+            lazy_schema=True,
+        )
+        with schema_context(get_public_schema_name()):
+            tenant = TenantModel.objects.get(schema_name=provisioning.schema_name)
+            domain = DomainModel.objects.get(domain=provisioning.domain)
+        return tenant, domain
+
     if tenant_extra_data is None:
         tenant_extra_data = {}
 
@@ -69,34 +162,22 @@ def provision_tenant(  # noqa: PLR0913
     if not owner.is_active:
         raise InactiveError(INACTIVE_USER_ERROR_MESSAGE)
 
-    if hasattr(settings, "TENANT_SUBFOLDER_PREFIX"):
-        tenant_domain = tenant_slug
-    else:
-        tenant_domain = f"{tenant_slug}.{settings.TENANT_USERS_DOMAIN}"
+    tenant_domain = _get_tenant_domain(tenant_slug)
 
     if DomainModel.objects.filter(domain=tenant_domain).exists():
         raise ExistsError("Tenant URL already exists.")
     if not schema_name:
-        time_string = str(int(time.time()))
-        # Must be valid postgres schema characters see:
-        # https://www.postgresql.org/docs/9.2/static/sql-syntax-lexical.html#SQL-SYNTAX-IDENTIFIERS
-        # We generate unique schema names each time so we can keep tenants around
-        # without taking up url/schema namespace.
-        schema_name = f"{tenant_slug}_{time_string}"
+        schema_name = _get_schema_name(tenant_slug)
 
     # Validate tenant type if multi-tenants are enabled
     if has_multi_type_tenants():
-        valid_tenant_types = get_tenant_types()
-
-        if tenant_type not in valid_tenant_types:
-            valid_type_str = ", ".join(valid_tenant_types)
-            error_message = f"{tenant_type} is not a valid tenant type. Choices are {valid_type_str}."
-            raise SchemaError(error_message)
-
+        _check_tenant_type(tenant_type)
         tenant_extra_data.update({get_multi_type_database_field_name(): tenant_type})
 
     # Attempt to create the tenant and domain within the schema context
     with schema_context(get_public_schema_name()):
+        _prepare_schema(schema_name, tenant_type)
+
         # Create a new tenant instance with provided data
         tenant = TenantModel.objects.create(
             name=tenant_name,
@@ -116,3 +197,411 @@ def provision_tenant(  # noqa: PLR0913
 
     # Return the provision tenant created and its associated domain
     return tenant, domain
+
+
+# Django's migrate command and app registry are not thread-safe, so the
+# worker threads of provision_tenants() migrate one schema at a time
+_migrate_lock = threading.Lock()
+
+
+def _set_up_tenant_schema(
+    tenant, *, domains: dict[str, Any], is_superuser: bool, is_staff: bool
+) -> None:
+    """Create and migrate the schema of a tenant created by provision_tenants().
+
+    Runs on a worker, so the tenant's row was committed beforehand. Its domain
+    is only added once the schema is ready, so requests cannot reach the
+    tenant before. On failure the row is deleted again, along with the schema
+    if it was created.
+    """
+    tenant_type = getattr(tenant, get_multi_type_database_field_name(), None)
+    domain = domains[tenant.schema_name]
+    with schema_context(get_public_schema_name()):
+        try:
+            with transaction.atomic():
+                _prepare_schema(tenant.schema_name, tenant_type)
+                # Does nothing for a schema taken from the pool or the template
+                with _migrate_lock:
+                    tenant.create_schema(check_if_exists=True, verbosity=0)
+                post_schema_sync.send(
+                    sender=TenantMixin, tenant=tenant.serializable_fields()
+                )
+                tenant.add_user(
+                    tenant.owner, is_superuser=is_superuser, is_staff=is_staff
+                )
+                domain.tenant = tenant
+                DomainModel.objects.bulk_create([domain])
+        except Exception:
+            tenant.delete(force_drop=True)
+            raise
+
+
+def _build_tenant(row: dict[str, Any], owner) -> tuple[Any, Any]:
+    """Build the unsaved tenant and domain for a row of provision_tenants()."""
+    tenant_slug = row.get("slug")
+    if not tenant_slug or not row.get("name"):
+        raise ValueError("Every tenant needs a name and a slug.")
+
+    tenant_extra_data = dict(row.get("tenant_extra_data") or {})
+    if has_multi_type_tenants():
+        _check_tenant_type(row.get("tenant_type"))
+        tenant_extra_data[get_multi_type_database_field_name()] = row["tenant_type"]
+
+    tenant = TenantModel(
+        name=row["name"],
+        slug=tenant_slug,
+        schema_name=row.get("schema_name") or _get_schema_name(tenant_slug),
+        owner=owner,
+        **tenant_extra_data,
+    )
+    domain = DomainModel(
+        domain=_get_tenant_domain(tenant_slug),
+        tenant=tenant,
+        is_primary=True,
+        **(row.get("domain_extra_data") or {}),
+    )
+    return tenant, domain
+
+
+def provision_tenants(  # noqa: PLR0913
+    rows: Iterable[dict[str, Any]],
+    owner,
+    *,
+    is_staff: bool = False,
+    is_superuser: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_workers: int = 4,
+    use_processes: bool = False,
+) -> list[TenantProvisionResult]:
+    """Creates many tenants at once, all owned by the same user.
+
+    Bulk counterpart of :func:`provision_tenant`. All domains and schema names
+    are checked with one query each, and the tenant rows are bulk inserted and
+    committed. The schemas are then created, migrated and given their owner in
+    parallel with :func:`~tenant_users.tenants.utils.run_in_tenants`, and each
+    tenant's domain is added once its schema is ready, so no request reaches a
+    tenant without one. Each tenant is set up in its own transaction, and a
+    tenant whose schema cannot be set up is deleted again without affecting
+    the others. Worker threads run the migrations of new schemas one at a
+    time, worker processes run them in parallel.
+
+    Like ``bulk_create()``, this bypasses the tenant and domain models' ``save()``.
+
+    Args:
+        rows: Dictionaries holding a ``name`` and ``slug`` and optionally a
+            ``tenant_type``, ``schema_name``, ``tenant_extra_data`` and
+            ``domain_extra_data``, as taken by :func:`provision_tenant`.
+        owner (UserModel): The owner of all the tenants.
+        is_staff (bool, optional): If True, the owner has staff access. Defaults to False.
+        is_superuser (bool, optional): If True, the owner has all permissions. Defaults to True.
+        batch_size (int): Maximum number of rows written per statement.
+        max_workers (int): Number of schemas set up at the same time.
+        use_processes (bool): If True, set up schemas in worker processes
+            instead of threads.
+
+    Returns:
+        list: One :class:`TenantProvisionResult` per row, in the input order.
+
+    Raises:
+        InactiveError: If the owner is inactive.
+    """
+    if not owner.is_active:
+        raise InactiveError(INACTIVE_USER_ERROR_MESSAGE)
+
+    results: list[TenantProvisionResult] = []
+    # result index -> (tenant, domain)
+    pending: dict[int, tuple[Any, Any]] = {}
+    for idx, row in enumerate(rows):
+        results.append(TenantProvisionResult(row.get("slug")))
+        try:
+            pending[idx] = _build_tenant(row, owner)
+        except (ValueError, SchemaError) as error:
+            results[idx] = TenantProvisionResult(row.get("slug"), error=error)
+
+    with schema_context(get_public_schema_name()):
+        taken_domains = set(
+            DomainModel.objects.filter(
+                domain__in=[domain.domain for _tenant, domain in pending.values()]
+            ).values_list("domain", flat=True)
+        )
+        taken_schemas = set(
+            TenantModel.objects.filter(
+                schema_name__in=[tenant.schema_name for tenant, _d in pending.values()]
+            ).values_list("schema_name", flat=True)
+        )
+        for idx, (tenant, domain) in list(pending.items()):
+            if domain.domain in taken_domains:
+                error = ExistsError("Tenant URL already exists.")
+            elif tenant.schema_name in taken_schemas:
+                error = ExistsError("Tenant schema already exists.")
+            else:
+                taken_domains.add(domain.domain)
+                taken_schemas.add(tenant.schema_name)
+                continue
+            results[idx] = TenantProvisionResult(tenant.slug, error=error)
+            del pending[idx]
+
+        TenantModel.objects.bulk_create(
+            [tenant for tenant, _domain in pending.values()],
+            batch_size=batch_size,
+        )
+
+    _results, errors = run_in_tenants(
+        functools.partial(
+            _set_up_tenant_schema,
+            domains={tenant.schema_name: domain for tenant, domain in pending.values()},
+            is_superuser=is_superuser,
+            is_staff=is_staff,
+        ),
+        [tenant for tenant, _domain in pending.values()],
+        max_workers=max_workers,
+        use_processes=use_processes,
+    )
+    with schema_context(get_public_schema_name()):
+        # Worker processes saved copies of the domains
+        saved_domains = DomainModel.objects.in_bulk(
+            [
+                domain.domain
+                for tenant, domain in pending.values()
+                if tenant.schema_name not in errors
+            ],
+            field_name="domain",
+        )
+    for idx, (tenant, domain) in pending.items():
+        error = errors.get(tenant.schema_name)
+        if error is None:
+            results[idx] = TenantProvisionResult(
+                tenant.slug, tenant, saved_domains[domain.domain]
+            )
+        else:
+            results[idx] = TenantProvisionResult(tenant.slug, error=error)
+    return results
+
+
+def start_provisioning(  # noqa: PLR0913
+    tenant_name: str,
+    tenant_slug: str,
+    owner,
+    *,
+    is_staff: bool = False,
+    is_superuser: bool = True,
+    tenant_type: str | None = None,
+    schema_name: str | None = None,
+    tenant_extra_data: dict[str, Any] | None = None,
+    domain_extra_data: dict[str, Any] | None = None,
+    lazy_schema: bool = False,
+) -> TenantProvisioning:
+    """Creates a new tenant in resumable stages.
+
+    Takes the same arguments as :func:`provision_tenant`, but instead of one
+    transaction, provisioning is split into stages (reserve the domain,
+    create the schema, migrate it, link the owner and finalize) that are
+    committed one at a time. Progress is recorded in a
+    :class:`~tenant_users.tenants.models.TenantProvisioning` row in the public
+    schema, so that a failed or interrupted provisioning can be continued with
+    :func:`resume_provisioning` or the ``resume_provisioning`` management
+    command.
+
+    With ``lazy_schema``, only the tenant and domain rows are created and the
+    owner is linked to the tenant. The remaining stages run on the first
+    request to the tenant, through ``LazySchemaMiddleware``, or when
+    :func:`~tenant_users.tenants.lazy.materialize_schema` reaches it first.
+
+    The extra data is stored as JSON and must be serializable.
+
+    Returns:
+        TenantProvisioning: The completed provisioning, or the pending one
+        with ``lazy_schema``. Its ``tenant`` and
+        ``domain`` can be looked up by ``schema_name`` and ``domain``.
+
+    Raises:
+        InactiveError: If the user is inactive.
+        ExistsError: If the tenant URL already exists.
+        SchemaError: If the tenant type is not valid.
+        Exception: Anything raised by a stage, after it was recorded on the
+            provisioning row.
+    """
+    if not owner.is_active:
+        raise InactiveError(INACTIVE_USER_ERROR_MESSAGE)
+
+    tenant_domain = _get_tenant_domain(tenant_slug)
+    if has_multi_type_tenants():
+        _check_tenant_type(tenant_type)
+
+    with schema_context(get_public_schema_name()):
+        if DomainModel.objects.filter(domain=tenant_domain).exists():
+            raise ExistsError("Tenant URL already exists.")
+
+        provisioning = TenantProvisioning.objects.create(
+            name=tenant_name,
+            slug=tenant_slug,
+            domain=tenant_domain,
+            schema_name=schema_name or _get_schema_name(tenant_slug),
+            tenant_type=tenant_type or "",
+            owner=owner,
+            is_staff=is_staff,
+            is_superuser=is_superuser,
+            tenant_extra_data=tenant_extra_data or {},
+            domain_extra_data=domain_extra_data or {},
+            lazy_schema=lazy_schema,
+        )
+        if lazy_schema:
+            return _run_provisioning_stage(provisioning)
+    return resume_provisioning(provisioning)
+
+
+def _reserve_domain(provisioning: TenantProvisioning) -> None:
+    """Create the tenant and domain rows, without a schema yet."""
+    if DomainModel.objects.filter(domain=provisioning.domain).exists():
+        raise ExistsError("Tenant URL already exists.")
+
+    tenant_extra_data = dict(provisioning.tenant_extra_data)
+    if has_multi_type_tenants():
+        tenant_extra_data[get_multi_type_database_field_name()] = (
+            provisioning.tenant_type
+        )
+    tenant = TenantModel(
+        name=provisioning.name,
+        slug=provisioning.slug,
+        schema_name=provisioning.schema_name,
+        owner_id=provisioning.owner_id,
+        **tenant_extra_data,
+    )
+    # The schema is created by the next stages
+    tenant.auto_create_schema = False
+    tenant.save()
+    DomainModel.objects.create(
+        domain=provisioning.domain,
+        tenant=tenant,
+        is_primary=True,
+        **provisioning.domain_extra_data,
+    )
+    if provisioning.lazy_schema:
+        # Give the owner access right away, so their first request to the
+        # tenant creates its schema
+        provisioning.owner.tenants.add(tenant)
+        invalidate_user_tenants(provisioning.owner_id)
+
+
+def _create_schema(provisioning: TenantProvisioning) -> None:
+    if schema_exists(provisioning.schema_name):
+        # Created by an attempt interrupted before recording the stage
+        return
+    _prepare_schema(provisioning.schema_name, provisioning.tenant_type or None)
+    if not schema_exists(provisioning.schema_name):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE SCHEMA {connection.ops.quote_name(provisioning.schema_name)}"
+            )
+
+
+def _migrate(provisioning: TenantProvisioning) -> None:
+    # Applies nothing to schemas from the pool or the template
+    call_command(
+        "migrate_schemas",
+        tenant=True,
+        schema_name=provisioning.schema_name,
+        interactive=False,
+        verbosity=0,
+    )
+    tenant = TenantModel.objects.get(schema_name=provisioning.schema_name)
+    post_schema_sync.send(sender=TenantMixin, tenant=tenant.serializable_fields())
+
+
+def _link_owner(provisioning: TenantProvisioning) -> None:
+    tenant = TenantModel.objects.get(schema_name=provisioning.schema_name)
+    if not provisioning.lazy_schema:
+        tenant.add_user(
+            provisioning.owner,
+            is_superuser=provisioning.is_superuser,
+            is_staff=provisioning.is_staff,
+        )
+        return
+
+    # The membership was added with the domain, only the tenant permissions
+    # were waiting for the schema
+    with tenant_context(tenant):
+        build_tenant_perms(
+            tenant,
+            profile=provisioning.owner,
+            is_staff=provisioning.is_staff,
+            is_superuser=provisioning.is_superuser,
+        ).save()
+    tenant_user_added.send(
+        sender=tenant.__class__, user=provisioning.owner, tenant=tenant
+    )
+
+
+def _finalize(provisioning: TenantProvisioning) -> None:
+    """Mark the provisioning as complete, clearing errors of earlier attempts."""
+    provisioning.error = ""
+
+
+_PROVISIONING_STAGES = {
+    TenantProvisioning.Stage.RESERVE_DOMAIN: _reserve_domain,
+    TenantProvisioning.Stage.CREATE_SCHEMA: _create_schema,
+    TenantProvisioning.Stage.MIGRATE: _migrate,
+    TenantProvisioning.Stage.LINK_OWNER: _link_owner,
+    TenantProvisioning.Stage.FINALIZE: _finalize,
+}
+
+
+def _run_provisioning_stage(provisioning: TenantProvisioning) -> TenantProvisioning:
+    """Run the next stage of a provisioning and record it."""
+    stages = list(TenantProvisioning.Stage)
+    stage = TenantProvisioning.Stage(provisioning.stage)
+    start = time.perf_counter()
+    try:
+        with transaction.atomic():
+            provisioning = TenantProvisioning.objects.select_for_update(
+                nowait=True
+            ).get(pk=provisioning.pk)
+            if provisioning.stage != stage:
+                # Completed by another process since it was read
+                return provisioning
+            _PROVISIONING_STAGES[stage](provisioning)
+            seconds = time.perf_counter() - start
+            provisioning.stage_timings[stage.value] = seconds
+            provisioning.stage = stages[stages.index(stage) + 1]
+            provisioning.save()
+    except Exception as error:
+        TenantProvisioning.objects.filter(pk=provisioning.pk).update(
+            error=f"{type(error).__name__}: {error}"
+        )
+        raise
+
+    tenant_provisioning_stage_completed.send(
+        sender=TenantProvisioning,
+        provisioning=provisioning,
+        stage=stage,
+        seconds=seconds,
+    )
+    return provisioning
+
+
+def resume_provisioning(provisioning: TenantProvisioning) -> TenantProvisioning:
+    """Runs the remaining stages of a provisioning started by :func:`start_provisioning`.
+
+    Each stage runs in its own transaction, which also records the time it
+    took and advances ``stage``, so a stage is either completed and recorded
+    or not run at all. The provisioning row is locked while a stage runs, and
+    a provisioning that is already being run elsewhere fails to lock instead
+    of running twice.
+
+    Args:
+        provisioning (TenantProvisioning): The provisioning to continue.
+
+    Returns:
+        TenantProvisioning: The completed provisioning.
+
+    Raises:
+        Exception: Anything raised by a stage, after it was recorded on the
+            provisioning row.
+    """
+    with schema_context(get_public_schema_name()):
+        TenantProvisioning.objects.filter(pk=provisioning.pk).update(
+            attempts=F("attempts") + 1
+        )
+        while not provisioning.is_done:
+            provisioning = _run_provisioning_stage(provisioning)
+    return provisioning
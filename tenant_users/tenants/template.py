@@ -0,0 +1,138 @@
+"""Template schema cloned by ``provision_tenant()`` instead of running migrations.
+
+When ``TENANT_USERS_TEMPLATE_SCHEMA`` names a schema, it is kept migrated by
+:func:`refresh_template_schema` (or the ``refresh_template_schema`` management
+command) and new tenant schemas are created by copying it with django-tenants'
+``clone_schema`` database function. The tables, the ``django_migrations`` rows
+and seeded data such as ``auth_permission`` and ``django_content_type`` are
+copied in a single statement on the server.
+
+With ``HAS_MULTI_TYPE_TENANTS``, the setting is a dict mapping each tenant type
+to its template schema.
+
+The template records the fingerprint of the migrations it was migrated with in
+its schema comment. A template that does not match the current migrations,
+for example right after a deploy that added migrations, is never cloned and
+tenants are migrated as usual until the template is refreshed.
+"""
+
+from __future__ import annotations
+
+from django.conf import settings
+from django.db import connection, transaction
+from django_tenants.clone import CloneSchema
+from django_tenants.postgresql_backend.base import is_valid_schema_name
+from django_tenants.utils import has_multi_type_tenants, schema_exists
+
+from tenant_users.tenants.models import SchemaError
+from tenant_users.tenants.pool import migration_fingerprint
+from tenant_users.tenants.utils import migrate_schema
+
+
+def get_template_schema_name(tenant_type: str | None = None) -> str | None:
+    """Returns the template schema for a tenant type, None if cloning is disabled.
+
+    Args:
+        tenant_type (str, optional): Tenant type, used with ``HAS_MULTI_TYPE_TENANTS``.
+    """
+    template = getattr(settings, "TENANT_USERS_TEMPLATE_SCHEMA", None)
+    if isinstance(template, dict):
+        return template.get(tenant_type)
+    return template
+
+
+def _schema_comment(schema_name: str) -> str | None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT obj_description(oid, 'pg_namespace') FROM pg_namespace "
+            "WHERE nspname = %s",
+            [schema_name],
+        )
+        row = cursor.fetchone()
+    return None if row is None else row[0]
+
+
+def _set_schema_comment(schema_name: str, comment: str | None) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"COMMENT ON SCHEMA {connection.ops.quote_name(schema_name)} IS %s",
+            [comment],
+        )
+
+
+def template_schema_is_current(tenant_type: str | None = None) -> bool:
+    """Checks whether the template schema exists and matches the current migrations.
+
+    Args:
+        tenant_type (str, optional): Tenant type, used with ``HAS_MULTI_TYPE_TENANTS``.
+
+    Returns:
+        bool: True if the template can be cloned.
+    """
+    template = get_template_schema_name(tenant_type)
+    if template is None:
+        return False
+    return _schema_comment(template) == migration_fingerprint()
+
+
+def refresh_template_schema(
+    tenant_type: str | None = None, *, verbosity: int = 0
+) -> str:
+    """Creates the template schema if needed and applies pending migrations to it.
+
+    Args:
+        tenant_type (str, optional): Tenant type, used with ``HAS_MULTI_TYPE_TENANTS``.
+        verbosity (int): Verbosity passed to the migrate command.
+
+    Returns:
+        str: The name of the template schema.
+
+    Raises:
+        SchemaError: If no template schema is configured for the tenant type.
+    """
+    template = get_template_schema_name(tenant_type)
+    if template is None:
+        raise SchemaError("TENANT_USERS_TEMPLATE_SCHEMA is not set.")
+    if has_multi_type_tenants() and not tenant_type:
+        raise SchemaError("A tenant type is required to refresh a template schema.")
+    if not is_valid_schema_name(template):
+        raise SchemaError(f"Invalid schema name: {template}")
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE SCHEMA IF NOT EXISTS {connection.ops.quote_name(template)}"
+            )
+        migrate_schema(template, tenant_type=tenant_type, verbosity=verbosity)
+        _set_schema_comment(template, migration_fingerprint())
+    return template
+
+
+def clone_template_schema(schema_name: str, *, tenant_type: str | None = None) -> bool:
+    """Creates ``schema_name`` as a copy of the template schema, if it is current.
+
+    Args:
+        schema_name (str): Name of the schema to create.
+        tenant_type (str, optional): Tenant type, used with ``HAS_MULTI_TYPE_TENANTS``.
+
+    Returns:
+        bool: True if the schema was cloned, False if no template is configured
+        or it does not match the current migrations.
+
+    Raises:
+        SchemaError: If ``schema_name`` is not valid or already exists.
+    """
+    if not is_valid_schema_name(schema_name):
+        raise SchemaError(f"Invalid schema name: {schema_name}")
+    if not template_schema_is_current(tenant_type):
+        return False
+    if schema_exists(schema_name):
+        raise SchemaError(f"Schema {schema_name} already exists.")
+
+    CloneSchema().clone_schema(
+        get_template_schema_name(tenant_type), schema_name, "DATA"
+    )
+    # The clone copies the template's fingerprint, which must not make the
+    # tenant schema look like a template
+    _set_schema_comment(schema_name, None)
+    return True
@@ -0,0 +1,248 @@
+"""Purging of tenants deleted with ``delete_tenant()``.
+
+``delete_tenant()`` only detaches a tenant from its members and records a
+:class:`~tenant_users.tenants.models.TenantTombstone`; the tenant row and its
+schema stay. :func:`purge_tombstoned_tenants` removes the tenants deleted
+more than a given time ago for good, usually through the
+``purge_deleted_tenants`` management command.
+
+Each tenant's schema is renamed and queued with
+:func:`~tenant_users.tenants.schema_drops.queue_schema_drop` and its row
+deleted in one short transaction. The queued schemas are then dropped in
+parallel by :func:`~tenant_users.tenants.schema_drops.drop_queued_schemas`, a
+batch at a time. An interrupted purge can simply be run again; schemas it
+had already queued are dropped by the ``drop_queued_schemas`` command.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.utils import timezone
+from django_tenants.utils import (
+    get_public_schema_name,
+    get_tenant_domain_model,
+    get_tenant_model,
+    schema_context,
+)
+
+from tenant_users.tenants.models import TenantTombstone
+from tenant_users.tenants.schema_drops import drop_queued_schemas, queue_schema_drop
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from datetime import timedelta
+
+    from django.db.models import QuerySet
+
+
+class TombstoneSizing(NamedTuple):
+    """What purging the tombstoned tenants would remove."""
+
+    tenants: int
+    schemas: int
+    size: int
+
+
+def tombstoned_tenants(older_than: timedelta) -> QuerySet[TenantTombstone]:
+    """Returns the tombstones of tenants deleted before ``older_than`` ago.
+
+    Args:
+        older_than (timedelta): Minimum time since the tenants were deleted.
+    """
+    cutoff = timezone.now() - older_than
+    return TenantTombstone.objects.filter(
+        purged_at__isnull=True, deleted_at__lte=cutoff
+    ).order_by("deleted_at", "pk")
+
+
+def untracked_deleted_tenants() -> list[tuple[str, str]]:
+    """Returns the tenants that look deleted but have no tombstone.
+
+    ``delete_tenant()`` transfers a tenant to the public tenant's owner and
+    removes every other member. Tenants other than the public one in that
+    state, without a tombstone, were most likely deleted before tombstones
+    existed. Review them before recording them with
+    :func:`track_untracked_tombstones`.
+
+    Returns:
+        list: The schema name and slug of each tenant, ordered by schema name.
+    """
+    public_schema_name = get_public_schema_name()
+    with schema_context(public_schema_name):
+        tenant_model = get_tenant_model()
+        public_owner_id = (
+            tenant_model.objects.filter(schema_name=public_schema_name)
+            .values_list("owner_id", flat=True)
+            .get()
+        )
+        return list(
+            tenant_model.objects.filter(owner_id=public_owner_id)
+            .exclude(schema_name=public_schema_name)
+            .exclude(user_set__in=get_user_model().objects.exclude(pk=public_owner_id))
+            .exclude(
+                schema_name__in=TenantTombstone.objects.values("schema_name"),
+            )
+            .order_by("schema_name")
+            .values_list("schema_name", "slug")
+        )
+
+
+def track_untracked_tombstones(schema_names: Iterable[str]) -> int:
+    """Records tombstones for tenants deleted before tombstones existed.
+
+    Only tenants still returned by :func:`untracked_deleted_tenants` are
+    recorded. Their deletion time is unknown, so it is set to now.
+
+    Args:
+        schema_names (Iterable[str]): Schema names of the tenants to record,
+            as reviewed from :func:`untracked_deleted_tenants`.
+
+    Returns:
+        int: The number of tombstones created.
+    """
+    schema_names = set(schema_names)
+    with schema_context(get_public_schema_name()):
+        created = TenantTombstone.objects.bulk_create(
+            [
+                TenantTombstone(schema_name=schema_name, slug=slug)
+                for schema_name, slug in untracked_deleted_tenants()
+                if schema_name in schema_names
+            ],
+            ignore_conflicts=True,
+        )
+    return len(created)
+
+
+def size_tombstoned_tenants(
+    older_than: timedelta, *, limit: int | None = None
+) -> TombstoneSizing:
+    """Measures what :func:`purge_tombstoned_tenants` would remove.
+
+    Args:
+        older_than (timedelta): Minimum time since the tenants were deleted.
+        limit (int, optional): Maximum number of tenants to consider.
+
+    Returns:
+        TombstoneSizing: The number of tenants and existing schemas, and the
+        total size in bytes of their tables, indexes and TOAST data.
+    """
+    with schema_context(get_public_schema_name()):
+        schema_names = list(
+            tombstoned_tenants(older_than).values_list("schema_name", flat=True)[:limit]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(DISTINCT n.oid), "
+                "coalesce(sum(pg_total_relation_size(c.oid)), 0) "
+                "FROM pg_namespace n "
+                "LEFT JOIN pg_class c "
+                "ON c.relnamespace = n.oid AND c.relkind IN ('r', 'm') "
+                "WHERE n.nspname = ANY(%s)",
+                [schema_names],
+            )
+            schemas, size = cursor.fetchone()
+    return TombstoneSizing(len(schema_names), schemas, int(size))
+
+
+def _remove_tenant(tombstone: TenantTombstone, *, archive: bool) -> str | None:
+    """Queue the tenant's schema and delete its rows, returning the queued name."""
+    tenant_model = get_tenant_model()
+    with transaction.atomic():
+        tenant = (
+            tenant_model.objects.select_for_update()
+            .filter(schema_name=tombstone.schema_name)
+            .first()
+        )
+        queued = None
+        if tenant is not None:
+            tombstone.domains = list(
+                get_tenant_domain_model()
+                .objects.filter(tenant=tenant)
+                .values_list("domain", flat=True)
+            )
+            queued = queue_schema_drop(tenant)
+            # The schema was renamed, so only the rows are deleted here
+            tenant.delete(force_drop=True)
+
+        if archive:
+            tombstone.purged_at = timezone.now()
+            tombstone.save(update_fields=["domains", "purged_at"])
+        else:
+            tombstone.delete()
+    return queued.schema_name if queued is not None else None
+
+
+def purge_tombstoned_tenants(  # noqa: PLR0913
+    older_than: timedelta,
+    *,
+    archive: bool = False,
+    limit: int | None = None,
+    batch_size: int = 100,
+    max_workers: int = 1,
+    pause: float = 0,
+    lock_timeout: float | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[list[str], dict[str, Exception]]:
+    """Removes the tenants deleted before ``older_than`` ago, oldest first.
+
+    Works through the tombstones in batches. For each batch, the tenants'
+    schemas are renamed and queued and their rows deleted, one tenant per
+    transaction, then the queued schemas are dropped with
+    :func:`~tenant_users.tenants.schema_drops.drop_queued_schemas`.
+
+    Args:
+        older_than (timedelta): Minimum time since the tenants were deleted.
+        archive (bool): Keep the tombstones, with ``purged_at`` set and the
+            tenants' domains recorded, instead of deleting them.
+        limit (int, optional): Maximum number of tenants to purge.
+        batch_size (int): Number of tenants removed before their schemas are
+            dropped.
+        max_workers (int): Number of schemas dropped at the same time.
+        pause (float): Seconds each worker waits after dropping a schema.
+        lock_timeout (float, optional): Seconds to wait for a lock before
+            giving up on dropping a schema, which stays queued.
+        progress (Callable, optional): Called after each batch with the number
+            of processed and total tenants.
+
+    Returns:
+        tuple: A tuple containing:
+            - list: The schema names of the purged tenants.
+            - dict: The exception raised for each tenant that could not be
+              purged, keyed by schema name. A tenant whose schema could not be
+              dropped is already deleted, and its schema stays queued.
+    """
+    with schema_context(get_public_schema_name()):
+        tombstones = list(tombstoned_tenants(older_than)[:limit])
+        purged: list[str] = []
+        errors: dict[str, Exception] = {}
+
+        for start in range(0, len(tombstones), batch_size):
+            queued: dict[str, str] = {}
+            for tombstone in tombstones[start : start + batch_size]:
+                try:
+                    queued_name = _remove_tenant(tombstone, archive=archive)
+                except Exception as error:  # noqa: BLE001
+                    errors[tombstone.schema_name] = error
+                    continue
+                if queued_name is None:
+                    purged.append(tombstone.schema_name)
+                else:
+                    queued[queued_name] = tombstone.schema_name
+
+            if queued:
+                dropped, drop_errors = drop_queued_schemas(
+                    schema_names=queued,
+                    max_workers=max_workers,
+                    pause=pause,
+                    lock_timeout=lock_timeout,
+                )
+                purged.extend(queued[name] for name in dropped)
+                errors.update(
+                    (queued[name], error) for name, error in drop_errors.items()
+                )
+            if progress is not None:
+                progress(min(start + batch_size, len(tombstones)), len(tombstones))
+    return purged, errors
@@ -1,21 +1,39 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+import queue
+import threading
 import warnings
-from typing import Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable
 
+import django
 from django.contrib.auth import get_user_model
-from django.db import connection, transaction
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection, connections, transaction
+from django.db.migrations.recorder import MigrationRecorder
 from django_tenants.utils import (
     get_multi_type_database_field_name,
     get_public_schema_name,
+    get_tenant_base_migrate_command_class,
     get_tenant_domain_model,
     get_tenant_model,
     get_tenant_types,
     has_multi_type_tenants,
+    schema_context,
+    tenant_context,
 )
 
+from tenant_users.constants import DEFAULT_BATCH_SIZE
+from tenant_users.permissions.storage import get_tenant_perms_queryset
+from tenant_users.permissions.utils import public_membership_is_implicit
 from tenant_users.tenants.models import ExistsError, SchemaError, TenantBase
 
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
 AnyTenant = TenantBase
 
 
@@ -142,3 +160,202 @@ def create_public_tenant(  # noqa: PLR0913
     profile.save(update_fields=["password"])
 
     return public_tenant, domain, profile
+
+
+def migrate_schema(
+    schema_name: str, *, tenant_type: str | None = None, verbosity: int = 0
+) -> None:
+    """Applies the tenant migrations to an existing schema without a tenant.
+
+    Follows the same steps as django-tenants' migration executors, for schemas
+    that ``migrate_schemas`` does not know about, such as pooled or template
+    schemas. The connection is set back to the public schema afterwards.
+
+    Args:
+        schema_name (str): Name of the schema, which must already exist.
+        tenant_type (str, optional): Tenant type whose apps are migrated, used
+            with ``HAS_MULTI_TYPE_TENANTS``.
+        verbosity (int): Verbosity of the ``migrate`` command.
+    """
+    # The migrations table must be created in the schema itself, not found
+    # in public
+    connection.set_schema(  # type: ignore[attr-defined]
+        schema_name, tenant_type=tenant_type or None, include_public=False
+    )
+    MigrationRecorder(connection).ensure_schema()
+    connection.set_schema(schema_name, tenant_type=tenant_type or None)  # type: ignore[attr-defined]
+    try:
+        call_command(
+            get_tenant_base_migrate_command_class()(),
+            interactive=False,
+            verbosity=verbosity,
+        )
+    finally:
+        connection.set_schema_to_public()  # type: ignore[attr-defined]
+
+
+def _run_in_tenant(
+    func: Callable[[AnyTenant], Any], tenant: AnyTenant
+) -> tuple[str, Any, Exception | None]:
+    """Call func inside the tenant's schema, capturing any exception."""
+    try:
+        with tenant_context(tenant):
+            return tenant.schema_name, func(tenant), None
+    except Exception as exc:  # noqa: BLE001
+        return tenant.schema_name, None, exc
+
+
+def _run_in_threads(
+    func: Callable[[AnyTenant], Any], tenants: list[AnyTenant], max_workers: int
+) -> list[tuple[str, Any, Exception | None]]:
+    """Run func for each tenant on a pool of long lived worker threads."""
+    outcomes: list[tuple[str, Any, Exception | None]] = []
+    pending: queue.SimpleQueue[AnyTenant] = queue.SimpleQueue()
+    for tenant in tenants:
+        pending.put(tenant)
+
+    def worker() -> None:
+        try:
+            while True:
+                try:
+                    tenant = pending.get_nowait()
+                except queue.Empty:
+                    return
+                outcomes.append(_run_in_tenant(func, tenant))
+        finally:
+            # Each thread opened its own connections, don't leak them
+            connections.close_all()
+
+    threads = [threading.Thread(target=worker) for _ in range(max_workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return outcomes
+
+
+def _run_in_processes(
+    func: Callable[[AnyTenant], Any], tenants: list[AnyTenant], max_workers: int
+) -> list[tuple[str, Any, Exception | None]]:
+    """Run func for each tenant on a pool of spawned worker processes."""
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=django.setup,
+    ) as executor:
+        return list(executor.map(_run_in_tenant, [func] * len(tenants), tenants))
+
+
+def run_in_tenants(
+    func: Callable[[AnyTenant], Any],
+    tenants: Iterable[AnyTenant],
+    *,
+    max_workers: int | None = None,
+    use_processes: bool = False,
+) -> tuple[dict[str, Any], dict[str, Exception]]:
+    """Runs a callable inside the schema of each tenant, in parallel.
+
+    The callable receives the tenant and runs within its ``tenant_context``.
+    Work is spread over a pool of threads, or processes when
+    ``use_processes`` is True, and every worker keeps its own database
+    connection for all the tenants it handles. Exceptions raised for one
+    tenant are collected and do not stop the others.
+
+    Threads fit callables that mostly wait on the database. Processes avoid
+    the GIL for CPU heavy callables, but they are started with the ``spawn``
+    method and set up Django themselves, so ``func`` must be importable at
+    module level and the tenants picklable.
+
+    Args:
+        func (Callable): Called with each tenant while its schema is active.
+        tenants (Iterable): The tenants to run the callable for.
+        max_workers (int, optional): Number of workers. Defaults to the number
+            of CPUs plus four, capped at 32. A value of 1 runs serially on the
+            current connection.
+        use_processes (bool): If True, use worker processes instead of threads.
+
+    Returns:
+        tuple: A tuple containing:
+            - dict: The return value of the callable, keyed by schema name.
+            - dict: The exception raised by the callable, keyed by schema name.
+    """
+    tenants = list(tenants)
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    max_workers = max(1, min(max_workers, len(tenants)))
+
+    if max_workers == 1:
+        outcomes = [_run_in_tenant(func, tenant) for tenant in tenants]
+    elif use_processes:
+        outcomes = _run_in_processes(func, tenants, max_workers)
+    else:
+        outcomes = _run_in_threads(func, tenants, max_workers)
+
+    results: dict[str, Any] = {}
+    errors: dict[str, Exception] = {}
+    for schema_name, result, error in outcomes:
+        if error is None:
+            results[schema_name] = result
+        else:
+            errors[schema_name] = error
+    return results, errors
+
+
+def prune_public_memberships(
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Callable[[int], None] | None = None,
+) -> int:
+    """Removes public tenant memberships that only hold default permissions.
+
+    Once ``TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP`` is enabled, rows for
+    users without staff or superuser status, groups or user permissions in
+    the public schema are redundant. They are deleted, with the users' links
+    to the public tenant, a batch at a time, each batch in its own
+    transaction. The public tenant's owner is kept.
+
+    Args:
+        batch_size (int): Number of memberships removed per transaction.
+        progress (Callable, optional): Called after each batch with the
+            number of memberships removed so far.
+
+    Returns:
+        int: The number of memberships removed.
+
+    Raises:
+        ImproperlyConfigured: If public tenant membership is not implicit.
+    """
+    if not public_membership_is_implicit():
+        raise ImproperlyConfigured(
+            "TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP must be enabled to prune "
+            "public tenant memberships"
+        )
+
+    with schema_context(get_public_schema_name()):
+        public_tenant = get_tenant_model().objects.get(
+            schema_name=get_public_schema_name()
+        )
+        tenant_perms = get_tenant_perms_queryset(public_tenant.schema_name)
+        default_perms = (
+            tenant_perms.filter(
+                is_staff=False,
+                is_superuser=False,
+                groups=None,
+                user_permissions=None,
+            )
+            .exclude(profile_id=public_tenant.owner_id)
+            .order_by("pk")
+        )
+
+        removed = 0
+        # Keyset pagination keeps each batch query cheap on large tables
+        while chunk := list(default_perms.values_list("pk", "profile_id")[:batch_size]):
+            pks, profile_ids = zip(*chunk)
+            with transaction.atomic():
+                tenant_perms.filter(pk__in=pks).delete()
+                public_tenant.user_set.remove(*profile_ids)
+            removed += len(chunk)
+            default_perms = default_perms.filter(pk__gt=pks[-1])
+            if progress is not None:
+                progress(removed)
+    return removed
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+from datetime import timedelta
 from io import StringIO
 from unittest.mock import patch
 
-from django.core.management import call_command
+import pytest
+from django.core.management import CommandError, call_command
 
-from tenant_users.tenants.models import ExistsError
+from tenant_users.tenants.models import ExistsError, TenantProvisioning
+from tenant_users.tenants.roles import RoleIndexDiff
+from tenant_users.tenants.tombstones import TombstoneSizing
 
 DOMAIN_URL = "example.net"
 OWNER_EMAIL = "example@example.net"
@@ -50,3 +54,176 @@ def test_create_public_tenant_command_failure():
     out_value = out.getvalue()
     assert ERROR_MSG in out_value
     assert "Error creating public tenant" in out_value
+
+
+def test_fill_schema_pool_command():
+    out = StringIO()
+
+    with patch(
+        "tenant_users.tenants.management.commands.fill_schema_pool.fill_schema_pool",
+        return_value=3,
+    ) as mocked_fill:
+        call_command("fill_schema_pool", stdout=out, size=3)
+
+    mocked_fill.assert_called_once_with(3, tenant_type=None, verbosity=0)
+    assert "Created 3 schemas" in out.getvalue()
+
+
+def test_refresh_template_schema_command():
+    out = StringIO()
+
+    with patch(
+        "tenant_users.tenants.management.commands.refresh_template_schema.refresh_template_schema",
+        return_value="tenant_template",
+    ) as mocked_refresh:
+        call_command("refresh_template_schema", stdout=out)
+
+    mocked_refresh.assert_called_once_with(None, verbosity=0)
+    assert "Template schema tenant_template is up to date" in out.getvalue()
+
+
+def test_resume_provisioning_command(tenant_user):
+    out = StringIO()
+    provisioning = TenantProvisioning.objects.create(
+        name="Stuck",
+        slug="stuck",
+        domain="stuck.example.net",
+        schema_name="stuck",
+        owner=tenant_user,
+        stage=TenantProvisioning.Stage.MIGRATE,
+        error="DatabaseError: Migration failure",
+    )
+
+    call_command("resume_provisioning", "--list", "--older-than=0", stdout=out)
+    assert "stuck (stuck.example.net): migrate" in out.getvalue()
+    assert "DatabaseError: Migration failure" in out.getvalue()
+
+    with patch(
+        "tenant_users.tenants.management.commands.resume_provisioning.resume_provisioning"
+    ) as mocked_resume:
+        call_command("resume_provisioning", stdout=out)
+        mocked_resume.assert_not_called()
+
+        call_command("resume_provisioning", schema_name="stuck", stdout=out)
+        mocked_resume.assert_called_once_with(provisioning)
+    assert "Provisioned stuck" in out.getvalue()
+
+
+def test_drop_queued_schemas_command():
+    out = StringIO()
+
+    def drop(**kwargs):
+        kwargs["progress"](1, 2)
+        return ["dropped_a"], {"dropped_b": Exception("lock timeout")}
+
+    with patch(
+        "tenant_users.tenants.management.commands.drop_queued_schemas.drop_queued_schemas",
+        side_effect=drop,
+    ) as mocked_drop:
+        call_command("drop_queued_schemas", "--workers=2", stdout=out)
+
+    mocked_drop.assert_called_once()
+    assert mocked_drop.call_args.kwargs["max_workers"] == 2
+    assert "Processed 1/2 queued schemas" in out.getvalue()
+    assert "Error dropping dropped_b: lock timeout" in out.getvalue()
+    assert "Dropped 1 schemas" in out.getvalue()
+
+
+def test_purge_deleted_tenants_command():
+    out = StringIO()
+    command = "tenant_users.tenants.management.commands.purge_deleted_tenants"
+
+    with patch(
+        f"{command}.size_tombstoned_tenants",
+        return_value=TombstoneSizing(2, 1, 3 * 1024**2),
+    ) as mocked_size:
+        call_command("purge_deleted_tenants", "--dry-run", "--days=7", stdout=out)
+
+    mocked_size.assert_called_once_with(timedelta(days=7), limit=None)
+    assert "Would purge 2 tenants with 1 schemas, freeing 3.0 MB" in out.getvalue()
+
+    with patch(
+        f"{command}.purge_tombstoned_tenants",
+        return_value=(["one"], {"two": Exception("lock timeout")}),
+    ) as mocked_purge:
+        call_command("purge_deleted_tenants", "--archive", stdout=out)
+
+    assert mocked_purge.call_args.args == (timedelta(days=30),)
+    assert mocked_purge.call_args.kwargs["archive"]
+    assert "Error purging two: lock timeout" in out.getvalue()
+    assert "Purged 1 tenants" in out.getvalue()
+
+
+def test_purge_deleted_tenants_track_untracked():
+    """Tests that untracked deleted tenants are listed and recorded once confirmed."""
+    out = StringIO()
+    command = "tenant_users.tenants.management.commands.purge_deleted_tenants"
+
+    with (
+        patch(
+            f"{command}.untracked_deleted_tenants",
+            return_value=[("old_schema", "old")],
+        ),
+        patch(f"{command}.track_untracked_tombstones", return_value=1) as mocked_track,
+        patch(f"{command}.purge_tombstoned_tenants", return_value=([], {})),
+        patch(
+            f"{command}.size_tombstoned_tenants", return_value=TombstoneSizing(0, 0, 0)
+        ),
+    ):
+        call_command(
+            "purge_deleted_tenants", "--track-untracked", "--dry-run", stdout=out
+        )
+        assert "Untracked deleted tenant old (old_schema)" in out.getvalue()
+        assert "Would record 1 untracked deleted tenants" in out.getvalue()
+
+        with patch("builtins.input", return_value="no"):
+            call_command("purge_deleted_tenants", "--track-untracked", stdout=out)
+        assert "were not recorded" in out.getvalue()
+        mocked_track.assert_not_called()
+
+        with patch("builtins.input", return_value="yes"):
+            call_command("purge_deleted_tenants", "--track-untracked", stdout=out)
+        assert list(mocked_track.call_args.args[0]) == ["old_schema"]
+
+        call_command(
+            "purge_deleted_tenants", "--track-untracked", "--no-input", stdout=out
+        )
+        assert mocked_track.call_count == 2
+        assert "Recorded 1 untracked deleted tenants" in out.getvalue()
+
+
+def test_prune_public_memberships_command(settings):
+    out = StringIO()
+
+    with pytest.raises(CommandError, match="must be enabled"):
+        call_command("prune_public_memberships", stdout=out)
+
+    settings.TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP = True
+    with patch(
+        "tenant_users.tenants.management.commands.prune_public_memberships.prune_public_memberships",
+        return_value=5,
+    ) as mocked_prune:
+        call_command("prune_public_memberships", "--batch-size=10", stdout=out)
+
+    assert mocked_prune.call_args.kwargs["batch_size"] == 10
+    assert "Pruned 5 public tenant memberships" in out.getvalue()
+
+
+def test_rebuild_role_index_command(public_tenant):
+    out = StringIO()
+    command = "tenant_users.tenants.management.commands.rebuild_role_index"
+
+    with patch(
+        f"{command}.rebuild_role_index", return_value=RoleIndexDiff(1, 0, 2)
+    ) as mocked_rebuild:
+        call_command("rebuild_role_index", stdout=out)
+
+    assert mocked_rebuild.call_args.args == (public_tenant,)
+    assert f"{public_tenant.schema_name}: 1 missing, 0 stale, 2 extra" in out.getvalue()
+    assert "Rebuilt the role index of 1 tenants, 1 differed" in out.getvalue()
+
+    with (
+        patch(f"{command}.verify_role_index", return_value=RoleIndexDiff(0, 1, 0)),
+        pytest.raises(CommandError, match="differs from the permissions of 1 of 1"),
+    ):
+        call_command("rebuild_role_index", "--verify", stdout=out)
@@ -1,11 +1,33 @@
+import time
 from http import HTTPStatus
+from io import StringIO
+from unittest.mock import patch
 
 import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
 from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.http import Http404, HttpResponse
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import schema_exists
 
-from tenant_users.tenants.middleware import TenantAccessMiddleware
+from django_test_app.users.models import TenantUser
+from tenant_users.permissions.functional import current_schema_name
+from tenant_users.permissions.models import UserTenantPermissions
+from tenant_users.tenants.cache import LocalMembershipCache, get_membership_cache
+from tenant_users.tenants.lazy import (
+    forget_materialized_schemas,
+    get_migration_executor,
+    is_schema_pending,
+    materialize_schema,
+    pending_schema_names,
+)
+from tenant_users.tenants.middleware import LazySchemaMiddleware, TenantAccessMiddleware
+from tenant_users.tenants.models import SchemaError, TenantProvisioning
+from tenant_users.tenants.tasks import provision_tenant
 
 
 class NoOpCallable:
@@ -15,6 +37,11 @@ class NoOpCallable:
         return HttpResponse(status=HTTPStatus.ACCEPTED)
 
 
+async def async_no_op(request):
+    """A no-operation async view."""
+    return HttpResponse(status=HTTPStatus.ACCEPTED)
+
+
 @pytest.mark.django_db
 class TestTenantAccessMiddleware:
     """Tests for the TenantAccessMiddleware class."""
@@ -99,3 +126,212 @@ class TestTenantAccessMiddleware:
 
         assert str(err_info.value) == custom_message
         assert self.tenant not in tenant_user.tenants.all()
+
+    @pytest.mark.parametrize("backend", ["local", "default"])
+    def test_membership_cache(self, settings, tenant_user, backend):
+        """Test memberships are served from the cache and invalidated.
+
+        Args:
+            settings (Settings): Pytest fixture to temporarily set Django settings.
+            tenant_user (User): The tenant user to be tested.
+            backend (str): The membership cache to use.
+        """
+        settings.TENANT_USERS_MEMBERSHIP_CACHE = backend
+        if backend == "local":
+            get_membership_cache().clear()
+        else:
+            cache.clear()
+
+        with pytest.raises(Http404):
+            self.middleware(self.request)
+
+        # Adding the user drops the cached memberships
+        self.tenant.add_user(tenant_user)
+        assert self.middleware(self.request).status_code == HTTPStatus.ACCEPTED
+
+        with CaptureQueriesContext(connection) as queries:
+            assert self.middleware(self.request).status_code == HTTPStatus.ACCEPTED
+        assert len(queries) == 0
+
+        self.tenant.remove_user(tenant_user)
+        with pytest.raises(Http404):
+            self.middleware(self.request)
+
+    @pytest.mark.parametrize("backend", [None, "local", "default"])
+    def test_async_authenticated_user(self, settings, tenant_user, backend):
+        """Test the async path allows members and denies other users.
+
+        Args:
+            settings (Settings): Pytest fixture to temporarily set Django settings.
+            tenant_user (User): The tenant user to be tested.
+            backend (str): The membership cache to use.
+        """
+        settings.TENANT_USERS_MEMBERSHIP_CACHE = backend
+        if backend == "local":
+            get_membership_cache().clear()
+        elif backend:
+            cache.clear()
+        middleware = TenantAccessMiddleware(async_no_op)
+        assert iscoroutinefunction(middleware)
+
+        with pytest.raises(Http404):
+            async_to_sync(middleware)(self.request)
+
+        self.tenant.add_user(tenant_user)
+        response = async_to_sync(middleware)(self.request)
+        assert response.status_code == HTTPStatus.ACCEPTED
+
+    def test_async_uses_auser(self):
+        """Test the async path loads the user with request.auser()."""
+        self.request.user = None
+
+        async def auser():
+            return AnonymousUser()
+
+        self.request.auser = auser
+        middleware = TenantAccessMiddleware(async_no_op)
+
+        response = async_to_sync(middleware)(self.request)
+        assert response.status_code == HTTPStatus.ACCEPTED
+
+    def test_sets_current_schema_name(self, tenant_user):
+        """Test the tenant's schema is exposed to the view via a context variable.
+
+        Args:
+            tenant_user (User): The tenant user to be tested.
+        """
+        self.tenant.add_user(tenant_user)
+        seen = []
+
+        def view(request):
+            seen.append(current_schema_name.get())
+            return HttpResponse(status=HTTPStatus.ACCEPTED)
+
+        async def async_view(request):
+            return view(request)
+
+        TenantAccessMiddleware(view)(self.request)
+        async_to_sync(TenantAccessMiddleware(async_view))(self.request)
+
+        assert seen == [self.tenant.schema_name, self.tenant.schema_name]
+        assert current_schema_name.get() is None
+
+
+def test_local_membership_cache_evicts_and_expires(monkeypatch):
+    """Test the local cache evicts least recently used users and expires entries."""
+    local_cache = LocalMembershipCache(max_size=2, timeout=10)
+    local_cache.set(1, frozenset({1}))
+    local_cache.set(2, frozenset({2}))
+    assert local_cache.get(1) == frozenset({1})
+
+    local_cache.set(3, frozenset({3}))
+    assert local_cache.get(2) is None
+    assert local_cache.get(1) == frozenset({1})
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+    assert local_cache.get(3) is None
+
+
+@pytest.mark.django_db
+class TestLazySchemaMiddleware:
+    """Tests for the LazySchemaMiddleware class."""
+
+    @pytest.fixture(autouse=True)
+    def _setup(self, tenant_user):
+        self.tenant, _ = provision_tenant(
+            "Lazy", "lazy", tenant_user, schema_name="lazy", lazy_schema=True
+        )
+        self.tenant_user = tenant_user
+        self.request = RequestFactory().get("/fake-url/")
+        self.request.tenant = self.tenant  # type: ignore[attr-defined]
+        self.request.user = tenant_user
+        yield
+        forget_materialized_schemas()
+
+    def test_first_request_materializes_schema(self):
+        """Test the schema is created on the first request, and only then."""
+        assert self.tenant in self.tenant_user.tenants.all()
+        assert not schema_exists("lazy")
+        assert is_schema_pending("lazy")
+
+        response = LazySchemaMiddleware(NoOpCallable())(self.request)
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert schema_exists("lazy")
+        assert TenantProvisioning.objects.get(schema_name="lazy").is_done
+        with self.tenant:
+            assert self.tenant_user.tenant_perms.is_superuser
+
+        # Later requests only check the process local state
+        with CaptureQueriesContext(connection) as queries:
+            LazySchemaMiddleware(NoOpCallable())(self.request)
+        assert len(queries) == 0
+        assert not materialize_schema("lazy")
+
+    def test_async_first_request_materializes_schema(self):
+        """Test the async path materializes the schema too."""
+        middleware = LazySchemaMiddleware(async_no_op)
+        assert iscoroutinefunction(middleware)
+
+        response = async_to_sync(middleware)(self.request)
+
+        assert response.status_code == HTTPStatus.ACCEPTED
+        assert schema_exists("lazy")
+
+        # Later requests stay on the event loop
+        with patch(
+            "tenant_users.tenants.middleware.sync_to_async",
+            side_effect=AssertionError("Unexpected thread"),
+        ):
+            response = async_to_sync(middleware)(self.request)
+        assert response.status_code == HTTPStatus.ACCEPTED
+
+    def test_tenant_methods_materialize_schema(self):
+        """Test adding a user to a pending tenant writes to its own schema."""
+        member = TenantUser.objects.create_user(email="member@test.com")
+
+        self.tenant.add_user(member, is_staff=True)
+
+        assert schema_exists("lazy")
+        assert TenantProvisioning.objects.get(schema_name="lazy").is_done
+        with self.tenant:
+            assert member.tenant_perms.is_staff
+            assert self.tenant_user.tenant_perms.is_superuser
+        # The member's public permissions are left alone
+        assert not UserTenantPermissions.objects.get(profile=member).is_staff
+
+    def test_materialize_schemas_command(self):
+        """Test the warm-up command materializes pending schemas."""
+        out = StringIO()
+        call_command("materialize_schemas", stdout=out)
+
+        assert "Materialized lazy (1/1)" in out.getvalue()
+        assert schema_exists("lazy")
+        assert pending_schema_names() == []
+
+    def test_migrate_schemas_skips_pending_schema(self):
+        """Test migrating all tenants leaves the pending schema to materializing."""
+        with patch(
+            "django_tenants.management.commands.migrate_schemas.GET_EXECUTOR_FUNCTION",
+            get_migration_executor,
+        ):
+            call_command("migrate_schemas", tenant=True, interactive=False, verbosity=0)
+        assert not schema_exists("lazy")
+        assert is_schema_pending("lazy")
+
+        assert materialize_schema("lazy")
+        with self.tenant:
+            assert self.tenant_user.tenant_perms.is_superuser
+
+    def test_materialize_existing_schema(self):
+        """Test a schema created before its stage was recorded is not prepared again."""
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE SCHEMA lazy")
+
+        with patch(
+            "tenant_users.tenants.tasks.clone_template_schema",
+            side_effect=SchemaError("Schema already exists"),
+        ):
+            assert materialize_schema("lazy")
+        assert TenantProvisioning.objects.get(schema_name="lazy").is_done
@@ -1,3 +1,5 @@
+from unittest.mock import patch
+
 import pytest
 from django.contrib.auth import get_user_model
 from django_tenants.utils import get_tenant_model, schema_context, tenant_context
@@ -130,3 +132,117 @@ def test_delete_user_removes_permissions_from_all_tenants(test_tenants):
         assert not UserTenantPermissions.objects.filter(
             profile_id=target_user.pk
         ).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_users(public_tenant, tenant_user):
+    """Ensure bulk_create_users() creates, reactivates and reports per row."""
+    TenantUser.objects.delete_user(tenant_user)
+
+    results = TenantUser.objects.bulk_create_users(
+        [
+            {"email": "one@test.com", "password": "secret", "name": "One"},
+            {"email": "two@test.com", "is_staff": True, "is_verified": True},
+            {"email": tenant_user.email, "password": "back"},
+            {"email": "one@TEST.com"},
+            {"email": public_tenant.owner.email},
+            {"password": "no-email"},
+        ],
+        max_workers=1,
+    )
+
+    one, two, reactivated, duplicate, existing, missing = results
+    assert one.user.name == "One"
+    assert one.user.check_password("secret")
+    assert not two.user.has_usable_password()
+    assert two.user.is_verified
+    assert two.user.tenant_perms.is_staff
+    assert not one.user.tenant_perms.is_staff
+    assert reactivated.reactivated
+    assert reactivated.user.pk == tenant_user.pk
+    assert isinstance(duplicate.error, models.ExistsError)
+    assert isinstance(existing.error, models.ExistsError)
+    assert isinstance(missing.error, ValueError)
+
+    for result in (one, two, reactivated):
+        assert result.error is None
+        result.user.refresh_from_db()
+        assert result.user.is_active
+        assert result.user.tenants.filter(pk=public_tenant.pk).exists()
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_hashes_in_process_pool():
+    """Ensure passwords hashed by worker processes are usable."""
+    results = TenantUser.objects.bulk_create_users(
+        [{"email": f"user{idx}@test.com", "password": f"pw{idx}"} for idx in range(4)],
+        max_workers=2,
+    )
+
+    for idx, result in enumerate(results):
+        assert result.user.check_password(f"pw{idx}")
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_hashes_in_process_by_default():
+    """Ensure no process pool is started unless max_workers is given."""
+    with patch(
+        "tenant_users.tenants.models.ProcessPoolExecutor",
+        side_effect=AssertionError("Unexpected process pool"),
+    ):
+        results = TenantUser.objects.bulk_create_users(
+            [
+                {"email": f"user{idx}@test.com", "password": f"pw{idx}"}
+                for idx in range(3)
+            ]
+        )
+
+    assert results[2].user.check_password("pw2")
+
+
+@pytest.mark.django_db
+def test_bulk_create_users_in_tenant_schema(test_tenants):
+    """Ensures error is raised when bulk creation isn't in public schema."""
+    with (
+        schema_context(test_tenants.first().schema_name),
+        pytest.raises(models.SchemaError, match="Schema must be public"),
+    ):
+        TenantUser.objects.bulk_create_users([{"email": "user@schema.com"}])
+
+
+@pytest.mark.django_db
+def test_delete_user_resumes_after_interruption(test_tenants, create_tenant):
+    """Ensure an interrupted delete_user() can be resumed from its checkpoint."""
+    user = TenantUser.objects.create_user("resume@test.com")
+    for tenant in test_tenants:
+        tenant.add_user(user)
+    owned = create_tenant(user, "owned")
+
+    remove_user = TenantModel.remove_user
+    calls = []
+
+    def flaky_remove_user(tenant, user_obj):
+        calls.append(tenant)
+        if len(calls) == 2:
+            raise RuntimeError("Interrupted")
+        remove_user(tenant, user_obj)
+
+    with (
+        patch.object(TenantModel, "remove_user", flaky_remove_user),
+        pytest.raises(RuntimeError, match="Interrupted"),
+    ):
+        TenantUser.objects.delete_user(user, chunk_size=1)
+
+    checkpoint = models.UserDeletionCheckpoint.objects.get(profile=user)
+    assert checkpoint.tenants_processed == 1
+    user.refresh_from_db()
+    assert user.is_active
+
+    TenantUser.objects.delete_user(user, chunk_size=1)
+
+    user.refresh_from_db()
+    owned.refresh_from_db()
+    assert not user.is_active
+    assert not user.tenants.exists()
+    assert owned.owner_id != user.pk
+    assert not models.UserDeletionCheckpoint.objects.filter(profile=user).exists()
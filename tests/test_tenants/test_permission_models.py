@@ -1,5 +1,15 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import tenant_context
+
 from django_test_app.companies.models import Company
 from django_test_app.users.models import TenantUser
+from tenant_users.constants import TENANT_CACHE_NAME
+from tenant_users.permissions.functional import current_schema_name
 from tenant_users.permissions.models import UserTenantPermissions
 
 
@@ -115,3 +125,188 @@ def test_user_tenant_permissions_has_timestamp_fields(
     assert hasattr(user_perms, "modified_at")
     assert user_perms.created_at is not None
     assert user_perms.modified_at is not None
+
+
+@pytest.fixture
+def perms_cache(settings):
+    settings.TENANT_USERS_PERMS_CACHE = "default"
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.usefixtures("perms_cache")
+def test_shared_perms_cache_answers_without_queries(tenant_user: TenantUser) -> None:
+    """Test permission checks on a fresh instance are served from the cache."""
+    group = Group.objects.create(name="editors")
+    group.permissions.add(Permission.objects.get(codename="add_company"))
+    tenant_user.tenant_perms.groups.add(group)
+
+    assert TenantUser.objects.get(pk=tenant_user.pk).has_perm("companies.add_company")
+
+    fresh_user = TenantUser.objects.get(pk=tenant_user.pk)
+    with CaptureQueriesContext(connection) as queries:
+        assert fresh_user.has_perm("companies.add_company")
+        assert not fresh_user.is_staff
+        assert fresh_user.tenant_perms.profile is fresh_user
+    assert len(queries) == 0
+
+
+@pytest.mark.usefixtures("perms_cache")
+def test_shared_perms_cache_invalidation(
+    public_tenant: Company, tenant_user: TenantUser
+) -> None:
+    """Test cached permissions are dropped when they change."""
+
+    def fresh():
+        return TenantUser.objects.get(pk=tenant_user.pk)
+
+    group = Group.objects.create(name="editors")
+    assert not fresh().has_perm("companies.add_company")
+
+    # Group membership of the user
+    tenant_user.tenant_perms.groups.add(group)
+    assert not fresh().has_perm("companies.add_company")
+
+    # Permissions of a group
+    group.permissions.add(Permission.objects.get(codename="add_company"))
+    assert fresh().has_perm("companies.add_company")
+
+    # The permissions row itself
+    perms = fresh().tenant_perms
+    perms.is_staff = True
+    perms.save()
+    assert fresh().is_staff
+
+    # Tenant membership
+    public_tenant.remove_user(tenant_user)
+    assert not fresh().has_tenant_permissions()
+    public_tenant.add_user(tenant_user)
+    assert fresh().has_tenant_permissions()
+
+
+def test_non_member_permissions_are_cached(
+    public_tenant: Company, tenant_user: TenantUser
+) -> None:
+    """Test a missing permissions row is only queried once."""
+    public_tenant.remove_user(tenant_user)
+
+    with CaptureQueriesContext(connection) as queries:
+        assert not tenant_user.has_tenant_permissions()
+    assert queries
+
+    with CaptureQueriesContext(connection) as queries:
+        assert not tenant_user.has_perm("companies.add_company")
+        assert not tenant_user.has_perms(["companies.add_company"])
+        assert not tenant_user.has_module_perms("companies")
+        assert tenant_user.get_all_permissions() == set()
+        with pytest.raises(UserTenantPermissions.DoesNotExist):
+            _ = tenant_user.tenant_perms
+    assert len(queries) == 0
+
+    public_tenant.add_user(tenant_user)
+    assert tenant_user.has_tenant_permissions()
+
+
+@pytest.mark.usefixtures("perms_cache")
+def test_shared_perms_cache_non_member(
+    public_tenant: Company, tenant_user: TenantUser
+) -> None:
+    """Test a missing permissions row is cached across instances."""
+    public_tenant.remove_user(tenant_user)
+    assert not TenantUser.objects.get(pk=tenant_user.pk).has_tenant_permissions()
+
+    fresh_user = TenantUser.objects.get(pk=tenant_user.pk)
+    with CaptureQueriesContext(connection) as queries:
+        assert not fresh_user.has_perm("companies.add_company")
+    assert len(queries) == 0
+
+    public_tenant.add_user(tenant_user)
+    assert TenantUser.objects.get(pk=tenant_user.pk).has_tenant_permissions()
+
+
+def test_async_permissions_member(tenant_user: TenantUser) -> None:
+    """Test the async permission API for a member of the tenant."""
+    group = Group.objects.create(name="editors")
+    group.permissions.add(Permission.objects.get(codename="add_company"))
+    tenant_user.tenant_perms.groups.add(group)
+    user = TenantUser.objects.get(pk=tenant_user.pk)
+
+    perms = async_to_sync(user.aget_tenant_perms)()
+    assert async_to_sync(user.ahas_perm)("companies.add_company")
+    assert async_to_sync(user.ahas_perms)(["companies.add_company"])
+    assert async_to_sync(user.ahas_module_perms)("companies")
+    assert not async_to_sync(user.ahas_perm)("companies.delete_company")
+    assert async_to_sync(user.aget_all_permissions)() == {"companies.add_company"}
+
+    # The sync API shares the per-schema cache
+    with CaptureQueriesContext(connection) as queries:
+        assert user.tenant_perms is perms
+    assert len(queries) == 0
+
+
+def test_async_permissions_non_member(
+    public_tenant: Company, tenant_user: TenantUser
+) -> None:
+    """Test the async permission API for a user who is NOT a member."""
+    public_tenant.remove_user(tenant_user)
+
+    with pytest.raises(UserTenantPermissions.DoesNotExist):
+        async_to_sync(tenant_user.aget_tenant_perms)()
+    assert not async_to_sync(tenant_user.ahas_perm)("companies.add_company")
+    assert not async_to_sync(tenant_user.ahas_perms)(["companies.add_company"])
+    assert not async_to_sync(tenant_user.ahas_module_perms)("companies")
+    assert async_to_sync(tenant_user.aget_all_permissions)() == set()
+
+
+def test_async_permissions_use_context_schema(tenant_user: TenantUser) -> None:
+    """Test the async API reads the schema from current_schema_name."""
+    sentinel = object()
+    tenant_user.__dict__[TENANT_CACHE_NAME] = {"elsewhere": {"tenant_perms": sentinel}}
+
+    token = current_schema_name.set("elsewhere")
+    try:
+        assert async_to_sync(tenant_user.aget_tenant_perms)() is sentinel
+    finally:
+        current_schema_name.reset(token)
+
+
+def test_async_permissions_load_from_context_schema(
+    create_tenant, tenant_user: TenantUser
+) -> None:
+    """Test the async API loads permissions from the context schema on a miss."""
+    tenant = create_tenant(tenant_user, "async_schema")
+    staff = TenantUser.objects.create_user(email="staff@test.com")
+    tenant.add_user(staff, is_staff=True)
+    with tenant_context(tenant):
+        group = Group.objects.create(name="viewers")
+        group.permissions.add(Permission.objects.get(codename="view_group"))
+        UserTenantPermissions.objects.get(profile=staff).groups.add(group)
+    fresh_staff = TenantUser.objects.get(pk=staff.pk)
+
+    # The connection stays on the public schema, where staff is no staff
+    assert connection.schema_name == "public"
+    token = current_schema_name.set(tenant.schema_name)
+    try:
+        perms = async_to_sync(fresh_staff.aget_tenant_perms)()
+        assert async_to_sync(fresh_staff.ahas_perm)("auth.view_group")
+        assert async_to_sync(fresh_staff.aget_all_permissions)() == {"auth.view_group"}
+    finally:
+        current_schema_name.reset(token)
+
+    assert perms.is_staff
+    assert connection.schema_name == "public"
+    assert not fresh_staff.tenant_perms.is_staff
+    assert not fresh_staff.has_perm("auth.view_group")
+
+
+@pytest.mark.usefixtures("perms_cache")
+def test_async_permissions_fill_shared_cache(tenant_user: TenantUser) -> None:
+    """Test the async API stores resolved permissions in the shared cache."""
+    assert not async_to_sync(tenant_user.ahas_perm)("companies.add_company")
+
+    fresh_user = TenantUser.objects.get(pk=tenant_user.pk)
+    with CaptureQueriesContext(connection) as queries:
+        assert not fresh_user.has_perm("companies.add_company")
+        assert async_to_sync(fresh_user.ahas_module_perms)("companies") is False
+    assert len(queries) == 0
@@ -0,0 +1,123 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+
+from tenant_users.tenants.models import PooledSchema, SchemaError, schema_pool_claimed
+from tenant_users.tenants.pool import (
+    BACKGROUND_SCHEMA_POOL_REFILL,
+    claim_pooled_schema,
+    fill_schema_pool,
+    schema_pool_stats,
+)
+from tenant_users.tenants.tasks import provision_tenant
+
+
+def list_schemas() -> list[str]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT schema_name FROM information_schema.schemata;")
+        return [row[0] for row in cursor.fetchall()]
+
+
+@pytest.fixture
+def schema_pool(settings):
+    settings.TENANT_USERS_SCHEMA_POOL_SIZE = 2
+    settings.TENANT_USERS_SCHEMA_POOL_REFILL = None
+    assert fill_schema_pool() == 2
+    return list(PooledSchema.objects.values_list("schema_name", flat=True))
+
+
+def test_fill_schema_pool(schema_pool) -> None:
+    """Tests that the pool is filled with migrated schemas up to its size."""
+    schemas = list_schemas()
+    assert all(name in schemas for name in schema_pool)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM information_schema.tables "
+            "WHERE table_schema = %s AND table_name = 'django_migrations'",
+            [schema_pool[0]],
+        )
+        assert cursor.fetchone()[0] == 1
+
+    assert schema_pool_stats().depth == 2
+    # Already full
+    assert fill_schema_pool() == 0
+
+
+def test_provision_tenant_claims_pooled_schema(schema_pool, tenant_user) -> None:
+    """Tests that provision_tenant() renames pooled schemas and falls back when empty."""
+    claimed = []
+
+    def receiver(sender, schema_name, pooled_schema_name, latency, **kwargs):
+        claimed.append((schema_name, pooled_schema_name))
+
+    schema_pool_claimed.connect(receiver)
+    try:
+        misses = schema_pool_stats().misses
+        tenants = [
+            provision_tenant(slug, slug, tenant_user, schema_name=f"{slug}_pool")[0]
+            for slug in ("one", "two", "three")
+        ]
+    finally:
+        schema_pool_claimed.disconnect(receiver)
+
+    assert claimed == [
+        ("one_pool", schema_pool[0]),
+        ("two_pool", schema_pool[1]),
+    ]
+    stats = schema_pool_stats()
+    assert stats.depth == 0
+    assert stats.misses == misses + 1
+    assert stats.last_claim_seconds is not None
+
+    schemas = list_schemas()
+    assert not any(name in schemas for name in schema_pool)
+    for tenant in tenants:
+        assert tenant.schema_name in schemas
+        with tenant:
+            assert tenant_user.tenant_perms.is_superuser
+
+
+def test_claim_pooled_schema_refills_on_commit(
+    settings, schema_pool, django_capture_on_commit_callbacks
+) -> None:
+    """Tests that the opted-in refill hook runs once the claim is committed."""
+    del settings.TENANT_USERS_SCHEMA_POOL_REFILL
+    with (
+        patch("tenant_users.tenants.pool.refill_schema_pool_in_background") as refill,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        assert claim_pooled_schema("unrefilled")
+    refill.assert_not_called()
+
+    settings.TENANT_USERS_SCHEMA_POOL_REFILL = BACKGROUND_SCHEMA_POOL_REFILL
+    with (
+        patch("tenant_users.tenants.pool.refill_schema_pool_in_background") as refill,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        assert claim_pooled_schema("claimed")
+
+    refill.assert_called_once_with(tenant_type="")
+
+
+def test_stale_pooled_schemas_are_dropped(schema_pool) -> None:
+    """Tests that schemas migrated by other migrations are never claimed."""
+    # The pool was filled in this test's transaction, so its deferred
+    # constraint checks would otherwise block dropping the schemas
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    PooledSchema.objects.update(fingerprint="stale")
+    assert schema_pool_stats().stale == 2
+    assert not claim_pooled_schema("stale_claim")
+
+    assert fill_schema_pool(1) == 1
+    schemas = list_schemas()
+    assert not any(name in schemas for name in schema_pool)
+    stats = schema_pool_stats()
+    assert (stats.depth, stats.stale) == (1, 0)
+
+
+def test_claim_pooled_schema_invalid_name(schema_pool) -> None:
+    """Tests that invalid schema names are rejected before any rename."""
+    with pytest.raises(SchemaError):
+        claim_pooled_schema("pg_invalid")
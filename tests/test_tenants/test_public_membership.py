@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ImproperlyConfigured
+
+from tenant_users.permissions.models import UserTenantPermissions
+from tenant_users.tenants.cache import user_has_tenant_access
+from tenant_users.tenants.utils import prune_public_memberships
+
+TenantUser = get_user_model()
+
+
+@pytest.fixture
+def implicit_public_membership(settings):
+    settings.TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP = True
+
+
+def has_public_row(user) -> bool:
+    return UserTenantPermissions.objects.filter(profile_id=user.pk).exists()
+
+
+def test_create_user_without_public_row(
+    implicit_public_membership, public_tenant, django_assert_num_queries
+) -> None:
+    """Tests that users with default permissions get no public tenant rows."""
+    user = TenantUser.objects.create_user(email="implicit@test.com")
+
+    assert not has_public_row(user)
+    assert not user.tenants.exists()
+    assert user.has_tenant_permissions()
+    assert not user.is_staff
+    assert not user.has_perm("users.view_tenantuser")
+    with django_assert_num_queries(0):
+        assert user_has_tenant_access(user, public_tenant)
+
+
+def test_create_user_with_public_permissions(
+    implicit_public_membership, public_tenant
+) -> None:
+    """Tests that users with non-default permissions still get a row."""
+    staff = TenantUser.objects.create_user(email="staff@test.com", is_staff=True)
+    superuser = TenantUser.objects.create_superuser(
+        "secret", email="superuser@test.com"
+    )
+
+    assert staff.tenant_perms.is_staff
+    assert superuser.tenant_perms.is_superuser
+    assert staff.tenants.filter(pk=public_tenant.pk).exists()
+
+
+def test_bulk_create_users_without_public_rows(implicit_public_membership) -> None:
+    """Tests that bulk creation only writes rows for non-default roles."""
+    default, staff = TenantUser.objects.bulk_create_users(
+        [{"email": "default@test.com"}, {"email": "staff@test.com", "is_staff": True}],
+        max_workers=1,
+    )
+
+    assert not has_public_row(default.user)
+    assert staff.user.tenant_perms.is_staff
+
+
+def test_prune_public_memberships(settings, public_tenant) -> None:
+    """Tests that redundant public memberships are removed in batches."""
+    users = [TenantUser.objects.create_user(email=f"{i}@test.com") for i in range(3)]
+    staff = TenantUser.objects.create_user(email="staff@test.com", is_staff=True)
+
+    with pytest.raises(ImproperlyConfigured):
+        prune_public_memberships()
+
+    settings.TENANT_USERS_IMPLICIT_PUBLIC_MEMBERSHIP = True
+    progress = []
+    assert prune_public_memberships(batch_size=2, progress=progress.append) == 3
+    assert progress == [2, 3]
+
+    for user in users:
+        assert not has_public_row(user)
+        assert not user.tenants.exists()
+        assert user_has_tenant_access(user, public_tenant)
+    assert has_public_row(staff)
+    assert has_public_row(public_tenant.owner)
+    assert prune_public_memberships() == 0
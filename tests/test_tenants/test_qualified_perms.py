@@ -0,0 +1,108 @@
+from importlib.metadata import version
+
+import django
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import schema_context, tenant_context
+
+from tenant_users.permissions.models import UserTenantPermissions
+from tenant_users.permissions.qualified import get_tenant_perms, unscoped_cursor
+from tenant_users.permissions.storage import get_tenant_perms_queryset
+from tenant_users.tenants.tasks import provision_tenant
+
+TenantUser = get_user_model()
+
+
+@pytest.fixture
+def member_tenant(tenant_user):
+    tenant, _ = provision_tenant("Qualified", "qualified", tenant_user)
+    member = TenantUser.objects.create_user(email="member@test.com")
+    tenant.add_user(member)
+    with tenant_context(tenant):
+        group = Group.objects.create(name="viewers")
+        group.permissions.add(Permission.objects.get(codename="view_group"))
+        UserTenantPermissions.objects.get(profile=member).groups.add(group)
+    return tenant, member
+
+
+def _check_perms(tenant, member) -> list[str]:
+    """Resolve the member's permissions, returning the statements sent."""
+    with tenant_context(tenant):
+        user = TenantUser.objects.get(pk=member.pk)
+        with CaptureQueriesContext(connection) as queries:
+            assert user.has_perm("auth.view_group")
+            assert not user.has_perm("auth.change_group")
+            assert user.get_all_permissions() == {"auth.view_group"}
+    return [query["sql"] for query in queries]
+
+
+def test_strategies_compared(settings, member_tenant) -> None:
+    """Benchmarks resolving permissions with and without qualified queries."""
+    tenant, member = member_tenant
+    path_statements = _check_perms(tenant, member)
+
+    settings.TENANT_USERS_QUALIFIED_PERMS_QUERIES = True
+    qualified_statements = _check_perms(tenant, member)
+
+    # Permissions, group permissions and user permissions are read once each
+    assert len(qualified_statements) == 3
+    assert not [sql for sql in qualified_statements if "search_path" in sql]
+    assert all(f'"{tenant.schema_name}".' in sql for sql in qualified_statements)
+    # The same reads, and loading the profile again, each set the search path
+    assert len(path_statements) == 8
+    assert len([sql for sql in path_statements if "search_path" in sql]) == 4
+
+
+def test_known_tenant_without_switching(settings, member_tenant) -> None:
+    """Tests resolving permissions of a tenant that is not the current one."""
+    settings.TENANT_USERS_QUALIFIED_PERMS_QUERIES = True
+    tenant, member = member_tenant
+
+    with schema_context("public"):
+        perms = get_tenant_perms(
+            get_tenant_perms_queryset(tenant.schema_name),
+            member.pk,
+            tenant.schema_name,
+        )
+        assert perms.profile_id == member.pk
+        assert perms.has_perm("auth.view_group")
+
+        with pytest.raises(UserTenantPermissions.DoesNotExist):
+            get_tenant_perms(
+                get_tenant_perms_queryset(tenant.schema_name), 0, tenant.schema_name
+            )
+
+        assert not TenantUser.objects.get(pk=member.pk).has_perm("auth.view_group")
+
+
+def test_shared_storage(settings, tenant_user) -> None:
+    """Tests qualified queries on permissions stored in the public schema."""
+    settings.TENANT_USERS_PERMISSIONS_STORAGE = "shared"
+    settings.TENANT_USERS_QUALIFIED_PERMS_QUERIES = True
+    tenant, _ = provision_tenant("Shared", "shared", tenant_user)
+
+    with tenant_context(tenant):
+        owner = TenantUser.objects.get(pk=tenant_user.pk)
+        assert owner.is_superuser
+        assert owner.has_perm("auth.view_group")
+
+
+def test_unscoped_cursor_versions() -> None:
+    """Pins the private connection methods the unscoped cursor relies on."""
+    # Check the cursor again before supporting newer versions
+    assert (4, 2) <= django.VERSION[:2] < (6, 1)
+    assert (3, 6) <= tuple(map(int, version("django-tenants").split(".")[:2])) < (4, 0)
+
+    with CaptureQueriesContext(connection) as queries:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        with unscoped_cursor(connection) as cursor:
+            cursor.execute("SELECT 2")
+            assert cursor.fetchall() == [(2,)]
+
+    statements = [query["sql"] for query in queries]
+    assert "search_path" in statements[0]
+    assert statements[1:] == ["SELECT 1", "SELECT 2"]
@@ -0,0 +1,103 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django_tenants.utils import tenant_context
+
+from tenant_users.permissions.models import UserTenantPermissions
+from tenant_users.tenants.models import SharedUserTenantPermissions, TenantRoleIndex
+from tenant_users.tenants.roles import (
+    RoleIndexDiff,
+    get_staff_tenants,
+    groups_hash,
+    rebuild_role_index,
+    verify_role_index,
+)
+from tenant_users.tenants.tasks import provision_tenant
+
+TenantUser = get_user_model()
+
+
+@pytest.fixture
+def role_index(settings):
+    settings.TENANT_USERS_ROLE_INDEX = True
+
+
+def _role(tenant, user):
+    return (
+        TenantRoleIndex.objects.filter(tenant=tenant, profile=user)
+        .values_list("is_staff", "is_superuser", "groups_hash")
+        .first()
+    )
+
+
+def test_index_follows_membership_and_groups(role_index, tenant_user) -> None:
+    """Tests that membership, role and group changes are mirrored."""
+    tenant, _ = provision_tenant("Indexed", "indexed", tenant_user)
+    staff = TenantUser.objects.create_user(email="staff@test.com")
+    members = [
+        TenantUser.objects.create_user(email=f"member{i}@test.com") for i in range(2)
+    ]
+
+    assert _role(tenant, tenant_user) == (False, True, "")
+    tenant.add_user(staff, is_staff=True)
+    tenant.add_users(members)
+    assert _role(tenant, staff) == (True, False, "")
+    assert _role(tenant, members[0]) == (False, False, "")
+    assert list(get_staff_tenants(staff)) == [tenant]
+    assert not get_staff_tenants(members[0]).exists()
+
+    with tenant_context(tenant):
+        group = Group.objects.create(name="editors")
+        perms = UserTenantPermissions.objects.get(profile=members[0])
+        perms.groups.add(group)
+        assert _role(tenant, members[0]) == (False, False, groups_hash([group.pk]))
+
+        group.user_set.add(UserTenantPermissions.objects.get(profile=members[1]))
+        assert _role(tenant, members[1])[2] == groups_hash([group.pk])
+
+        perms.is_staff = True
+        perms.save()
+        assert _role(tenant, members[0])[0]
+
+        group.delete()
+        assert _role(tenant, members[0]) == (True, False, "")
+        assert _role(tenant, members[1]) == (False, False, "")
+
+    tenant.remove_users(members)
+    assert _role(tenant, members[0]) is None
+    assert verify_role_index(tenant) == RoleIndexDiff(0, 0, 0)
+
+
+def test_index_with_shared_storage(role_index, settings, tenant_user) -> None:
+    """Tests that permissions stored in the public schema are mirrored."""
+    settings.TENANT_USERS_PERMISSIONS_STORAGE = "shared"
+    tenant, _ = provision_tenant("Shared", "shared", tenant_user)
+    member = TenantUser.objects.create_user(email="member@test.com")
+    tenant.add_user(member)
+    group = Group.objects.create(name="viewers")
+    SharedUserTenantPermissions.objects.get(tenant=tenant, profile=member).groups.add(
+        group
+    )
+
+    assert _role(tenant, tenant_user) == (False, True, "")
+    assert _role(tenant, member) == (False, False, groups_hash([group.pk]))
+    assert verify_role_index(tenant) == RoleIndexDiff(0, 0, 0)
+
+
+def test_rebuild_repairs_index(tenant_user) -> None:
+    """Tests rebuilding the index of permissions written around it."""
+    tenant, _ = provision_tenant("Unindexed", "unindexed", tenant_user)
+    member = TenantUser.objects.create_user(email="member@test.com")
+    tenant.add_user(member)
+    assert not TenantRoleIndex.objects.filter(tenant=tenant).exists()
+
+    stranger = TenantUser.objects.create_user(email="stranger@test.com")
+    TenantRoleIndex.objects.create(tenant=tenant, profile=stranger)
+    TenantRoleIndex.objects.create(tenant=tenant, profile=member, is_staff=True)
+
+    assert verify_role_index(tenant) == RoleIndexDiff(missing=1, stale=1, extra=1)
+    assert rebuild_role_index(tenant) == RoleIndexDiff(missing=1, stale=1, extra=1)
+    assert verify_role_index(tenant) == RoleIndexDiff(0, 0, 0)
+    assert _role(tenant, tenant_user) == (False, True, "")
+    assert _role(tenant, member) == (False, False, "")
+    assert _role(tenant, stranger) is None
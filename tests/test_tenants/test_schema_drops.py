@@ -0,0 +1,53 @@
+from unittest.mock import MagicMock
+
+from django.db import connection
+from django_tenants.utils import schema_exists
+
+from tenant_users.tenants.models import QueuedSchemaDrop
+from tenant_users.tenants.schema_drops import (
+    QUEUED_SCHEMA_PREFIX,
+    drop_queued_schemas,
+)
+from tenant_users.tenants.tasks import provision_tenant
+
+
+def test_deferred_schema_drop(settings, tenant_user) -> None:
+    """Tests that deleting a tenant queues its schema instead of dropping it."""
+    settings.TENANT_USERS_DEFER_SCHEMA_DROP = True
+    tenant, _ = provision_tenant("Deferred", "deferred", tenant_user)
+    schema_name = tenant.schema_name
+
+    tenant.delete_tenant()
+    tenant.delete(force_drop=True)
+
+    assert not schema_exists(schema_name)
+    queued = QueuedSchemaDrop.objects.get(original_schema_name=schema_name)
+    assert queued.schema_name.startswith(QUEUED_SCHEMA_PREFIX)
+    assert schema_exists(queued.schema_name)
+
+    # The schema was created in this test's transaction, so its deferred
+    # constraint checks would otherwise block dropping it
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    progress = MagicMock()
+    dropped, errors = drop_queued_schemas(lock_timeout=5, progress=progress)
+
+    assert dropped == [queued.schema_name]
+    assert errors == {}
+    progress.assert_called_once_with(1, 1)
+    assert not schema_exists(queued.schema_name)
+    assert not QueuedSchemaDrop.objects.exists()
+
+
+def test_schema_drop_not_deferred(tenant_user) -> None:
+    """Tests that schemas are dropped right away by default."""
+    tenant, _ = provision_tenant("Direct", "direct", tenant_user)
+    schema_name = tenant.schema_name
+
+    tenant.delete_tenant()
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    tenant.delete(force_drop=True)
+
+    assert not schema_exists(schema_name)
+    assert not QueuedSchemaDrop.objects.exists()
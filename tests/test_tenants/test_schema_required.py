@@ -1,6 +1,17 @@
 import pytest
+from django.contrib.auth import get_user_model
 from django.db import connection
-from django_tenants.utils import get_public_schema_name
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import get_public_schema_name, tenant_context
+
+from tenant_users.tenants.switching import (
+    SchemaSwitchStats,
+    get_schema_switch_stats,
+    pinned_tenant,
+    reset_schema_switch_stats,
+)
+
+TenantUser = get_user_model()
 
 
 @pytest.mark.django_db
@@ -49,3 +60,45 @@ def test_schema_required_restores_connection_state(
     assert current_tenant == initial_tenant, (
         f"Expected: {initial_tenant}, got: {current_tenant}"
     )
+
+
+@pytest.mark.django_db
+def test_schema_required_skips_redundant_switch(create_tenant, tenant_user) -> None:
+    """Test that methods called on the current tenant do not switch schemas."""
+    test_tenant = create_tenant(tenant_user, "test_redundant_switch")
+    user = TenantUser.objects.create_user(email="member@test.com")
+
+    with tenant_context(test_tenant):
+        reset_schema_switch_stats()
+        test_tenant.add_user(user)
+        assert connection.tenant == test_tenant  # type: ignore[attr-defined]
+    assert get_schema_switch_stats() == SchemaSwitchStats(switched=0, avoided=1)
+
+    reset_schema_switch_stats()
+    test_tenant.remove_user(user)
+    assert get_schema_switch_stats() == SchemaSwitchStats(switched=1, avoided=0)
+    assert connection.schema_name == get_public_schema_name()  # type: ignore[attr-defined]
+
+
+@pytest.mark.django_db
+def test_pinned_tenant_batches_calls(create_tenant, tenant_user) -> None:
+    """Test that calls within pinned_tenant() share one schema switch."""
+    test_tenant = create_tenant(tenant_user, "test_pinned_tenant")
+    users = [
+        TenantUser.objects.create_user(email=f"member{i}@test.com") for i in range(3)
+    ]
+
+    reset_schema_switch_stats()
+    with CaptureQueriesContext(connection) as queries, pinned_tenant(test_tenant):
+        for user in users:
+            test_tenant.add_user(user)
+    assert get_schema_switch_stats() == SchemaSwitchStats(switched=1, avoided=3)
+    assert connection.schema_name == get_public_schema_name()  # type: ignore[attr-defined]
+
+    search_paths = {q["sql"] for q in queries if q["sql"].startswith("SET search_path")}
+    assert search_paths == {f"SET search_path = '{test_tenant.schema_name}','public'"}
+
+    # Deleting a tenant switches once for all of its nested calls
+    reset_schema_switch_stats()
+    test_tenant.delete_tenant()
+    assert get_schema_switch_stats().switched == 1
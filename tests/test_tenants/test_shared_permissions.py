@@ -0,0 +1,129 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import transaction
+from django_tenants.utils import tenant_context
+
+from tenant_users.permissions.models import UserTenantPermissions
+from tenant_users.tenants.models import SharedUserTenantPermissions
+from tenant_users.tenants.tasks import provision_tenant
+
+TenantUser = get_user_model()
+
+
+@pytest.fixture
+def shared_storage(settings):
+    settings.TENANT_USERS_PERMISSIONS_STORAGE = "shared"
+
+
+@pytest.fixture
+def shared_tenant(shared_storage, tenant_user):
+    tenant, _ = provision_tenant("Shared", "shared", tenant_user)
+    return tenant
+
+
+def test_permissions_stored_in_public_table(shared_tenant, tenant_user) -> None:
+    """Tests that tenant permissions are stored once, keyed by tenant."""
+    perms = SharedUserTenantPermissions.objects.get(
+        tenant=shared_tenant, profile=tenant_user
+    )
+    assert perms.is_superuser
+
+    with tenant_context(shared_tenant):
+        assert not UserTenantPermissions.objects.exists()
+        owner = TenantUser.objects.get(pk=tenant_user.pk)
+        assert owner.tenant_perms.pk == perms.pk
+        assert owner.has_tenant_permissions()
+        assert owner.is_superuser
+        assert owner.has_perm("auth.view_group")
+
+
+def test_group_permissions_and_membership(shared_tenant) -> None:
+    """Tests group permissions, cross-tenant queries and removing users."""
+    member = TenantUser.objects.create_user(email="member@test.com")
+    outsider = TenantUser.objects.create_user(email="outsider@test.com")
+    group = Group.objects.create(name="viewers")
+    group.permissions.add(Permission.objects.get(codename="view_group"))
+
+    shared_tenant.add_user(member)
+    SharedUserTenantPermissions.objects.get(
+        tenant=shared_tenant, profile=member
+    ).groups.add(group)
+
+    with tenant_context(shared_tenant):
+        member = TenantUser.objects.get(pk=member.pk)
+        assert member.has_perm("auth.view_group")
+        assert not member.has_perm("auth.change_group")
+        assert not member.is_staff
+
+        assert not outsider.has_tenant_permissions()
+        with pytest.raises(UserTenantPermissions.DoesNotExist):
+            _ = outsider.tenant_perms
+
+    # Permissions across tenants are a single query
+    schema_names = SharedUserTenantPermissions.objects.filter(
+        profile=member
+    ).values_list("tenant__schema_name", flat=True)
+    assert set(schema_names) == {"public", shared_tenant.schema_name}
+
+    shared_tenant.remove_user(member)
+    assert not SharedUserTenantPermissions.objects.filter(
+        tenant=shared_tenant, profile=member
+    ).exists()
+
+
+def test_tenant_groups_are_refused(shared_tenant, tenant_user) -> None:
+    """Tests that groups cannot be added from a schema with its own groups."""
+    perms = SharedUserTenantPermissions.objects.get(
+        tenant=shared_tenant, profile=tenant_user
+    )
+
+    with tenant_context(shared_tenant):
+        group = Group.objects.create(name="tenant editors")
+        with (
+            pytest.raises(ValueError, match="add them from the public schema"),
+            transaction.atomic(),
+        ):
+            perms.groups.add(group)
+        with (
+            pytest.raises(ValueError, match="add them from the public schema"),
+            transaction.atomic(),
+        ):
+            group.shared_tenant_perms.add(perms)
+        # Removing groups is harmless
+        perms.groups.clear()
+    assert not perms.groups.exists()
+
+
+def test_delete_tenant_transfers_shared_permissions(
+    shared_tenant, tenant_user, public_tenant
+) -> None:
+    """Tests that ownership transfers update the shared permissions."""
+    shared_tenant.delete_tenant()
+
+    perms = SharedUserTenantPermissions.objects.filter(tenant=shared_tenant)
+    assert list(perms.values_list("profile_id", "is_superuser")) == [
+        (public_tenant.owner_id, True)
+    ]
+    assert tenant_user.pk not in perms.values_list("profile_id", flat=True)
+
+
+def test_group_changes_invalidate_cached_permissions(settings, shared_tenant) -> None:
+    """Tests that changing a public group drops cached permissions of all tenants."""
+    settings.TENANT_USERS_PERMS_CACHE = "default"
+    cache.clear()
+    member = TenantUser.objects.create_user(email="member@test.com")
+    group = Group.objects.create(name="editors")
+    shared_tenant.add_user(member)
+    SharedUserTenantPermissions.objects.get(
+        tenant=shared_tenant, profile=member
+    ).groups.add(group)
+
+    with tenant_context(shared_tenant):
+        assert not TenantUser.objects.get(pk=member.pk).has_perm("auth.add_group")
+
+    group.permissions.add(Permission.objects.get(codename="add_group"))
+    with tenant_context(shared_tenant):
+        assert TenantUser.objects.get(pk=member.pk).has_perm("auth.add_group")
+    cache.clear()
@@ -7,10 +7,21 @@ import pytest
 from django.conf import settings
 from django.db import DatabaseError, connection
 
-from django_test_app.companies.models import Company
+from django_test_app.companies.models import Company, Domain
 from tenant_users.constants import INACTIVE_USER_ERROR_MESSAGE
-from tenant_users.tenants.models import ExistsError, InactiveError, SchemaError
-from tenant_users.tenants.tasks import provision_tenant
+from tenant_users.tenants.models import (
+    ExistsError,
+    InactiveError,
+    SchemaError,
+    TenantProvisioning,
+    tenant_provisioning_stage_completed,
+)
+from tenant_users.tenants.tasks import (
+    provision_tenant,
+    provision_tenants,
+    resume_provisioning,
+    start_provisioning,
+)
 
 if TYPE_CHECKING:
     from django_test_app.users.models import TenantUser
@@ -249,3 +260,134 @@ def test_provision_tenant_with_tenant_extras(tenant_user) -> None:
     )
 
     assert tenant.type == extra_data
+
+
+def test_provision_tenants(test_tenants, tenant_user) -> None:
+    """Tests provision_tenants() reports one result per row and isolates failures."""
+    rows = [
+        {"name": "Alpha", "slug": "alpha"},
+        {"name": "Taken", "slug": "one"},
+        {"name": "Alpha Again", "slug": "alpha"},
+        {"slug": "nameless"},
+        {"name": "Broken", "slug": "broken", "schema_name": "broken_schema"},
+        {"name": "Beta", "slug": "beta", "domain_extra_data": {"notes": "bulk"}},
+    ]
+
+    def clone_template_schema(schema_name, tenant_type):
+        # Tenants are not routable before their schema is ready
+        assert not Domain.objects.filter(tenant__schema_name=schema_name).exists()
+        if schema_name == "broken_schema":
+            raise DatabaseError("Schema failure")
+        return False
+
+    with patch(
+        "tenant_users.tenants.tasks.clone_template_schema",
+        side_effect=clone_template_schema,
+    ):
+        results = provision_tenants(rows, tenant_user, max_workers=1)
+
+    assert [result.slug for result in results] == [row.get("slug") for row in rows]
+    alpha, taken, duplicate, nameless, broken, beta = results
+    assert isinstance(taken.error, ExistsError)
+    assert isinstance(duplicate.error, ExistsError)
+    assert isinstance(nameless.error, ValueError)
+    assert isinstance(broken.error, DatabaseError)
+    assert not Company.objects.filter(schema_name="broken_schema").exists()
+    assert not Domain.objects.filter(domain__startswith="broken.").exists()
+
+    schemas = list_schemas()
+    for result in (alpha, beta):
+        assert result.error is None
+        assert result.domain.tenant == result.tenant
+        assert result.domain.notes == ("bulk" if result is beta else "")
+        assert result.tenant.schema_name in schemas
+        with result.tenant:
+            assert tenant_user.tenant_perms.is_superuser
+    assert set(tenant_user.tenants.values_list("slug", flat=True)) >= {"alpha", "beta"}
+
+
+def test_provision_tenants_inactive_user(tenant_user) -> None:
+    """Tests provision_tenants() refuses an inactive owner."""
+    tenant_user.is_active = False
+    with pytest.raises(InactiveError, match=INACTIVE_USER_ERROR_MESSAGE):
+        provision_tenants([{"name": "Alpha", "slug": "alpha"}], tenant_user)
+
+
+def test_start_provisioning_resumes_from_failed_stage(tenant_user) -> None:
+    """Tests that a failed stage is recorded and resuming skips completed stages."""
+    with (
+        patch(
+            "tenant_users.tenants.tasks.call_command",
+            side_effect=DatabaseError("Migration failure"),
+        ),
+        pytest.raises(DatabaseError),
+    ):
+        start_provisioning("Staged", "staged", tenant_user, schema_name="staged")
+
+    provisioning = TenantProvisioning.objects.get(schema_name="staged")
+    assert provisioning.stage == TenantProvisioning.Stage.MIGRATE
+    assert provisioning.error == "DatabaseError: Migration failure"
+    assert set(provisioning.stage_timings) == {"reserve_domain", "create_schema"}
+    assert Company.objects.filter(schema_name="staged").exists()
+    assert "staged" in list_schemas()
+
+    completed = []
+
+    def receiver(sender, stage, **kwargs):
+        completed.append(stage)
+
+    tenant_provisioning_stage_completed.connect(receiver)
+    try:
+        provisioning = resume_provisioning(provisioning)
+    finally:
+        tenant_provisioning_stage_completed.disconnect(receiver)
+
+    assert completed == ["migrate", "link_owner", "finalize"]
+    assert provisioning.is_done
+    assert provisioning.error == ""
+    assert provisioning.attempts == 2
+    assert len(provisioning.stage_timings) == 5
+    tenant = Company.objects.get(schema_name="staged")
+    with tenant:
+        assert tenant_user.tenant_perms.is_superuser
+
+
+def test_start_provisioning_duplicate_tenant_url(test_tenants, tenant_user) -> None:
+    """Tests that taken domains are refused before anything is recorded."""
+    with pytest.raises(ExistsError):
+        start_provisioning("One", "one", tenant_user)
+    assert not TenantProvisioning.objects.exists()
+
+
+@pytest.mark.parametrize(("max_workers", "use_processes"), [(3, False), (2, True)])
+def test_provision_tenants_in_parallel(
+    transactional_db, monkeypatch, tenant_user, max_workers, use_processes
+) -> None:
+    """Tests provision_tenants() on worker threads and processes."""
+    # Spawned workers set up Django again, and must use the test database
+    monkeypatch.setenv("DJANGO_DATABASE_NAME", connection.settings_dict["NAME"])
+    rows = [
+        {"name": "Alpha", "slug": "alpha", "schema_name": "parallel_alpha"},
+        {"name": "Beta", "slug": "beta", "schema_name": "parallel_beta"},
+        # The pg_ prefix is reserved, so the worker refuses to create it
+        {"name": "Broken", "slug": "broken", "schema_name": "pg_broken"},
+    ]
+
+    try:
+        alpha, beta, broken = provision_tenants(
+            rows, tenant_user, max_workers=max_workers, use_processes=use_processes
+        )
+
+        assert isinstance(broken.error, SchemaError)
+        assert not Company.objects.filter(slug="broken").exists()
+        schemas = list_schemas()
+        for result in (alpha, beta):
+            assert result.error is None
+            assert result.tenant.schema_name in schemas
+            with result.tenant:
+                assert tenant_user.tenant_perms.is_superuser
+    finally:
+        # Schemas are not removed by flushing the test database
+        with connection.cursor() as cursor:
+            for schema_name in ("parallel_alpha", "parallel_beta"):
+                cursor.execute(f"DROP SCHEMA IF EXISTS {schema_name} CASCADE")
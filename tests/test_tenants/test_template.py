@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+
+from tenant_users.tenants.models import SchemaError
+from tenant_users.tenants.tasks import provision_tenant
+from tenant_users.tenants.template import (
+    clone_template_schema,
+    refresh_template_schema,
+    template_schema_is_current,
+)
+
+TEMPLATE_SCHEMA = "tenant_template"
+
+
+def count_rows(schema_name: str, table: str) -> int:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT count(*) FROM {connection.ops.quote_name(schema_name)}.{table}"  # noqa: S608
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.fixture
+def template_schema(settings):
+    settings.TENANT_USERS_TEMPLATE_SCHEMA = TEMPLATE_SCHEMA
+    assert refresh_template_schema() == TEMPLATE_SCHEMA
+    return TEMPLATE_SCHEMA
+
+
+def test_provision_tenant_clones_template(template_schema, tenant_user) -> None:
+    """Tests that provision_tenant() copies the template instead of migrating."""
+    assert template_schema_is_current()
+
+    with patch("django_tenants.models.call_command") as migrate:
+        tenant, _ = provision_tenant("Clone", "clone", tenant_user)
+
+    migrate.assert_not_called()
+    for table in ("django_migrations", "auth_permission", "django_content_type"):
+        assert count_rows(tenant.schema_name, table) == count_rows(
+            template_schema, table
+        )
+    with tenant:
+        assert tenant_user.tenant_perms.is_superuser
+
+
+def test_stale_template_is_not_cloned(template_schema, tenant_user) -> None:
+    """Tests that a template migrated with other migrations is refused."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"COMMENT ON SCHEMA {template_schema} IS 'stale'")
+    assert not template_schema_is_current()
+    assert not clone_template_schema("stale_clone")
+
+    # Falls back to running the migrations
+    tenant, _ = provision_tenant("Stale", "stale", tenant_user)
+    assert count_rows(tenant.schema_name, "django_migrations") > 0
+
+    refresh_template_schema()
+    assert template_schema_is_current()
+
+
+def test_clone_template_schema_existing(template_schema) -> None:
+    """Tests that an existing schema is never overwritten by a clone."""
+    with pytest.raises(SchemaError):
+        clone_template_schema(template_schema)
+
+
+def test_template_schema_disabled(tenant_user) -> None:
+    """Tests that nothing is cloned without TENANT_USERS_TEMPLATE_SCHEMA."""
+    assert not template_schema_is_current()
+    assert not clone_template_schema("no_template")
+    with pytest.raises(SchemaError):
+        refresh_template_schema()
@@ -1,5 +1,11 @@
+import threading
+from unittest.mock import Mock, patch
+
 import pytest
+from asgiref.sync import async_to_sync
 from django.contrib.auth.models import Group, Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django_tenants.utils import (
     get_public_schema_name,
     get_tenant_model,
@@ -7,7 +13,7 @@ from django_tenants.utils import (
 )
 
 from django_test_app.users.models import TenantUser
-from tenant_users.constants import TENANT_DELETE_ERROR_MESSAGE
+from tenant_users.constants import TENANT_CACHE_NAME, TENANT_DELETE_ERROR_MESSAGE
 from tenant_users.permissions.models import UserTenantPermissions
 from tenant_users.tenants.models import (
     DeleteError,
@@ -153,3 +159,180 @@ def test_transfer_ownership_to_existing_user(test_tenants, public_tenant):
         assert UserTenantPermissions.objects.get(
             profile=public_tenant.owner
         ).is_superuser
+
+
+def test_add_users_adds_new_and_skips_existing(test_tenants, tenant_user):
+    """Ensure add_users() links new users and skips existing members."""
+    tenant = test_tenants.first()
+    new_users = [
+        TenantUser.objects.create_user(email=f"bulk{idx}@test.com") for idx in range(3)
+    ]
+    tenant.add_user(tenant_user)
+
+    added, skipped = tenant.add_users([*new_users, tenant_user], is_staff=True)
+
+    assert added == new_users
+    assert skipped == [tenant_user]
+    assert tenant.user_set.count() == 5
+    with tenant_context(tenant):
+        perms = UserTenantPermissions.objects.filter(profile__in=new_users)
+        assert perms.count() == 3
+        assert all(perm.is_staff for perm in perms)
+        assert not any(perm.is_superuser for perm in perms)
+
+
+def test_add_users_query_count_is_constant(test_tenants) -> None:
+    """Ensure add_users() does not issue per-user queries."""
+    tenant_one, tenant_two = test_tenants[0], test_tenants[1]
+    users = [
+        TenantUser.objects.create_user(email=f"bulk{idx}@test.com") for idx in range(10)
+    ]
+
+    with CaptureQueriesContext(connection) as few_users:
+        tenant_one.add_users(users[:2])
+    with CaptureQueriesContext(connection) as many_users:
+        added, _ = tenant_two.add_users(users)
+
+    assert len(added) == 10
+    assert len(many_users) == len(few_users)
+
+
+def test_add_users_sends_signal_and_ignores_duplicates(test_tenants, tenant_user):
+    """Ensure add_users() sends tenant_user_added once per added user."""
+    tenant = test_tenants.first()
+
+    with patch("tenant_users.tenants.models.tenant_user_added.send") as mock:
+        added, skipped = tenant.add_users([tenant_user, tenant_user])
+
+    assert added == [tenant_user]
+    assert skipped == [tenant_user]
+    mock.assert_called_once_with(
+        sender=tenant.__class__, user=tenant_user, tenant=tenant
+    )
+
+
+def test_add_users_empty(test_tenants):
+    """Ensure add_users() handles an empty iterable."""
+    assert test_tenants.first().add_users([]) == ([], [])
+
+
+def test_remove_users_skips_owner_and_non_members(test_tenants, tenant_user):
+    """Ensure remove_users() only removes non-owner members."""
+    tenant = test_tenants.first()
+    members = [
+        TenantUser.objects.create_user(email=f"bulk{idx}@test.com") for idx in range(3)
+    ]
+    tenant.add_users(members)
+    with tenant_context(tenant):
+        group = Group.objects.create(name="bulkgroup")
+        members[0].tenant_perms.groups.add(group)
+        assert TENANT_CACHE_NAME in members[0].__dict__
+
+    removed = tenant.remove_users([*members, tenant.owner, tenant_user])
+
+    assert removed == members
+    assert list(tenant.user_set.all()) == [tenant.owner]
+    assert tenant.schema_name not in members[0].__dict__[TENANT_CACHE_NAME]
+    with tenant_context(tenant):
+        assert not UserTenantPermissions.objects.filter(profile__in=members).exists()
+        assert not group.user_set.exists()
+        assert UserTenantPermissions.objects.filter(profile=tenant.owner).exists()
+
+
+def test_remove_users_accepts_queryset(test_tenants):
+    """Ensure remove_users() works on a queryset and sends signals."""
+    tenant = test_tenants.first()
+    tenant.add_users(
+        [
+            TenantUser.objects.create_user(email=f"bulk{idx}@test.com")
+            for idx in range(3)
+        ]
+    )
+
+    with patch("tenant_users.tenants.models.tenant_user_removed.send") as mock:
+        removed = tenant.remove_users(
+            TenantUser.objects.filter(email__startswith="bulk")
+        )
+
+    assert len(removed) == 3
+    assert mock.call_count == 3
+    assert tenant.user_set.count() == 1
+
+
+def test_remove_users_query_count_is_constant(test_tenants) -> None:
+    """Ensure remove_users() does not issue per-user queries."""
+    tenant_one, tenant_two = test_tenants[0], test_tenants[1]
+    users = [
+        TenantUser.objects.create_user(email=f"bulk{idx}@test.com") for idx in range(10)
+    ]
+    tenant_one.add_users(users[:2])
+    tenant_two.add_users(users)
+
+    with CaptureQueriesContext(connection) as few_users:
+        tenant_one.remove_users(users[:2])
+    with CaptureQueriesContext(connection) as many_users:
+        removed = tenant_two.remove_users(users)
+
+    assert len(removed) == 10
+    assert len(many_users) == len(few_users)
+    assert tenant_one.remove_users([]) == []
+
+
+def test_delete_tenant_removes_members_in_chunks(test_tenants, public_tenant):
+    """Ensure delete_tenant() strips members in batches and reports progress."""
+    tenant = test_tenants.first()
+    tenant.add_users(
+        [
+            TenantUser.objects.create_user(email=f"bulk{idx}@test.com")
+            for idx in range(5)
+        ]
+    )
+    progress = Mock()
+
+    tenant.delete_tenant(batch_size=2, progress=progress)
+
+    assert [args for args, _ in progress.call_args_list] == [(2, 5), (4, 5), (5, 5)]
+    assert list(tenant.user_set.all()) == [public_tenant.owner]
+    with tenant_context(tenant):
+        assert UserTenantPermissions.objects.count() == 1
+
+
+def test_async_membership_methods(test_tenants, tenant_user, public_tenant):
+    """Test the async membership methods change memberships like the sync ones."""
+    tenant = test_tenants.first()
+
+    async_to_sync(tenant.aadd_user)(tenant_user, is_staff=True, thread_sensitive=True)
+    with tenant_context(tenant):
+        assert UserTenantPermissions.objects.get(profile=tenant_user).is_staff
+    assert tenant.user_set.filter(pk=tenant_user.pk).exists()
+
+    async_to_sync(tenant.aremove_user)(tenant_user, thread_sensitive=True)
+    assert not tenant.user_set.filter(pk=tenant_user.pk).exists()
+
+    async_to_sync(tenant.atransfer_ownership)(
+        public_tenant.owner, thread_sensitive=True
+    )
+    tenant.refresh_from_db()
+    assert tenant.owner == public_tenant.owner
+
+
+def test_async_membership_methods_use_worker_thread(test_tenants, tenant_user):
+    """Test the async membership methods run on a worker thread and clean it up."""
+    tenant = test_tenants.first()
+    threads = []
+
+    with (
+        patch.object(
+            tenant, "add_user", side_effect=lambda *a, **kw: threads.append("add")
+        ) as add_user,
+        patch(
+            "tenant_users.tenants.models.close_old_connections",
+            side_effect=lambda: threads.append(threading.get_ident()),
+        ),
+    ):
+        async_to_sync(tenant.aadd_user)(tenant_user, is_superuser=True)
+
+    add_user.assert_called_once_with(tenant_user, is_superuser=True, is_staff=False)
+    # The connection of the executor thread is cleaned up afterwards
+    assert threads[0] == "add"
+    assert threads[1] != threading.get_ident()
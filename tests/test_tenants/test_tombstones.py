@@ -0,0 +1,90 @@
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django_tenants.utils import get_tenant_model, schema_exists
+
+from tenant_users.tenants.models import TenantTombstone
+from tenant_users.tenants.tasks import provision_tenant
+from tenant_users.tenants.tombstones import (
+    purge_tombstoned_tenants,
+    size_tombstoned_tenants,
+    track_untracked_tombstones,
+    untracked_deleted_tenants,
+)
+
+
+def test_delete_tenant_records_tombstone(tenant_user) -> None:
+    """Tests that delete_tenant() records when and from whom it was deleted."""
+    tenant, _ = provision_tenant("Tombstone", "tombstone", tenant_user)
+    tenant.delete_tenant()
+
+    tombstone = TenantTombstone.objects.get(schema_name=tenant.schema_name)
+    assert tombstone.slug == "tombstone"
+    assert tombstone.previous_owner == tenant_user
+    assert tombstone.purged_at is None
+
+
+def test_delete_tenant_twice_keeps_tombstone(tenant_user) -> None:
+    """Tests that deleting an already deleted tenant keeps its tombstone."""
+    tenant, _ = provision_tenant("Twice", "twice", tenant_user)
+    tenant.delete_tenant()
+    deleted_at = TenantTombstone.objects.get(schema_name=tenant.schema_name).deleted_at
+    domain_url = tenant.domain_url
+
+    tenant.delete_tenant()
+
+    assert tenant.domain_url == domain_url
+    tombstone = TenantTombstone.objects.get(schema_name=tenant.schema_name)
+    assert tombstone.previous_owner == tenant_user
+    assert tombstone.deleted_at == deleted_at
+
+
+def test_purge_tombstoned_tenants(tenant_user) -> None:
+    """Tests that old tombstoned tenants are sized, then purged and archived."""
+    tenant, domain = provision_tenant("Purged", "purged", tenant_user)
+    tenant.delete_tenant()
+    schema_name = tenant.schema_name
+
+    assert size_tombstoned_tenants(timedelta(days=1)) == (0, 0, 0)
+    sizing = size_tombstoned_tenants(timedelta(0))
+    assert sizing.tenants == sizing.schemas == 1
+    assert sizing.size > 0
+
+    # The schema was created in this test's transaction, so its deferred
+    # constraint checks would otherwise block dropping it
+    with connection.cursor() as cursor:
+        cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+    progress = []
+    purged, errors = purge_tombstoned_tenants(
+        timedelta(0),
+        archive=True,
+        progress=lambda *args: progress.append(args),
+    )
+
+    assert purged == [schema_name]
+    assert errors == {}
+    assert progress == [(1, 1)]
+    assert not schema_exists(schema_name)
+    assert not get_tenant_model().objects.filter(schema_name=schema_name).exists()
+    tombstone = TenantTombstone.objects.get(schema_name=schema_name)
+    assert tombstone.purged_at is not None
+    assert tombstone.domains == [domain.domain]
+    assert size_tombstoned_tenants(timedelta(0)).tenants == 0
+
+
+def test_track_untracked_tombstones(tenant_user, public_tenant) -> None:
+    """Tests that tenants deleted before tombstones existed are recorded."""
+    tenant, _ = provision_tenant("Legacy", "legacy", tenant_user)
+    tenant.delete_tenant()
+    TenantTombstone.objects.all().delete()
+    # Handed over to the public owner, but still used by a member
+    transferred, _ = provision_tenant("Transferred", "transferred", tenant_user)
+    transferred.transfer_ownership(public_tenant.owner)
+    transferred.add_user(get_user_model().objects.create_user(email="member@test.com"))
+
+    assert untracked_deleted_tenants() == [(tenant.schema_name, tenant.slug)]
+    assert track_untracked_tombstones([transferred.schema_name]) == 0
+    assert track_untracked_tombstones([tenant.schema_name]) == 1
+    assert untracked_deleted_tenants() == []
+    assert TenantTombstone.objects.get().schema_name == tenant.schema_name
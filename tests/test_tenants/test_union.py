@@ -0,0 +1,49 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import get_public_schema_name, schema_context
+
+from tenant_users.permissions.models import UserTenantPermissions
+from tenant_users.tenants.tasks import provision_tenant
+from tenant_users.tenants.union import union_across_tenants
+
+TenantUser = get_user_model()
+
+
+def test_union_across_tenants(tenant_user) -> None:
+    """Tests reading tenant tables of many schemas in chunked statements."""
+    tenants = [
+        provision_tenant(f"Union {i}", f"union{i}", tenant_user)[0] for i in range(3)
+    ]
+    member = TenantUser.objects.create_user(email="member@test.com")
+    tenants[1].add_user(member, is_staff=True)
+
+    # Joined shared tables are read in the public schema
+    queryset = UserTenantPermissions.objects.order_by("pk").values_list(
+        "profile__email", "is_staff", "is_superuser"
+    )
+    with schema_context(tenants[0].schema_name):
+        rows = sorted(union_across_tenants(queryset, [*tenants, "missing"]))
+
+    assert rows == sorted(
+        [(tenant.schema_name, tenant_user.email, False, True) for tenant in tenants]
+        + [(tenants[1].schema_name, member.email, True, False)]
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        staff = list(
+            union_across_tenants(
+                UserTenantPermissions.objects.filter(is_staff=True).values_list(
+                    "profile_id"
+                ),
+                [get_public_schema_name(), *tenants],
+                chunk_size=2,
+            )
+        )
+    assert staff == [(tenants[1].schema_name, member.pk)]
+    # One server-side cursor per chunk of two schemas
+    statements = [q["sql"] for q in queries if "CURSOR" in q["sql"]]
+    assert len(statements) == 2
+    assert statements[0].count("UNION ALL") == 1
+
+    assert not list(union_across_tenants(UserTenantPermissions.objects.none(), tenants))
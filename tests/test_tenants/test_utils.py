@@ -2,6 +2,7 @@ from unittest.mock import Mock, patch
 
 import pytest
 from django.conf import settings
+from django.db import connection
 from django.db.models.query import QuerySet
 from django_tenants.utils import get_public_schema_name, schema_context
 
@@ -10,6 +11,7 @@ from django_test_app.users.models import TenantUser
 from tenant_users.permissions.models import UserTenantPermissions
 from tenant_users.tenants import utils
 from tenant_users.tenants.models import ExistsError, SchemaError
+from tenant_users.tenants.tasks import provision_tenant
 
 
 def test_get_current_tenant(
@@ -307,3 +309,63 @@ def test_tenant_public_tenant_save_verbosity(mock_get_tenant_model):
     # Check that save() was called with the correct verbosity
     mock_tenant_instance = mock_tenant_model.return_value
     mock_tenant_instance.save.assert_called_once_with(verbosity=3)
+
+
+def _count_members_or_fail(tenant):
+    if tenant.schema_name == "broken":
+        raise RuntimeError(tenant.schema_name)
+    return connection.schema_name, UserTenantPermissions.objects.count()
+
+
+@pytest.mark.parametrize(
+    ("max_workers", "use_processes"),
+    [(1, False), (3, False), (2, True)],
+)
+def test_run_in_tenants(
+    transactional_db, monkeypatch, tenant_user, max_workers, use_processes
+):
+    """Tests each tenant's schema is queried and errors are collected."""
+    # Spawned workers set up Django again, and must use the test database
+    monkeypatch.setenv("DJANGO_DATABASE_NAME", connection.settings_dict["NAME"])
+    member = TenantUser.objects.create_user(email="member@test.com")
+
+    try:
+        one, _ = provision_tenant("One", "one", tenant_user, schema_name="run_one")
+        two, _ = provision_tenant("Two", "two", tenant_user, schema_name="run_two")
+        two.add_user(member)
+
+        results, errors = utils.run_in_tenants(
+            _count_members_or_fail,
+            [one, Company(schema_name="broken"), two],
+            max_workers=max_workers,
+            use_processes=use_processes,
+        )
+
+        # Each count comes from the tenant's own permissions table
+        assert results == {"run_one": ("run_one", 1), "run_two": ("run_two", 2)}
+        assert list(errors) == ["broken"]
+        assert isinstance(errors["broken"], RuntimeError)
+        # The calling connection is left on its original schema
+        assert connection.schema_name == get_public_schema_name()
+    finally:
+        # Schemas are not removed by flushing the test database
+        with connection.cursor() as cursor:
+            for schema_name in ("run_one", "run_two"):
+                cursor.execute(f"DROP SCHEMA IF EXISTS {schema_name} CASCADE")
+
+
+def test_migrate_schema():
+    """Tests migrating a schema that has no tenant."""
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE SCHEMA untenanted")
+
+    utils.migrate_schema("untenanted")
+
+    assert connection.schema_name == get_public_schema_name()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM information_schema.tables "
+            "WHERE table_schema = 'untenanted' "
+            "AND table_name IN ('django_migrations', 'auth_group')"
+        )
+        assert cursor.fetchone()[0] == 2